@@ -10,8 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 
+from decouple import Csv, config
+
+from .database import build_database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -23,9 +28,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-waeix*f(nzebxrm^_8+7(^ms%wcxy0(5t5qut(o*qan*pf(jvi'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = config('DEBUG', default=True, cast=bool)
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='', cast=Csv())
 
 
 # Application definition
@@ -44,7 +49,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'restaurant.metrics.MetricsMiddleware',
+    'restaurant.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'restaurant.routers.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -58,8 +66,7 @@ ROOT_URLCONF = 'littlelemon.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': ['templates'],
-        'APP_DIRS': True,
+        'DIRS': [BASE_DIR / 'templates'],
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -67,6 +74,13 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Plantillas compiladas una vez por proceso (runserver las recarga al cambiar)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -77,13 +91,29 @@ WSGI_APPLICATION = 'littlelemon.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Configurable por entorno (ver littlelemon/database.py); sin DATABASE_URL se usa SQLite en modo WAL
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': build_database_config(
+        config('DATABASE_URL', default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+        conn_max_age=config('DB_CONN_MAX_AGE', default=60, cast=int),
+        pool=config('DB_POOL', default=False, cast=bool),
+        pool_min_size=config('DB_POOL_MIN_SIZE', default=2, cast=int),
+        pool_max_size=config('DB_POOL_MAX_SIZE', default=10, cast=int),
+        pool_timeout=config('DB_POOL_TIMEOUT', default=10, cast=int),
+        sqlite_wal=config('SQLITE_WAL', default=True, cast=bool),
+    ),
 }
 
+# Réplicas de solo lectura: DATABASE_REPLICA_URLS=url1,url2 crea los alias replica_1, replica_2...
+# En los tests cada réplica es un espejo de default
+for index, replica_url in enumerate(config('DATABASE_REPLICA_URLS', default='', cast=Csv()), start=1):
+    DATABASES[f'replica_{index}'] = {
+        **build_database_config(replica_url, conn_max_age=config('DB_CONN_MAX_AGE', default=60, cast=int)),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['restaurant.routers.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -126,6 +156,31 @@ STATICFILES_DIRS = [
     BASE_DIR / 'restaurant' / 'static',
 ]
 
+# Modo producción de los estáticos (ver restaurant/staticfiles.py): collectstatic
+# genera nombres con hash y versiones .gz/.br, y el propio proceso los sirve
+# (con whitenoise si está instalado) con caché de un año para los nombres con hash
+STATIC_PIPELINE = {
+    'ENABLED': config('STATIC_PIPELINE', default=not DEBUG, cast=bool),
+    'MAX_AGE': 60,
+    'IMMUTABLE_MAX_AGE': 365 * 24 * 60 * 60,
+    'COMPRESS_MIN_SIZE': 256,
+}
+
+if STATIC_PIPELINE['ENABLED']:
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'restaurant.staticfiles.CompressedManifestStaticFilesStorage'},
+    }
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+        'whitenoise.middleware.WhiteNoiseMiddleware' if find_spec('whitenoise')
+        else 'restaurant.staticfiles.StaticFilesMiddleware',
+    )
+    # whitenoise: índice de archivos al arrancar, sin stat() por petición
+    WHITENOISE_AUTOREFRESH = False
+    WHITENOISE_USE_FINDERS = False
+    WHITENOISE_MAX_AGE = STATIC_PIPELINE['MAX_AGE']
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -134,21 +189,191 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # ===========================================
 # DJANGO REST FRAMEWORK CONFIGURATION
 # ===========================================
+# API navegable de DRF: por defecto solo con DEBUG
+BROWSABLE_API = config('BROWSABLE_API', default=DEBUG, cast=bool)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'restaurant.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',  # Volver a la configuración segura
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'restaurant.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # JSON con orjson si está instalado (misma salida que el JSONRenderer de DRF)
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'restaurant.renderers.FastJSONRenderer',
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if BROWSABLE_API else []),
+    'DEFAULT_PARSER_CLASSES': [
+        'restaurant.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
+    # Proxies de confianza delante de la aplicación: con 0 la IP de los límites
+    # de peticiones es REMOTE_ADDR y se ignora X-Forwarded-For
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
+}
+
+# ===========================================
+# CACHÉ DEL MENÚ
+# ===========================================
+# BACKEND: 'restaurant.cache.LocalLRUBackend' (un proceso) o
+# 'restaurant.cache.SharedCacheBackend' (usa CACHES[CACHE_ALIAS], compartido)
+MENU_CACHE = {
+    'ENABLED': True,
+    'BACKEND': 'restaurant.cache.LocalLRUBackend',
+    'MAX_ENTRIES': 512,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 60,
+}
+
+# ===========================================
+# CAPACIDAD DE RESERVAS
+# ===========================================
+BOOKING_CAPACITY = {
+    'SLOT_MINUTES': 30,
+    'SEATS_PER_SLOT': 40,
+    'BOOKING_DURATION_MINUTES': 90,
+    'OPENING_TIME': '12:00',
+    'CLOSING_TIME': '23:00',
+}
+
+# Listados de MenuViewSet/BookingViewSet serializados directamente desde .values()
+FAST_LIST_SERIALIZATION = True
+
+# ===========================================
+# AUTENTICACIÓN
+# ===========================================
+# Caché en memoria de tokens: segundos de validez y número máximo de entradas
+TOKEN_AUTH_CACHE = {
+    'TTL': 60,
+    'MAX_ENTRIES': 10000,
+}
+
+# Rutas calientes (ViewSets): sin BasicAuthentication, que hace PBKDF2 en cada petición
+HOT_ROUTE_AUTHENTICATION_CLASSES = [
+    'restaurant.authentication.CachedTokenAuthentication',
+    'rest_framework.authentication.SessionAuthentication',
+]
+
+# Número máximo de elementos por petición en los endpoints /bulk/
+BULK_MAX_BATCH_SIZE = 500
+
+# ===========================================
+# RÉPLICAS DE LECTURA
+# ===========================================
+# Lecturas GET de las vistas de restaurant a las réplicas sanas; tras una
+# escritura el cliente lee de default durante PIN_SECONDS
+READ_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias.startswith('replica_')],
+    'APPS': ['restaurant'],
+    'VIEW_MODULES': ['restaurant'],
+    'PIN_SECONDS': 5,
+    'PIN_COOKIE': 'primary_pin',
+    'HEALTH_CHECK_INTERVAL': 10,
+}
+
+# ===========================================
+# MÉTRICAS DE RENDIMIENTO
+# ===========================================
+# Latencia, consultas, serialización y tamaño por ruta: cabecera Server-Timing
+# (solo staff salvo PUBLIC_SERVER_TIMING) y /metrics (Prometheus, para staff o
+# con el token METRICS_TOKEN)
+PERFORMANCE_METRICS = {
+    'ENABLED': config('PERFORMANCE_METRICS', default=True, cast=bool),
+    'SERVER_TIMING': True,
+    'PUBLIC_SERVER_TIMING': config('PUBLIC_SERVER_TIMING', default=False, cast=bool),
+    'VIEW_MODULES': ['restaurant'],
+    'TOKEN': config('METRICS_TOKEN', default=''),
+}
+
+# ===========================================
+# COMPRESIÓN DE RESPUESTAS
+# ===========================================
+# gzip (o brotli si está instalado el paquete ``brotli``) para JSON/NDJSON
+# a partir de MIN_SIZE bytes, según el Accept-Encoding del cliente
+RESPONSE_COMPRESSION = {
+    'ENABLED': True,
+    'MIN_SIZE': 1024,
+    'CONTENT_TYPES': ['application/json', 'application/x-ndjson'],
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,
+}
+
+# ===========================================
+# ADMIN
+# ===========================================
+# Modo rendimiento de los listados de reservas y menú: conteo acotado
+# (estimado en PostgreSQL), filtros por rangos o con valores cacheados y
+# guardados de list_editable en bloque
+ADMIN_PERFORMANCE = {
+    'ENABLED': config('ADMIN_PERFORMANCE', default=True, cast=bool),
+    'COUNT_LIMIT': 10000,
+    'ESTIMATE_THRESHOLD': 100000,
+    'FILTER_CACHE_TIMEOUT': 300,
+    'CACHE_ALIAS': 'default',
+}
+
+# ===========================================
+# COLA DE TAREAS (OUTBOX)
+# ===========================================
+# Efectos secundarios de las reservas (confirmación, aviso a cocina, revisión
+# de la ocupación) escritos en la transacción de la petición y ejecutados por
+# ``python manage.py run_tasks``. Reintentos con espera RETRY_DELAY * 2^n segundos.
+TASK_QUEUE = {
+    'ENABLED': config('TASK_QUEUE', default=True, cast=bool),
+    'BATCH_SIZE': 100,
+    'WORKERS': 4,
+    'POLL_INTERVAL': 1.0,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 30,
+    'LOCK_TIMEOUT': 300,
+    'KEEP_DONE_DAYS': 7,
+    'KITCHEN_EMAILS': config('KITCHEN_EMAILS', default='', cast=Csv()),
+}
+
+# Correo (confirmaciones de reserva); por defecto se escribe en la consola
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='reservas@littlelemon.local')
+
+# ===========================================
+# LIMITACIÓN DE PETICIONES (TOKEN BUCKET)
+# ===========================================
+# Cubetas en memoria de cada proceso (ver restaurant/throttling.py). Con
+# SYNC_CACHE_ALIAS los procesos comparten el consumo cada SYNC_INTERVAL
+# segundos a través de CACHES[SYNC_CACHE_ALIAS] (Redis/Memcached).
+THROTTLING = {
+    'ENABLED': config('THROTTLING', default=True, cast=bool),
+    'RATES': {
+        'menu_anon': config('THROTTLE_MENU_ANON', default='120/min'),
+        'booking_write': config('THROTTLE_BOOKING_WRITE', default='30/min'),
+        'login': config('THROTTLE_LOGIN', default='10/min'),
+    },
+    'BURST': {},
+    'MAX_KEYS': 100000,
+    'SYNC_CACHE_ALIAS': config('THROTTLE_SYNC_CACHE', default='') or None,
+    'SYNC_INTERVAL': 1.0,
+}
+
+# ===========================================
+# BÚSQUEDA APROXIMADA (?search= Y ADMIN)
+# ===========================================
+# Índice de trigramas del menú en memoria y de las reservas en la base de
+# datos (ver restaurant/search.py). THRESHOLD: similitud mínima (0-1).
+SEARCH_INDEX = {
+    'ENABLED': config('SEARCH_INDEX', default=True, cast=bool),
+    'THRESHOLD': 0.3,
+    'MAX_CANDIDATES': 1000,
+    'MAX_RESULTS': 500,
+    'REFRESH_INTERVAL': 300,
 }
 
 # Media files configuration
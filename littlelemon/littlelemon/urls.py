@@ -18,6 +18,9 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from djoser.views import TokenCreateView
+from restaurant.metrics import metrics_view
+from restaurant.throttling import LoginThrottle
 
 urlpatterns = [
     # Admin panel
@@ -32,9 +35,13 @@ urlpatterns = [
     # Django REST Framework browsable API login/logout
     path('api-auth/', include('rest_framework.urls')),
     
-    # Djoser authentication endpoints
+    # Djoser authentication endpoints (login limitado por IP)
+    path('auth/token/login/', TokenCreateView.as_view(throttle_classes=[LoginThrottle]), name='login'),
     path('auth/', include('djoser.urls')),
     path('auth/', include('djoser.urls.authtoken')),
+
+    # Métricas de rendimiento (formato Prometheus)
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Servir archivos media en desarrollo
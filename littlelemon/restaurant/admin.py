@@ -1,16 +1,27 @@
 from django.contrib import admin
+from django.db import transaction
+from .admin_performance import CachedAllValuesFieldListFilter, PerformanceAdminMixin, range_filter
+from .cache import menu_cache
 from .models import Booking, Menu
+from .search import IndexedSearchAdminMixin, booking_search_index, menu_search_index
 
 # Register your models here.
 
 @admin.register(Booking)
-class BookingAdmin(admin.ModelAdmin):
+class BookingAdmin(IndexedSearchAdminMixin, PerformanceAdminMixin, admin.ModelAdmin):
     """
     Configuración del admin para el modelo Booking
     """
     list_display = ('Name', 'No_of_guests', 'BookingDate', 'formatted_date')
     list_filter = ('BookingDate', 'No_of_guests')
+    # Modo rendimiento (ADMIN_PERFORMANCE): sin date_hierarchy, invitados con valores cacheados
+    performance_list_filter = (
+        'BookingDate',
+        ('No_of_guests', CachedAllValuesFieldListFilter),
+    )
     search_fields = ('Name',)
+    # El buscador usa el índice de trigramas (search.py), no icontains
+    search_index = booking_search_index
     ordering = ('-BookingDate',)
     date_hierarchy = 'BookingDate'
     list_per_page = 20
@@ -23,13 +34,23 @@ class BookingAdmin(admin.ModelAdmin):
 
 
 @admin.register(Menu)
-class MenuAdmin(admin.ModelAdmin):
+class MenuAdmin(IndexedSearchAdminMixin, PerformanceAdminMixin, admin.ModelAdmin):
     """
     Configuración del admin para el modelo Menu
     """
     list_display = ('Title', 'Price', 'Inventory', 'is_available')
     list_filter = ('Price', 'Inventory')
+    # Modo rendimiento (ADMIN_PERFORMANCE): rangos fijos en vez de un filtro por cada valor
+    performance_list_filter = (
+        range_filter('Price', 'precio', [
+            ('Menos de 10', None, 10), ('10 - 20', 10, 20), ('20 - 50', 20, 50), ('50 o más', 50, None),
+        ]),
+        range_filter('Inventory', 'inventario', [
+            ('Agotado', None, 1), ('1 - 10', 1, 11), ('11 - 50', 11, 51), ('Más de 50', 51, None),
+        ]),
+    )
     search_fields = ('Title',)
+    search_index = menu_search_index
     ordering = ('Title',)
     list_per_page = 25
     list_editable = ('Price', 'Inventory')
@@ -40,3 +61,15 @@ class MenuAdmin(admin.ModelAdmin):
     is_available.boolean = True
     is_available.short_description = 'Disponible'
     is_available.admin_order_field = 'Inventory'
+
+    def changelist_view(self, request, extra_context=None):
+        """
+        Los guardados de ``list_editable`` invalidan la caché del menú una sola vez
+        """
+        with menu_cache.batch():
+            return super().changelist_view(request, extra_context)
+
+    def batch_saved(self, request, objs):
+        # bulk_update no envía post_save: misma invalidación que signals.invalidate_menu_cache
+        menu_cache.invalidate()
+        transaction.on_commit(menu_cache.invalidate)
@@ -0,0 +1,285 @@
+"""
+Modo rendimiento para los listados del admin.
+
+Con ``ADMIN_PERFORMANCE['ENABLED']``, ``PerformanceAdminMixin`` cambia el
+listado (changelist) de un ``ModelAdmin``:
+
+- Conteo acotado: se cuenta como mucho ``COUNT_LIMIT`` filas y, en
+  PostgreSQL sin filtros, se usa la estimación de ``pg_class`` si supera
+  ``ESTIMATE_THRESHOLD``. El listado muestra "más de N" o "≈ N".
+- Sin el segundo ``COUNT(*)`` de ``show_full_result_count`` ni facetas.
+- Sin ``date_hierarchy``, que calcula las fechas distintas en cada página;
+  ``DateFieldListFilter`` ofrece los mismos atajos sin consultas.
+- ``performance_list_filter`` en lugar de ``list_filter``: filtros por
+  rangos fijos (``range_filter``, sin consultas) y valores distintos
+  cacheados durante ``FILTER_CACHE_TIMEOUT`` segundos
+  (``CachedAllValuesFieldListFilter``).
+- Los guardados de ``list_editable`` se validan sin una consulta por fila y
+  se escriben con un único ``bulk_update`` y un único ``INSERT`` del historial. No pasan por ``save()`` ni envían
+  señales: el admin aplica sus efectos en ``batch_saved``.
+"""
+import json
+
+from django.conf import settings
+from django.contrib.admin import ShowFacets, SimpleListFilter
+from django.contrib.admin.filters import AllValuesFieldListFilter
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.admin.options import get_content_type_for_model
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import caches
+from django.core.paginator import Paginator
+from django.db import connections, router, transaction
+from django.forms import ModelChoiceField
+from django.forms.models import BaseModelFormSet
+from django.utils.functional import cached_property
+
+from .models import VersionedModel
+
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'COUNT_LIMIT': 10000,
+    'ESTIMATE_THRESHOLD': 100000,
+    'FILTER_CACHE_TIMEOUT': 300,
+    'CACHE_ALIAS': 'default',
+}
+
+
+def get_admin_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'ADMIN_PERFORMANCE', {})}
+
+
+def performance_mode():
+    return get_admin_settings()['ENABLED']
+
+
+# ===========================================
+# CONTEO
+# ===========================================
+
+def estimate_table_rows(queryset):
+    """Filas estimadas de la tabla (estadísticas de PostgreSQL) o ``None``"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    # -1: tabla sin analizar
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador cuyo ``count`` está acotado. ``approximate_count`` es el texto a
+    mostrar cuando no es exacto (``None`` si lo es).
+    """
+    approximate_count = None
+
+    @cached_property
+    def count(self):
+        options = get_admin_settings()
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_table_rows(queryset)
+            if estimate is not None and estimate >= options['ESTIMATE_THRESHOLD']:
+                self.approximate_count = f'≈ {estimate}'
+                return estimate
+        limit = options['COUNT_LIMIT']
+        if not limit:
+            return queryset.count()
+        count = queryset.order_by()[:limit + 1].count()
+        if count > limit:
+            self.approximate_count = f'más de {limit}'
+        return count
+
+
+class PerformanceChangeList(ChangeList):
+    """``ChangeList`` sin ``date_hierarchy``"""
+    def __init__(self, request, model, list_display, list_display_links, list_filter, date_hierarchy,
+                 *args, **kwargs):
+        super().__init__(request, model, list_display, list_display_links, list_filter, None, *args, **kwargs)
+
+
+# ===========================================
+# FILTROS
+# ===========================================
+
+class CachedAllValuesFieldListFilter(AllValuesFieldListFilter):
+    """
+    Filtro por valor con la lista de valores distintos cacheada, en vez de un
+    ``SELECT DISTINCT`` sobre toda la tabla en cada página
+    """
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        super().__init__(field, request, params, model, model_admin, field_path)
+        options = get_admin_settings()
+        choices = self.lookup_choices
+        key = f'admin-filter:{model._meta.label_lower}:{field_path}'
+        self.lookup_choices = caches[options['CACHE_ALIAS']].get_or_set(
+            key, lambda: list(choices), options['FILTER_CACHE_TIMEOUT'],
+        )
+
+
+class RangeListFilter(SimpleListFilter):
+    """
+    Filtro por rangos fijos ``(etiqueta, desde, hasta)``; ``desde`` incluido,
+    ``hasta`` excluido y ``None`` sin límite. No hace consultas.
+    """
+    field_name = None
+    ranges = ()
+
+    def lookups(self, request, model_admin):
+        return [(str(index), label) for index, (label, _, _) in enumerate(self.ranges)]
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value is None or not value.isdigit() or int(value) >= len(self.ranges):
+            return queryset
+        _, low, high = self.ranges[int(value)]
+        if low is not None:
+            queryset = queryset.filter(**{f'{self.field_name}__gte': low})
+        if high is not None:
+            queryset = queryset.filter(**{f'{self.field_name}__lt': high})
+        return queryset
+
+
+def range_filter(field_name, title, ranges):
+    """Clase ``RangeListFilter`` para ``field_name``"""
+    return type(f'{field_name}RangeListFilter', (RangeListFilter,), {
+        'field_name': field_name,
+        'title': title,
+        'parameter_name': f'{field_name.lower()}_range',
+        'ranges': tuple(ranges),
+    })
+
+
+# ===========================================
+# MIXIN
+# ===========================================
+
+class LoadedInstanceChoiceField(ModelChoiceField):
+    """Campo ``id`` del formset que devuelve la instancia ya cargada en vez de consultarla"""
+    def __init__(self, instance, *args, **kwargs):
+        self.instance = instance
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        if value not in self.empty_values and str(value) == str(self.instance.pk):
+            return self.instance
+        return super().to_python(value)
+
+
+class ListEditableFormSet(BaseModelFormSet):
+    """
+    Formset de ``list_editable`` sin una consulta por fila al validar ``id``:
+    los objetos ya se cargaron con una sola consulta
+    """
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        name = self._pk_field.name
+        field = form.fields.get(name)
+        if type(field) is ModelChoiceField and form.instance.pk is not None:
+            form.fields[name] = LoadedInstanceChoiceField(
+                form.instance, field.queryset, initial=field.initial, required=False, widget=field.widget,
+            )
+
+
+class ListEditableBatch:
+    """Objetos y entradas del historial pendientes de un guardado de ``list_editable``"""
+    def __init__(self):
+        self.objects = []
+        self.fields = set()
+        self.messages = []
+
+    def flush(self, model_admin, request):
+        if not self.objects:
+            return
+        model = model_admin.model
+        fields = set(self.fields)
+        if issubclass(model, VersionedModel):
+            bump = model.version_bump()
+            for obj in self.objects:
+                for field, value in bump.items():
+                    setattr(obj, field, value)
+            fields.update(bump)
+        model._default_manager.bulk_update(self.objects, sorted(fields))
+        model_admin.batch_saved(request, self.objects)
+
+        content_type = get_content_type_for_model(model)
+        LogEntry.objects.bulk_create([
+            LogEntry(
+                user_id=request.user.pk,
+                content_type_id=content_type.pk,
+                object_id=str(obj.pk),
+                object_repr=str(obj)[:200],
+                action_flag=CHANGE,
+                change_message=json.dumps(message) if isinstance(message, list) else message,
+            )
+            for obj, message in self.messages
+        ])
+
+
+class PerformanceAdminMixin:
+    """
+    Modo rendimiento para un ``ModelAdmin`` (ver el docstring del módulo).
+    Fuera de él se comporta como el ``ModelAdmin`` original.
+    """
+    performance_list_filter = None
+
+    @property
+    def show_full_result_count(self):
+        return not performance_mode()
+
+    @property
+    def show_facets(self):
+        return ShowFacets.NEVER if performance_mode() else ShowFacets.ALLOW
+
+    def get_list_filter(self, request):
+        if performance_mode() and self.performance_list_filter is not None:
+            return self.performance_list_filter
+        return super().get_list_filter(request)
+
+    def get_changelist(self, request, **kwargs):
+        return PerformanceChangeList if performance_mode() else super().get_changelist(request, **kwargs)
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        if performance_mode():
+            return EstimatedCountPaginator(queryset, per_page, orphans, allow_empty_first_page)
+        return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+
+    def get_changelist_formset(self, request, **kwargs):
+        if performance_mode():
+            kwargs.setdefault('formset', ListEditableFormSet)
+        return super().get_changelist_formset(request, **kwargs)
+
+    def changelist_view(self, request, extra_context=None):
+        if not (performance_mode() and request.method == 'POST' and '_save' in request.POST):
+            return super().changelist_view(request, extra_context)
+        batch = request._list_editable_batch = ListEditableBatch()
+        try:
+            with transaction.atomic(using=router.db_for_write(self.model)):
+                response = super().changelist_view(request, extra_context)
+                batch.flush(self, request)
+        finally:
+            del request._list_editable_batch
+        return response
+
+    def save_model(self, request, obj, form, change):
+        batch = getattr(request, '_list_editable_batch', None)
+        if batch is None or not change:
+            return super().save_model(request, obj, form, change)
+        batch.objects.append(obj)
+        batch.fields.update(form.changed_data)
+
+    def log_change(self, request, obj, message):
+        batch = getattr(request, '_list_editable_batch', None)
+        if batch is None:
+            return super().log_change(request, obj, message)
+        batch.messages.append((obj, message))
+
+    def batch_saved(self, request, objs):
+        """Efectos de ``save()``/señales para los objetos guardados en bloque"""
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RestaurantConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'restaurant'
+
+    def ready(self):
+        # Registrar los receptores de señales (invalidación de caché, etc.)
+        from . import signals  # noqa: F401
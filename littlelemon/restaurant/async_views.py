@@ -0,0 +1,183 @@
+"""
+Vistas asíncronas (ASGI) de solo lectura para el menú y las reservas.
+
+DRF no ejecuta vistas asíncronas, así que estas son vistas de Django que usan
+el ORM asíncrono (``acount``, ``aiterator``, ``aget``) y los mismos
+serializadores y el mismo JSON que la API síncrona, por lo que la salida es
+idéntica. Bajo uvicorn/daphne una petición que espera a la base de datos no
+ocupa un hilo del worker.
+
+Rutas (montadas junto a las actuales):
+
+- ``GET /api/async/menu/`` y ``/api/async/menu/{id}/`` (públicas; las
+  lecturas anónimas comparten el límite ``menu_anon`` de ``/api/menu/``)
+- ``GET /api/async/bookings/`` y ``/api/async/bookings/{id}/`` (token o sesión)
+"""
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import Throttled, ValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .authentication import token_cache
+from .conditional import READ_CONDITIONS, evaluate_conditions, has_conditions, set_validator_headers
+from .filters import BookingFilterBackend
+from .models import Booking, Menu
+from .renderers import dumps
+from .serializers import BookingSerializer, MenuSerializer
+from .throttling import MenuAnonThrottle, get_throttle_settings
+
+
+def json_response(data, status=200):
+    return HttpResponse(dumps(data), content_type='application/json', status=status)
+
+
+def error_response(detail, status):
+    return json_response({'detail': detail}, status=status)
+
+
+async def get_request_user(request):
+    """
+    Usuario autenticado por ``Authorization: Token <key>`` o por sesión.
+    Devuelve ``None`` si no hay credenciales válidas.
+    """
+    keyword, _, key = request.headers.get('Authorization', '').partition(' ')
+    key = key.strip()
+    if keyword == 'Token' and key:
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached[0]
+        try:
+            token = await Token.objects.select_related('user').aget(key=key)
+        except Token.DoesNotExist:
+            return None
+        if not token.user.is_active:
+            return None
+        token_cache.set(key, token.user, token)
+        return token.user
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+async def throttle_response(request, throttle):
+    """
+    Aplica ``throttle`` (mismas cubetas que las vistas de DRF) a una petición
+    anónima. Devuelve la respuesta ``429`` o ``None`` si se permite.
+    """
+    options = get_throttle_settings()
+    if not throttle.is_active(options) or await get_request_user(request) is not None:
+        return None
+    wait = throttle.consume(throttle.get_ident(request), options)
+    if not wait:
+        return None
+    exc = Throttled(wait)
+    response = json_response({'detail': exc.detail}, status=exc.status_code)
+    response['Retry-After'] = '%d' % exc.wait
+    return response
+
+
+async def paginated_response(request, queryset, serializer_class):
+    """
+    Paginación por número de página con el mismo formato que la API síncrona
+    """
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 20
+    try:
+        page = int(request.GET.get('page', 1))
+        if page < 1:
+            raise ValueError
+    except ValueError:
+        return error_response('Invalid page.', 404)
+
+    count = await queryset.acount()
+    offset = (page - 1) * page_size
+    if offset and offset >= count:
+        return error_response('Invalid page.', 404)
+
+    results = [
+        serializer_class(obj).data
+        async for obj in queryset[offset:offset + page_size].aiterator()
+    ]
+
+    url = request.build_absolute_uri()
+    next_link = replace_query_param(url, 'page', page + 1) if offset + page_size < count else None
+    if page == 1:
+        previous_link = None
+    elif page == 2:
+        previous_link = remove_query_param(url, 'page')
+    else:
+        previous_link = replace_query_param(url, 'page', page - 1)
+
+    return json_response({
+        'count': count,
+        'next': next_link,
+        'previous': previous_link,
+        'results': results,
+    })
+
+
+async def detail_response(request, model, pk, serializer_class):
+    """
+    Detalle con ``ETag``/``Last-Modified``; ``304`` sin cargar el objeto si
+    la petición es condicional y no hay cambios
+    """
+    not_found = f'No {model.__name__} matches the given query.'
+    if has_conditions(request, READ_CONDITIONS):
+        validators = await model.objects.filter(pk=pk).values_list('pk', 'Version', 'LastModified').afirst()
+        if validators is None:
+            return error_response(not_found, 404)
+        response = evaluate_conditions(request, validators)
+        if response is not None:
+            return response
+    try:
+        obj = await model.objects.aget(pk=pk)
+    except model.DoesNotExist:
+        return error_response(not_found, 404)
+    response = json_response(serializer_class(obj).data)
+    return set_validator_headers(response, (obj.pk, obj.Version, obj.LastModified))
+
+
+# ===========================================
+# MENÚ
+# ===========================================
+
+@require_safe
+async def menu_list_async(request):
+    """Lista paginada del menú (pública)"""
+    throttled = await throttle_response(request, MenuAnonThrottle())
+    if throttled is not None:
+        return throttled
+    return await paginated_response(request, Menu.objects.all(), MenuSerializer)
+
+
+@require_safe
+async def menu_detail_async(request, pk):
+    """Elemento del menú (público)"""
+    throttled = await throttle_response(request, MenuAnonThrottle())
+    if throttled is not None:
+        return throttled
+    return await detail_response(request, Menu, pk, MenuSerializer)
+
+
+# ===========================================
+# RESERVAS
+# ===========================================
+
+@require_safe
+async def booking_list_async(request):
+    """Lista paginada de reservas (requiere autenticación), con los filtros de BookingViewSet"""
+    if await get_request_user(request) is None:
+        return error_response('Authentication credentials were not provided.', 401)
+    try:
+        filters = BookingFilterBackend().get_filters(request.GET)
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+    return await paginated_response(request, Booking.objects.filter(**filters), BookingSerializer)
+
+
+@require_safe
+async def booking_detail_async(request, pk):
+    """Reserva concreta (requiere autenticación)"""
+    if await get_request_user(request) is None:
+        return error_response('Authentication credentials were not provided.', 401)
+    return await detail_response(request, Booking, pk, BookingSerializer)
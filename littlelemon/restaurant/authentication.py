@@ -0,0 +1,116 @@
+"""
+Autenticación por token con caché en memoria.
+
+``TokenAuthentication`` de DRF hace un ``JOIN`` entre ``Token`` y ``User`` en
+cada petición autenticada. ``CachedTokenAuthentication`` guarda el resultado
+en una caché LRU del proceso con un TTL acotado, de modo que las peticiones
+repetidas con el mismo token no consultan la base de datos.
+
+La entrada se invalida al eliminar el token (logout de djoser), al cerrar
+sesión y al guardar el usuario (p. ej. al desactivarlo). En despliegues con
+varios procesos la invalidación es local a cada uno: el TTL limita cuánto
+tiempo puede seguir aceptándose un token revocado en otro worker.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.authentication import TokenAuthentication
+
+
+DEFAULT_SETTINGS = {
+    'TTL': 60,
+    'MAX_ENTRIES': 10000,
+}
+
+
+def get_token_cache_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'TOKEN_AUTH_CACHE', {})}
+
+
+class TokenCache:
+    """
+    Caché LRU con TTL de ``key -> (usuario, token)``
+    """
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, user, token = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user, token
+
+    def set(self, key, user, token):
+        options = get_token_cache_settings()
+        with self._lock:
+            self._entries[key] = (time.monotonic() + options['TTL'], user, token)
+            self._entries.move_to_end(key)
+            while len(self._entries) > options['MAX_ENTRIES']:
+                self._entries.popitem(last=False)
+
+    def evict(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def evict_user(self, user_id):
+        with self._lock:
+            for key in [key for key, (_, user, _) in self._entries.items() if user.pk == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` con caché en memoria del par (usuario, token)
+    """
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user, token)
+        else:
+            user, token = cached
+        # Copia para que una vista que modifique request.user no afecte a otras peticiones
+        return copy.copy(user), token
+
+
+# ===========================================
+# RUTAS CALIENTES
+# ===========================================
+
+DEFAULT_HOT_AUTHENTICATION_CLASSES = [
+    'restaurant.authentication.CachedTokenAuthentication',
+    'rest_framework.authentication.SessionAuthentication',
+]
+
+
+def get_hot_authentication_classes():
+    """
+    Autenticación para las rutas más usadas de la API: sin ``BasicAuthentication``,
+    que calcula el hash PBKDF2 de la contraseña en cada petición.
+    Configurable con ``settings.HOT_ROUTE_AUTHENTICATION_CLASSES``.
+    """
+    paths = getattr(settings, 'HOT_ROUTE_AUTHENTICATION_CLASSES', DEFAULT_HOT_AUTHENTICATION_CLASSES)
+    return [import_string(path) for path in paths]
+
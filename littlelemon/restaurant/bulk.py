@@ -0,0 +1,183 @@
+"""
+Operaciones masivas para los ViewSets.
+
+``BulkModelMixin`` añade a un ModelViewSet la ruta ``{prefijo}/bulk/``:
+
+- ``POST``: crea una lista de objetos con ``bulk_create``
+- ``PUT``/``PATCH``: actualiza una lista de objetos (cada uno con su ``id``) con ``bulk_update``
+- ``DELETE``: elimina una lista de ids
+
+Todo el lote se valida en una pasada y se escribe en una sola transacción:
+si algún elemento no es válido no se guarda ninguno y la respuesta (400)
+incluye el resultado de cada elemento.
+"""
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .models import VersionedModel
+
+
+DEFAULT_MAX_BATCH_SIZE = 500
+
+
+def get_max_batch_size():
+    return getattr(settings, 'BULK_MAX_BATCH_SIZE', DEFAULT_MAX_BATCH_SIZE)
+
+
+class BulkModelMixin:
+    """
+    Endpoints masivos de creación, actualización y eliminación.
+    Las subclases pueden sobrescribir ``perform_bulk_create``,
+    ``perform_bulk_update`` y ``perform_bulk_destroy`` para añadir efectos
+    secundarios, ya que ``bulk_create``/``bulk_update`` no envían señales.
+    """
+    def get_bulk_payload(self, request):
+        """Devuelve la lista del cuerpo o una respuesta de error"""
+        payload = request.data
+        if not isinstance(payload, list):
+            return None, Response(
+                {'detail': 'Se esperaba una lista de elementos.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        max_size = get_max_batch_size()
+        if len(payload) > max_size:
+            return None, Response(
+                {'detail': f'El lote supera el máximo de {max_size} elementos.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return payload, None
+
+    def bulk_error_response(self, results):
+        return Response({'results': results}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        """Crea todos los elementos de la lista"""
+        payload, error = self.get_bulk_payload(request)
+        if error:
+            return error
+
+        serializer = self.get_serializer(data=payload, many=True)
+        if not serializer.is_valid():
+            return self.bulk_error_response([
+                {'index': index, 'status': 'invalid', 'errors': errors} if errors
+                else {'index': index, 'status': 'valid'}
+                for index, errors in enumerate(serializer.errors)
+            ])
+
+        model = serializer.child.Meta.model
+        objs = [model(**item) for item in serializer.validated_data]
+        with transaction.atomic():
+            objs = self.perform_bulk_create(objs)
+
+        return Response({'results': [
+            {'index': index, 'status': 'created', 'data': serializer.child.to_representation(obj)}
+            for index, obj in enumerate(objs)
+        ]}, status=status.HTTP_201_CREATED)
+
+    @bulk.mapping.put
+    def bulk_update(self, request, *args, **kwargs):
+        """Actualiza todos los elementos de la lista; cada uno debe incluir ``id``"""
+        return self.bulk_modify(request, partial=False)
+
+    @bulk.mapping.patch
+    def bulk_partial_update(self, request, *args, **kwargs):
+        return self.bulk_modify(request, partial=True)
+
+    def bulk_modify(self, request, partial):
+        payload, error = self.get_bulk_payload(request)
+        if error:
+            return error
+
+        ids = [item.get('id') for item in payload if isinstance(item, dict)]
+        instances = self.get_queryset().in_bulk([pk for pk in ids if isinstance(pk, int)])
+
+        results, serializers, seen, has_errors = [], [], set(), False
+        for index, item in enumerate(payload):
+            pk = item.get('id') if isinstance(item, dict) else None
+            instance = instances.get(pk) if isinstance(pk, int) else None
+            if instance is None:
+                has_errors = True
+                results.append({'index': index, 'id': pk, 'status': 'not_found'})
+                continue
+            # Dos elementos con el mismo id compartirían la instancia y sus
+            # efectos secundarios (ocupación, resúmenes) se aplicarían dos veces
+            if pk in seen:
+                has_errors = True
+                results.append({'index': index, 'id': pk, 'status': 'invalid',
+                                'errors': {'id': ['Id repetido en el lote.']}})
+                continue
+            seen.add(pk)
+            serializer = self.get_serializer(instance, data=item, partial=partial)
+            if serializer.is_valid():
+                serializers.append(serializer)
+                results.append({'index': index, 'id': pk, 'status': 'valid'})
+            else:
+                has_errors = True
+                results.append({'index': index, 'id': pk, 'status': 'invalid', 'errors': serializer.errors})
+        if has_errors:
+            return self.bulk_error_response(results)
+
+        changes = [(serializer.instance, serializer.validated_data) for serializer in serializers]
+        with transaction.atomic():
+            self.perform_bulk_update(changes)
+
+        return Response({'results': [
+            {'index': index, 'id': serializer.instance.pk, 'status': 'updated', 'data': serializer.data}
+            for index, serializer in enumerate(serializers)
+        ]})
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        """Elimina los ids de la lista"""
+        payload, error = self.get_bulk_payload(request)
+        if error:
+            return error
+        if not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in payload):
+            return Response(
+                {'detail': 'Se esperaba una lista de ids enteros.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            deleted = self.perform_bulk_destroy(self.get_queryset().filter(pk__in=payload))
+
+        return Response({'results': [
+            {'index': index, 'id': pk, 'status': 'deleted' if pk in deleted else 'not_found'}
+            for index, pk in enumerate(payload)
+        ]})
+
+    # ===========================================
+    # ESCRITURA (sobrescribibles)
+    # ===========================================
+
+    def perform_bulk_create(self, objs):
+        return self.get_queryset().model.objects.bulk_create(objs)
+
+    def perform_bulk_update(self, changes):
+        """``changes`` es una lista de pares ``(instancia, validated_data)``"""
+        fields = set()
+        for instance, validated_data in changes:
+            for field, value in validated_data.items():
+                setattr(instance, field, value)
+                fields.add(field)
+        model = self.get_queryset().model
+        if fields and issubclass(model, VersionedModel):
+            bump = model.version_bump()
+            for instance, _ in changes:
+                for field, value in bump.items():
+                    setattr(instance, field, value)
+            fields.update(bump)
+        if fields:
+            model.objects.bulk_update(
+                [instance for instance, _ in changes], sorted(fields),
+            )
+
+    def perform_bulk_destroy(self, queryset):
+        """Elimina y devuelve el conjunto de ids eliminados"""
+        ids = set(queryset.values_list('pk', flat=True))
+        queryset.model.objects.filter(pk__in=ids).delete()
+        return ids
@@ -0,0 +1,337 @@
+"""
+Caché de respuestas para los endpoints públicos del menú.
+
+Las respuestas GET del menú se guardan ya renderizadas (bytes JSON) bajo una
+clave que incluye un contador de versión del menú. Cualquier cambio en
+``Menu`` incrementa la versión, con lo que las entradas anteriores dejan de
+ser alcanzables sin tener que borrarlas una a una.
+
+Cada entrada guarda también sus validadores (``ETag``/``Last-Modified``,
+ver conditional.py), así un acierto, incluido un ``304``, no consulta la
+base de datos.
+
+El backend es configurable mediante ``settings.MENU_CACHE['BACKEND']``:
+
+- ``restaurant.cache.LocalLRUBackend``: LRU en memoria del proceso.
+- ``restaurant.cache.SharedCacheBackend``: usa el framework de caché de
+  Django (``CACHES``), compartido entre workers si el alias es Redis/Memcached.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.module_loading import import_string
+
+from .conditional import make_etag
+from .metrics import timer
+from .routers import read_from_primary
+
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'BACKEND': 'restaurant.cache.LocalLRUBackend',
+    'MAX_ENTRIES': 512,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 60,
+}
+
+
+def get_cache_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'MENU_CACHE', {})}
+
+
+class CacheStats:
+    """
+    Contadores de aciertos, fallos y desalojos de la caché
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class CachedResponse:
+    """
+    Respuesta ya renderizada lista para servirse desde la caché, con sus
+    validadores (``ETag`` y marca de tiempo de ``Last-Modified``)
+    """
+    __slots__ = ('body', 'content_type', 'etag', 'last_modified')
+
+    def __init__(self, body, content_type, etag, last_modified):
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+# ===========================================
+# BACKENDS
+# ===========================================
+
+class LocalLRUBackend:
+    """
+    Backend LRU en memoria del proceso.
+    La versión también vive en el proceso, así que solo es coherente
+    con un único worker (desarrollo, tests o despliegues de un proceso).
+    """
+    def __init__(self, options, stats):
+        self.max_entries = options['MAX_ENTRIES']
+        self.stats = stats
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 1
+        self._last_modified = time.time()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.incr('evictions')
+
+    def get_version(self):
+        return self._version, self._last_modified
+
+    def bump_version(self):
+        with self._lock:
+            self._version += 1
+            self._last_modified = time.time()
+            # Las entradas de versiones anteriores ya no son alcanzables
+            self._entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedCacheBackend:
+    """
+    Backend sobre el framework de caché de Django.
+    La versión se guarda en la propia caché y se incrementa con ``incr``,
+    que es atómico en Redis y Memcached. Los desalojos los gestiona el
+    servidor de caché, por lo que no se contabilizan aquí.
+    """
+    VERSION_KEY = 'restaurant:menu:version'
+    MODIFIED_KEY = 'restaurant:menu:modified'
+
+    def __init__(self, options, stats):
+        self.cache = caches[options['CACHE_ALIAS']]
+        self.timeout = options['TIMEOUT']
+        self.stats = stats
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, entry):
+        self.cache.set(key, entry, self.timeout)
+
+    def get_version(self):
+        values = self.cache.get_many([self.VERSION_KEY, self.MODIFIED_KEY])
+        version = values.get(self.VERSION_KEY)
+        if version is None:
+            self.cache.add(self.VERSION_KEY, 1, None)
+            self.cache.add(self.MODIFIED_KEY, time.time(), None)
+            version = self.cache.get(self.VERSION_KEY, 1)
+        return version, values.get(self.MODIFIED_KEY) or time.time()
+
+    def bump_version(self):
+        try:
+            self.cache.incr(self.VERSION_KEY)
+        except ValueError:
+            self.cache.add(self.VERSION_KEY, 2, None)
+        self.cache.set(self.MODIFIED_KEY, time.time(), None)
+
+    def clear(self):
+        self.bump_version()
+
+
+# ===========================================
+# FACHADA
+# ===========================================
+
+class MenuCache:
+    """
+    Punto de acceso único a la caché del menú
+    """
+    def __init__(self):
+        self.stats = CacheStats()
+        self._backend = None
+        self._local = threading.local()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            options = get_cache_settings()
+            self._backend = import_string(options['BACKEND'])(options, self.stats)
+        return self._backend
+
+    def reset(self):
+        """Descarta el backend actual (p. ej. al cambiar la configuración)"""
+        self._backend = None
+        self.stats.reset()
+
+    @property
+    def enabled(self):
+        return get_cache_settings()['ENABLED']
+
+    def get_version(self):
+        return self.backend.get_version()
+
+    def invalidate(self):
+        """Incrementa la versión del menú, salvo dentro de ``batch()``"""
+        if getattr(self._local, 'batch_depth', 0):
+            self._local.dirty = True
+            return
+        self.backend.bump_version()
+
+    @contextmanager
+    def batch(self):
+        """
+        Agrupa varias escrituras en una sola invalidación al salir del bloque
+        (p. ej. los guardados de ``list_editable`` en el admin)
+        """
+        self._local.batch_depth = getattr(self._local, 'batch_depth', 0) + 1
+        try:
+            yield
+        finally:
+            self._local.batch_depth -= 1
+            if not self._local.batch_depth and getattr(self._local, 'dirty', False):
+                self._local.dirty = False
+                self.backend.bump_version()
+
+    def make_key(self, version, request):
+        raw = '%s|%s|%s' % (
+            request.path,
+            request.META.get('QUERY_STRING', ''),
+            request.accepted_media_type,
+        )
+        digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+        return 'restaurant:menu:v%s:%s' % (version, digest)
+
+    def make_etag(self, version, last_modified, key):
+        """
+        ``ETag`` de un listado: versión del menú y petición de la clave.
+        La marca de tiempo distingue la misma versión tras reiniciar el proceso
+        (``LocalLRUBackend`` vuelve a empezar en 1)
+        """
+        return '"menu-%s.%d-%s"' % (version, last_modified * 1000, key.rsplit(':', 1)[1][:16])
+
+    def get(self, key):
+        entry = self.backend.get(key)
+        self.stats.incr('hits' if entry is not None else 'misses')
+        return entry
+
+    def set(self, key, entry):
+        self.backend.set(key, entry)
+
+
+menu_cache = MenuCache()
+
+
+def _reset_on_setting_changed(setting, **kwargs):
+    if setting in ('MENU_CACHE', 'CACHES'):
+        menu_cache.reset()
+
+
+setting_changed.connect(_reset_on_setting_changed)
+
+
+# ===========================================
+# MIXIN PARA VISTAS
+# ===========================================
+
+class MenuCacheMixin:
+    """
+    Sirve ``list`` y ``retrieve`` desde la caché del menú.
+    Solo se cachean respuestas GET/HEAD renderizadas en JSON y con estado 200;
+    el resto (BrowsableAPI, errores) pasa directamente a la vista.
+    Va antes que ``ConditionalDetailMixin``: los aciertos, incluidos los
+    ``304``, se resuelven con los validadores guardados en la entrada.
+    """
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def is_cacheable(self, request):
+        return (
+            menu_cache.enabled
+            and request.method in ('GET', 'HEAD')
+            and getattr(request.accepted_renderer, 'format', None) == 'json'
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        version, last_modified = menu_cache.get_version()
+        key = menu_cache.make_key(version, request)
+        entry = menu_cache.get(key)
+        cache_status = 'HIT'
+        if entry is None:
+            # La entrada se sirve a todos los clientes: se lee de default, no de
+            # una réplica que aún no tenga la última escritura
+            with read_from_primary():
+                response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            renderer = request.accepted_renderer
+            with timer('render'):
+                body = renderer.render(
+                    response.data, request.accepted_media_type, self.get_renderer_context()
+                )
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = '%s; charset=%s' % (content_type, renderer.charset)
+            validators = getattr(self, 'object_validators', None)
+            if validators is not None:
+                # Detalle: los validadores del objeto (ver conditional.py)
+                pk, object_version, modified = validators
+                etag, modified = make_etag(pk, object_version), modified.timestamp()
+            else:
+                etag, modified = menu_cache.make_etag(version, last_modified, key), last_modified
+            entry = CachedResponse(body, content_type, etag, modified)
+            menu_cache.set(key, entry)
+            cache_status = 'MISS'
+
+        response = HttpResponse(entry.body, content_type=entry.content_type)
+        response['ETag'] = entry.etag
+        response['Last-Modified'] = http_date(entry.last_modified)
+        response['X-Cache'] = cache_status
+        return get_conditional_response(
+            request,
+            etag=entry.etag,
+            last_modified=int(entry.last_modified),
+            response=response,
+        )
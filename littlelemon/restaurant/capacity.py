@@ -0,0 +1,273 @@
+"""
+Motor de capacidad de reservas.
+
+El día se divide en franjas de ``SLOT_MINUTES`` minutos y cada reserva ocupa
+``No_of_guests`` plazas en todas las franjas que cubre su duración
+(``BOOKING_DURATION_MINUTES``). La ocupación de cada franja vive en
+``SlotOccupancy`` y se actualiza con un ``UPDATE`` condicional:
+
+    UPDATE restaurant_slot_occupancy SET Guests = Guests + n
+    WHERE SlotStart = franja AND Guests <= capacidad - n
+
+Si alguna franja no admite la reserva no se actualiza ninguna fila, se lanza
+``CapacityExceeded`` y la transacción se revierte, así dos peticiones
+concurrentes no pueden sobrepasar la capacidad.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Booking, SlotOccupancy
+
+
+DEFAULT_SETTINGS = {
+    'SLOT_MINUTES': 30,
+    'SEATS_PER_SLOT': 40,
+    'BOOKING_DURATION_MINUTES': 90,
+    'OPENING_TIME': '12:00',
+    'CLOSING_TIME': '23:00',
+}
+
+
+def get_capacity_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'BOOKING_CAPACITY', {})}
+
+
+class CapacityExceeded(Exception):
+    """
+    No quedan plazas suficientes en alguna franja de la reserva
+    """
+    def __init__(self, slot_start, available):
+        self.slot_start = slot_start
+        self.available = available
+        super().__init__(
+            f"No hay plazas suficientes a las {slot_start.strftime('%H:%M')} "
+            f"del {slot_start.strftime('%d/%m/%Y')} (disponibles: {available})."
+        )
+
+
+# ===========================================
+# FRANJAS
+# ===========================================
+
+def slot_floor(value):
+    """Inicio de la franja que contiene ``value``"""
+    if isinstance(value, str):
+        # Reservas creadas con la fecha como texto (p. ej. Booking.objects.create(BookingDate='...'))
+        value = Booking._meta.get_field('BookingDate').to_python(value)
+    step = get_capacity_settings()['SLOT_MINUTES'] * 60
+    seconds = int(value.timestamp())
+    return datetime.fromtimestamp(seconds - seconds % step, tz=dt_timezone.utc)
+
+
+def booking_slots(booking_date):
+    """Franjas que ocupa una reserva que empieza en ``booking_date``"""
+    options = get_capacity_settings()
+    step = timedelta(minutes=options['SLOT_MINUTES'])
+    count = max(1, -(-options['BOOKING_DURATION_MINUTES'] // options['SLOT_MINUTES']))
+    first = slot_floor(booking_date)
+    return [first + step * i for i in range(count)]
+
+
+def day_slots(day):
+    """Franjas entre la apertura y el cierre de ``day`` en la zona horaria actual"""
+    options = get_capacity_settings()
+    step = timedelta(minutes=options['SLOT_MINUTES'])
+    opening = timezone.make_aware(datetime.combine(day, time.fromisoformat(options['OPENING_TIME'])))
+    closing = timezone.make_aware(datetime.combine(day, time.fromisoformat(options['CLOSING_TIME'])))
+    slots = []
+    current = slot_floor(opening)
+    while current < closing:
+        slots.append(current)
+        current += step
+    return slots
+
+
+# ===========================================
+# ACTUALIZACIÓN INCREMENTAL
+# ===========================================
+
+def apply_changes(released=(), reserved=()):
+    """
+    Aplica a la ocupación un lote de reservas liberadas y ocupadas, ambas como
+    pares ``(BookingDate, No_of_guests)``. Los cambios se agregan por franja,
+    de modo que cada franja recibe un único ``UPDATE`` aunque el lote tenga
+    muchas reservas. Lanza ``CapacityExceeded`` si alguna franja se desborda.
+    """
+    deltas = defaultdict(int)
+    for sign, items in ((-1, released), (1, reserved)):
+        for booking_date, guests in items:
+            if not guests or guests <= 0:
+                continue
+            for slot in booking_slots(booking_date):
+                deltas[slot] += sign * guests
+    deltas = {slot: delta for slot, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    capacity = get_capacity_settings()['SEATS_PER_SLOT']
+    with transaction.atomic():
+        SlotOccupancy.objects.bulk_create(
+            [SlotOccupancy(SlotStart=slot) for slot, delta in deltas.items() if delta > 0],
+            ignore_conflicts=True,
+        )
+        # Siempre en orden ascendente para que las transacciones concurrentes
+        # bloqueen las filas en el mismo orden
+        for slot in sorted(deltas):
+            delta = deltas[slot]
+            if delta < 0:
+                SlotOccupancy.objects.filter(
+                    SlotStart=slot, Guests__gte=-delta,
+                ).update(Guests=F('Guests') + delta)
+                continue
+            updated = SlotOccupancy.objects.filter(
+                SlotStart=slot, Guests__lte=capacity - delta,
+            ).update(Guests=F('Guests') + delta)
+            if not updated:
+                booked = SlotOccupancy.objects.filter(SlotStart=slot).values_list('Guests', flat=True).first()
+                raise CapacityExceeded(slot, max(capacity - (booked or 0), 0))
+
+
+def reserve(booking_date, guests):
+    """Ocupa ``guests`` plazas en las franjas de la reserva o lanza ``CapacityExceeded``"""
+    apply_changes(reserved=[(booking_date, guests)])
+
+
+def release(booking_date, guests):
+    """Libera las plazas de una reserva eliminada o modificada"""
+    apply_changes(released=[(booking_date, guests)])
+
+
+def move(previous, current):
+    """
+    Aplica el cambio de una reserva de ``previous`` a ``current``;
+    ambos son tuplas ``(BookingDate, No_of_guests)`` o ``None``
+    """
+    if previous == current:
+        return
+    apply_changes(
+        released=[previous] if previous is not None else [],
+        reserved=[current] if current is not None else [],
+    )
+
+
+def check_capacity(booking):
+    """
+    Validación previa (sin bloqueo) para formularios: lanza ``ValidationError``
+    si la reserva no cabe. La comprobación definitiva la hace ``reserve``.
+    """
+    if booking.BookingDate is None or not booking.No_of_guests:
+        return
+    previous = get_previous_occupancy(booking)
+    released = set(booking_slots(previous[0])) if previous else set()
+    capacity = get_capacity_settings()['SEATS_PER_SLOT']
+    slots = booking_slots(booking.BookingDate)
+    occupancy = dict(SlotOccupancy.objects.filter(SlotStart__in=slots).values_list('SlotStart', 'Guests'))
+    for slot in slots:
+        booked = occupancy.get(slot, 0)
+        if slot in released:
+            booked -= previous[1]
+        if booked + booking.No_of_guests > capacity:
+            raise ValidationError({'BookingDate': str(CapacityExceeded(slot, max(capacity - booked, 0)))})
+
+
+def get_previous_occupancy(booking):
+    """Fecha e invitados guardados actualmente para ``booking`` (o ``None`` si es nueva)"""
+    if booking.pk is None:
+        return None
+    loaded = getattr(booking, '_loaded_occupancy', None)
+    if loaded is not None:
+        return loaded
+    return Booking.objects.filter(pk=booking.pk).values_list('BookingDate', 'No_of_guests').first()
+
+
+# ===========================================
+# CONSULTA Y RECONSTRUCCIÓN
+# ===========================================
+
+def get_availability(day):
+    """
+    Disponibilidad de cada franja de ``day`` con una sola consulta sobre
+    ``SlotOccupancy`` (coste proporcional al número de franjas)
+    """
+    capacity = get_capacity_settings()['SEATS_PER_SLOT']
+    slots = day_slots(day)
+    if not slots:
+        return []
+    occupancy = dict(
+        SlotOccupancy.objects.filter(SlotStart__gte=slots[0], SlotStart__lte=slots[-1])
+        .values_list('SlotStart', 'Guests')
+    )
+    return [
+        {
+            'start': slot,
+            'booked': occupancy.get(slot, 0),
+            'available': max(capacity - occupancy.get(slot, 0), 0),
+        }
+        for slot in slots
+    ]
+
+
+def reconcile_slots(slots):
+    """
+    Recalcula a partir de las reservas la ocupación de ``slots`` y corrige
+    las franjas que no coinciden. Las filas se bloquean antes de contar, así
+    una reserva concurrente aplica su cambio sobre el valor corregido.
+    Devuelve el número de franjas corregidas.
+    """
+    slots = sorted({slot_floor(slot) for slot in slots})
+    if not slots:
+        return 0
+    options = get_capacity_settings()
+    step = timedelta(minutes=options['SLOT_MINUTES'])
+    span = step * (len(booking_slots(slots[0])) - 1)
+
+    with transaction.atomic():
+        SlotOccupancy.objects.bulk_create([SlotOccupancy(SlotStart=slot) for slot in slots], ignore_conflicts=True)
+        stored = dict(
+            SlotOccupancy.objects.select_for_update().filter(SlotStart__in=slots)
+            .order_by('SlotStart').values_list('SlotStart', 'Guests')
+        )
+        totals = dict.fromkeys(slots, 0)
+        rows = Booking.objects.order_by().filter(
+            BookingDate__gte=slots[0] - span, BookingDate__lt=slots[-1] + step,
+        ).values_list('BookingDate', 'No_of_guests')
+        for booking_date, guests in rows:
+            if not guests or guests <= 0:
+                continue
+            for slot in booking_slots(booking_date):
+                if slot in totals:
+                    totals[slot] += guests
+        fixed = 0
+        for slot in slots:
+            if stored.get(slot) != totals[slot]:
+                SlotOccupancy.objects.filter(SlotStart=slot).update(Guests=totals[slot])
+                fixed += 1
+    return fixed
+
+
+def rebuild_occupancy(batch_size=1000):
+    """
+    Recalcula toda la tabla de ocupación a partir de las reservas.
+    Devuelve el número de franjas con ocupación.
+    """
+    totals = {}
+    rows = Booking.objects.order_by().values_list('BookingDate', 'No_of_guests').iterator(chunk_size=batch_size)
+    for booking_date, guests in rows:
+        if not guests or guests <= 0:
+            continue
+        for slot in booking_slots(booking_date):
+            totals[slot] = totals.get(slot, 0) + guests
+    with transaction.atomic():
+        SlotOccupancy.objects.all().delete()
+        SlotOccupancy.objects.bulk_create(
+            [SlotOccupancy(SlotStart=slot, Guests=guests) for slot, guests in totals.items()],
+            batch_size=batch_size,
+        )
+    return len(totals)
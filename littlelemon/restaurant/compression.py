@@ -0,0 +1,134 @@
+"""
+Compresión negociada de las respuestas JSON.
+
+``CompressionMiddleware`` comprime con brotli (si está instalado el paquete
+``brotli``) o gzip, según ``Accept-Encoding``, las respuestas cuyo tipo esté
+en ``CONTENT_TYPES`` y ocupen al menos ``MIN_SIZE`` bytes; las respuestas en
+streaming (exportaciones) se comprimen por fragmentos. A diferencia de
+``GZipMiddleware`` no toca el HTML, que puede incluir el token CSRF (BREACH).
+
+Como Django, convierte los ``ETag`` fuertes en débiles al comprimir.
+"""
+import gzip
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional
+    brotli = None
+
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'MIN_SIZE': 1024,
+    'CONTENT_TYPES': ['application/json', 'application/x-ndjson'],
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,
+}
+
+
+def get_compression_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'RESPONSE_COMPRESSION', {})}
+
+
+def get_available_encodings():
+    """Codificaciones soportadas, por orden de preferencia en caso de empate"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encoding, available):
+    """
+    Codificación de ``available`` con mayor ``q`` en ``Accept-Encoding``,
+    o ``None`` si el cliente no acepta ninguna
+    """
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = weights.get(coding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(encoding, content, options):
+    if encoding == 'br':
+        return brotli.compress(content, quality=options['BROTLI_QUALITY'])
+    return gzip.compress(content, compresslevel=options['GZIP_LEVEL'], mtime=0)
+
+
+def compress_stream(encoding, chunks, options):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=options['BROTLI_QUALITY'])
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    # wbits=31: formato gzip
+    compressor = zlib.compressobj(options['GZIP_LEVEL'], zlib.DEFLATED, 31)
+    for chunk in chunks:
+        # Se vacía tras cada fragmento para que el cliente reciba los datos a medida que llegan
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Comprime las respuestas JSON/NDJSON según ``settings.RESPONSE_COMPRESSION``
+    """
+    def process_response(self, request, response):
+        options = get_compression_settings()
+        if not options['ENABLED'] or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in options['CONTENT_TYPES']:
+            return response
+        if not response.streaming and len(response.content) < options['MIN_SIZE']:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.headers.get('Accept-Encoding', ''), get_available_encodings())
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                return response
+            response.streaming_content = compress_stream(encoding, response.streaming_content, options)
+            del response['Content-Length']
+        else:
+            compressed = compress(encoding, response.content, options)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
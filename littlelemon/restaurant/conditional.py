@@ -0,0 +1,126 @@
+"""
+Peticiones condicionales en los endpoints de detalle.
+
+Cada objeto ``VersionedModel`` tiene el validador ``ETag: "<id>-<Version>"``
+y ``Last-Modified: LastModified``:
+
+- ``GET``/``HEAD`` con ``If-None-Match`` o ``If-Modified-Since``: se leen solo
+  ``Version`` y ``LastModified`` (una consulta ligera) y, si no hay cambios,
+  se responde ``304`` sin cargar ni serializar el objeto.
+- ``PUT``/``PATCH``/``DELETE`` con ``If-Match`` o ``If-Unmodified-Since``: la
+  comprobación se hace dentro de la transacción con la fila bloqueada
+  (``SELECT ... FOR UPDATE`` donde la base de datos lo admite) y devuelve
+  ``412`` si otro cliente la ha modificado (concurrencia optimista).
+
+Sin cabeceras condicionales no se añade ninguna consulta: los validadores
+salen del propio objeto.
+
+Todos los ``ETag`` de la API siguen el mismo esquema: identifican la versión
+de los datos, no los bytes de la respuesta. En el detalle es ``"<id>-<Version>"``
+y en los listados del menú, ``"menu-<versión del menú>-<petición>"`` (ver
+cache.py, que guarda estos validadores junto a cada respuesta cacheada).
+"""
+from django.db import transaction
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+READ_CONDITIONS = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+WRITE_CONDITIONS = ('HTTP_IF_MATCH', 'HTTP_IF_UNMODIFIED_SINCE', 'HTTP_IF_NONE_MATCH')
+
+
+def make_etag(pk, version):
+    return f'"{pk}-{version}"'
+
+
+def has_conditions(request, headers):
+    return any(header in request.META for header in headers)
+
+
+def set_validator_headers(response, validators):
+    pk, version, last_modified = validators
+    response['ETag'] = make_etag(pk, version)
+    response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def evaluate_conditions(request, validators):
+    """
+    Respuesta ``304``/``412`` si alguna condición de la petición lo exige,
+    o ``None`` si hay que atenderla normalmente
+    """
+    pk, version, last_modified = validators
+    if_match = request.META.get('HTTP_IF_MATCH')
+    if if_match and 'W/' in if_match:
+        # CompressionMiddleware debilita el ETag; como identifica la versión
+        # del objeto y no los bytes, If-Match también lo acepta débil
+        request.META['HTTP_IF_MATCH'] = if_match.replace('W/', '')
+    response = get_conditional_response(
+        request, etag=make_etag(pk, version), last_modified=int(last_modified.timestamp()),
+    )
+    if response is not None:
+        set_validator_headers(response, validators)
+    return response
+
+
+class ConditionalDetailMixin:
+    """
+    ``retrieve``, ``update`` y ``destroy`` condicionales para ViewSets de
+    modelos ``VersionedModel``
+    """
+    # Los validadores se cargan aunque ``?fields=`` no los pida
+    sparse_extra_fields = ('Version', 'LastModified')
+
+    def get_validators(self, lock=False):
+        """``(pk, Version, LastModified)`` del objeto de la URL en una consulta"""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        if lock:
+            queryset = queryset.select_for_update()
+        row = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}).values_list(
+            'pk', 'Version', 'LastModified',
+        ).first()
+        if row is None:
+            raise Http404
+        return row
+
+    def get_object(self):
+        obj = super().get_object()
+        self.object_validators = (obj.pk, obj.Version, obj.LastModified)
+        return obj
+
+    def retrieve(self, request, *args, **kwargs):
+        self.object_validators = None
+        if has_conditions(request, READ_CONDITIONS):
+            self.object_validators = self.get_validators()
+            response = evaluate_conditions(request, self.object_validators)
+            if response is not None:
+                return response
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_validator_headers(response, self.object_validators)
+        return response
+
+    def update(self, request, *args, **kwargs):
+        return self.conditional_write(super().update, request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        return self.conditional_write(super().destroy, request, *args, **kwargs)
+
+    def conditional_write(self, handler, request, *args, **kwargs):
+        if not has_conditions(request, WRITE_CONDITIONS):
+            response = handler(request, *args, **kwargs)
+        else:
+            with transaction.atomic():
+                response = evaluate_conditions(request, self.get_validators(lock=True))
+                if response is None:
+                    response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and request.method != 'DELETE':
+            set_validator_headers(response, self.object_validators)
+        return response
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        instance = serializer.instance
+        self.object_validators = (instance.pk, instance.Version, instance.LastModified)
@@ -0,0 +1,68 @@
+"""
+Exportación en streaming de reservas.
+
+Las filas se leen con ``values_list(...).iterator(chunk_size=...)`` (cursor de
+servidor en PostgreSQL) y se escriben a medida que llegan, así que la memoria
+usada no depende del tamaño de la tabla. El formato de cada reserva es el
+mismo que el de ``BookingSerializer``.
+"""
+from django.http import StreamingHttpResponse
+
+from .renderers import dumps
+from .serializers import BookingSerializer
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = ('id', 'Name', 'No_of_guests', 'BookingDate')
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+def iter_booking_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Genera un dict por reserva sin instanciar modelos ni serializadores"""
+    date_field = BookingSerializer().fields['BookingDate']
+    rows = queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    for pk, name, guests, booking_date in rows:
+        yield {
+            'id': pk,
+            'Name': name,
+            'No_of_guests': guests,
+            'BookingDate': date_field.to_representation(booking_date),
+        }
+
+
+def iter_ndjson(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    buffer = []
+    for row in rows:
+        buffer.append(dumps(row))
+        if len(buffer) >= chunk_size:
+            yield b'\n'.join(buffer) + b'\n'
+            buffer = []
+    if buffer:
+        yield b'\n'.join(buffer) + b'\n'
+
+
+def iter_json_array(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    yield b'['
+    buffer, first = [], True
+    for row in rows:
+        buffer.append(dumps(row))
+        if len(buffer) >= chunk_size:
+            yield (b'' if first else b',') + b','.join(buffer)
+            buffer, first = [], False
+    if buffer:
+        yield (b'' if first else b',') + b','.join(buffer)
+    yield b']'
+
+
+def streaming_export_response(queryset, output='ndjson', chunk_size=EXPORT_CHUNK_SIZE):
+    """``StreamingHttpResponse`` con todas las reservas de ``queryset``"""
+    rows = iter_booking_rows(queryset, chunk_size)
+    stream = iter_ndjson(rows, chunk_size) if output == 'ndjson' else iter_json_array(rows, chunk_size)
+    response = StreamingHttpResponse(stream, content_type=CONTENT_TYPES[output])
+    response['Content-Disposition'] = f'attachment; filename="bookings.{output}"'
+    return response
@@ -0,0 +1,105 @@
+"""
+Serialización rápida de solo lectura para los listados.
+
+``ValuesSerializer`` genera, a partir de un ``ModelSerializer``, una función
+que convierte filas de ``QuerySet.values()`` en dicts con exactamente la misma
+salida: los campos que necesitan formato (``Decimal``, fechas) usan el
+``to_representation`` del propio campo de DRF y el resto se copian tal cual.
+Así se evita instanciar un modelo y recorrer los campos del serializador por
+cada fila.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import fields as drf_fields
+from rest_framework.relations import ManyRelatedField, RelatedField
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+from .metrics import timer
+from .pagination import get_ordering_fields
+
+
+# Campos cuya representación es el propio valor leído de la base de datos
+PASSTHROUGH_FIELDS = (
+    drf_fields.IntegerField,
+    drf_fields.CharField,
+    drf_fields.BooleanField,
+)
+
+
+class ValuesSerializer:
+    """
+    Serializa filas de ``.values()`` con la salida de ``serializer_class``.
+    Solo admite campos de modelo directos (sin relaciones ni ``source`` anidado).
+    ``fields`` limita la salida a esos campos (``?fields=``).
+    """
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        self.converters = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            nested = isinstance(field, (RelatedField, ManyRelatedField, BaseSerializer))
+            if nested or '.' in field.source or field.source == '*':
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} no es un campo de modelo directo."
+                )
+            convert = None if isinstance(field, PASSTHROUGH_FIELDS) else field.to_representation
+            self.converters.append((name, field.source, convert))
+        self.value_fields = [source for _, source, _ in self.converters]
+
+    def to_representation(self, row):
+        ret = {}
+        for name, source, convert in self.converters:
+            value = row[source]
+            ret[name] = convert(value) if convert is not None and value is not None else value
+        return ret
+
+    def serialize(self, rows):
+        rows = list(rows)
+        with timer('serialize'):
+            return [self.to_representation(row) for row in rows]
+
+
+_values_serializers = {}
+
+
+def get_values_serializer(serializer_class, fields=None):
+    """``ValuesSerializer`` cacheado por clase de serializador y campos"""
+    key = (serializer_class, tuple(fields) if fields is not None else None)
+    try:
+        return _values_serializers[key]
+    except KeyError:
+        serializer = _values_serializers[key] = ValuesSerializer(serializer_class, fields)
+        return serializer
+
+
+class FastListMixin:
+    """
+    ``list`` con serialización directa desde ``.values()``.
+    Se activa con ``settings.FAST_LIST_SERIALIZATION`` y se puede desactivar
+    por vista con ``fast_list = False``.
+    """
+    fast_list = True
+
+    def use_fast_list(self):
+        return self.fast_list and getattr(settings, 'FAST_LIST_SERIALIZATION', False)
+
+    def get_list_fields(self):
+        """Campos a serializar; ``None`` para todos"""
+        return None
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list():
+            return super().list(request, *args, **kwargs)
+
+        fast = get_values_serializer(self.get_serializer_class(), self.get_list_fields())
+        # El cursor lee su posición de las columnas de orden aunque no se devuelvan
+        value_fields = dict.fromkeys([*fast.value_fields, *get_ordering_fields(self)])
+        queryset = self.filter_queryset(self.get_queryset()).values(*value_fields)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(queryset))
+
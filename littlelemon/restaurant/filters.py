@@ -0,0 +1,106 @@
+"""
+Filtros de la API que se traducen directamente a SQL.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db.models.lookups import StartsWith
+from django.utils import timezone
+from django.utils.dateparse import date_re, parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Booking
+
+
+class PrefixLookup(StartsWith):
+    """
+    ``startswith`` sensible a mayúsculas en todos los motores. En SQLite
+    ``LIKE`` no distingue mayúsculas ASCII, así que se usa ``GLOB``, que sí
+    las distingue y también aprovecha el índice de la columna.
+    """
+    lookup_name = 'prefix'
+
+    def as_sqlite(self, compiler, connection):
+        if not isinstance(self.rhs, str):
+            return super().as_sqlite(compiler, connection)
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        pattern = ''.join(f'[{char}]' if char in '*?[' else char for char in self.rhs)
+        return f'{lhs_sql} GLOB %s', [*lhs_params, pattern + '*']
+
+
+Booking._meta.get_field('Name').register_lookup(PrefixLookup)
+
+
+def parse_booking_date(value, param, end_of_day=False):
+    """
+    Convierte ``value`` (fecha ``YYYY-MM-DD`` o fecha y hora ISO 8601) en un
+    datetime con zona horaria. Con ``end_of_day`` una fecha sin hora se
+    convierte en el inicio del día siguiente, para usarla como límite exclusivo.
+    """
+    try:
+        if date_re.fullmatch(value):
+            day = parse_date(value)
+            if end_of_day:
+                day += timedelta(days=1)
+            parsed = datetime.combine(day, time.min)
+        else:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                raise ValueError
+    except ValueError:
+        raise ValidationError({param: ['Formato de fecha inválido. Usa YYYY-MM-DD o ISO 8601.']})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_day(value, param):
+    """Fecha ``YYYY-MM-DD`` o ``ValidationError``"""
+    try:
+        day = parse_date(value) if date_re.fullmatch(value) else None
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({param: ['Formato de fecha inválido. Usa YYYY-MM-DD.']})
+    return day
+
+
+def parse_positive_int(value, param):
+    try:
+        number = int(value)
+        if number < 0:
+            raise ValueError
+    except ValueError:
+        raise ValidationError({param: ['Debe ser un número entero positivo.']})
+    return number
+
+
+class BookingFilterBackend(BaseFilterBackend):
+    """
+    Filtros de reservas por query params:
+
+    - ``date_from``: reservas desde esa fecha/hora (inclusive)
+    - ``date_to``: reservas hasta esa fecha (el día completo si no lleva hora)
+    - ``min_guests``: número mínimo de invitados
+    - ``name``: prefijo del nombre (sensible a mayúsculas en todos los motores,
+      usa el índice de ``Name``)
+    """
+    def get_filters(self, query_params):
+        filters = {}
+        if query_params.get('date_from'):
+            filters['BookingDate__gte'] = parse_booking_date(query_params['date_from'], 'date_from')
+        if query_params.get('date_to'):
+            value = query_params['date_to']
+            lookup = 'BookingDate__lt' if date_re.fullmatch(value) else 'BookingDate__lte'
+            filters[lookup] = parse_booking_date(value, 'date_to', end_of_day=True)
+        if query_params.get('min_guests'):
+            filters['No_of_guests__gte'] = parse_positive_int(query_params['min_guests'], 'min_guests')
+        if query_params.get('name'):
+            filters['Name__prefix'] = query_params['name']
+        return filters
+
+    def filter_queryset(self, request, queryset, view):
+        filters = self.get_filters(request.query_params)
+        if filters:
+            queryset = queryset.filter(**filters)
+        return queryset
@@ -0,0 +1,64 @@
+"""
+Descuento atómico del inventario del menú.
+
+Cada descuento es un único ``UPDATE`` condicional:
+
+    UPDATE restaurant_menu SET Inventory = Inventory - n
+    WHERE id = x AND Inventory >= n
+
+La base de datos aplica la condición y la resta sobre la fila bloqueada, así
+que dos cajas que venden el mismo plato a la vez no pierden actualizaciones
+y el inventario nunca queda en negativo.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from .cache import menu_cache
+from .models import Menu
+
+
+class InsufficientStock(Exception):
+    """
+    No hay inventario suficiente para un elemento del menú
+    """
+    def __init__(self, item_id, requested, available):
+        self.item_id = item_id
+        self.requested = requested
+        self.available = available
+        super().__init__(
+            f"Inventario insuficiente para el elemento {item_id}: "
+            f"solicitado {requested}, disponible {available}."
+        )
+
+
+def reserve_stock(quantities):
+    """
+    Descuenta ``quantities`` (``{id: cantidad}``) en una sola transacción.
+    Si algún elemento no tiene stock no se descuenta ninguno.
+    Devuelve ``{id: inventario_restante}``.
+
+    Lanza ``Menu.DoesNotExist`` si algún id no existe e ``InsufficientStock``
+    si no hay inventario suficiente.
+    """
+    with transaction.atomic():
+        # Orden ascendente de ids para que las transacciones concurrentes
+        # bloqueen las filas en el mismo orden
+        for item_id in sorted(quantities):
+            quantity = quantities[item_id]
+            updated = Menu.objects.filter(pk=item_id, Inventory__gte=quantity).update(
+                Inventory=F('Inventory') - quantity,
+                **Menu.version_bump(),
+            )
+            if not updated:
+                available = Menu.objects.filter(pk=item_id).values_list('Inventory', flat=True).first()
+                if available is None:
+                    raise Menu.DoesNotExist(f"No existe el elemento del menú {item_id}.")
+                raise InsufficientStock(item_id, quantity, available)
+
+        # Las filas siguen bloqueadas por esta transacción: el valor leído es el propio
+        stock = dict(Menu.objects.filter(pk__in=quantities).values_list('pk', 'Inventory'))
+
+        # update() no envía señales y el inventario forma parte de las respuestas cacheadas
+        menu_cache.invalidate()
+        transaction.on_commit(menu_cache.invalidate)
+    return stock
@@ -0,0 +1,296 @@
+import json
+import subprocess
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, teardown_databases
+from rest_framework.authtoken.models import Token
+
+from restaurant.cache import menu_cache
+from restaurant.models import Booking, BookingSearchTrigram, Menu
+
+
+SEED_PREFIX = '__bench_api__'
+
+# (estilo, ruta, recurso del detalle); {pk} se sustituye por un objeto sembrado
+ROUTES = [
+    ('function', '/api/function/users/', None),
+    ('function', '/api/function/users/{pk}/', 'user'),
+    ('apiview', '/api/class/bookings/', None),
+    ('apiview', '/api/class/bookings/{pk}/', 'booking'),
+    ('mixin', '/api/mixin/menu/', None),
+    ('mixin', '/api/mixin/menu/{pk}/', 'menu'),
+    ('generic', '/api/generic/users/', None),
+    ('generic', '/api/generic/users/{pk}/', 'user'),
+    ('generic', '/api/generic/bookings/', None),
+    ('generic', '/api/generic/bookings/{pk}/', 'booking'),
+    ('viewset', '/api/users/', None),
+    ('viewset', '/api/users/{pk}/', 'user'),
+    ('viewset', '/api/bookings/', None),
+    ('viewset', '/api/bookings/{pk}/', 'booking'),
+    ('viewset', '/api/menu/', None),
+    ('viewset', '/api/menu/{pk}/', 'menu'),
+    ('viewset', '/api/menu-readonly/', None),
+    ('async', '/api/async/menu/', None),
+    ('async', '/api/async/bookings/', None),
+]
+
+
+def percentile(sorted_values, fraction):
+    """Percentil por rango más cercano de una lista ordenada"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara la latencia, el rendimiento y las consultas por petición de cada estilo de vista '
+        '(funciones, APIView, mixins, genéricas, ViewSets y asíncronas) con clientes concurrentes en el proceso. '
+        'Siembra los datos en una base de datos de pruebas temporal (como manage.py test) que se '
+        'destruye al terminar; con --current-database usa la configurada y elimina lo sembrado.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--menu', type=int, default=200, help='Elementos del menú a sembrar')
+        parser.add_argument('--bookings', type=int, default=2000, help='Reservas a sembrar')
+        parser.add_argument('--users', type=int, default=200, help='Usuarios a sembrar')
+        parser.add_argument('--requests', type=int, default=200, help='Peticiones medidas por ruta')
+        parser.add_argument('--concurrency', type=int, default=4, help='Clientes concurrentes por ruta')
+        parser.add_argument('--warmup', type=int, default=5, help='Peticiones sin medir por ruta')
+        parser.add_argument('--routes', default='', help='Solo las rutas que contengan este texto')
+        parser.add_argument('--output', help='Fichero JSON donde guardar los resultados')
+        parser.add_argument('--compare', help='JSON de una ejecución anterior con el que comparar')
+        parser.add_argument('--current-database', action='store_true',
+                            help='Sembrar en la base de datos configurada en lugar de en una temporal')
+
+    def handle(self, *args, **options):
+        routes = [route for route in ROUTES if options['routes'] in route[1]]
+        if not routes:
+            raise CommandError('Ninguna ruta coincide con --routes.')
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency y --requests deben ser mayores que cero.')
+        baseline = self.load(options['compare']) if options['compare'] else None
+
+        with ExitStack() as stack:
+            if not options['current_database']:
+                stack.enter_context(self.throwaway_database())
+            seeded = self.seed(options)
+            try:
+                results = [self.run_route(style, path, target, seeded, options) for style, path, target in routes]
+            finally:
+                self.cleanup()
+
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'commit': self.git_commit(),
+                'database': connection.vendor,
+                'seed': {key: options[key] for key in ('menu', 'bookings', 'users')},
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+            },
+            'routes': results,
+        }
+        self.print_report(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Resultados guardados en {options['output']}")
+
+    # ===========================================
+    # DATOS
+    # ===========================================
+
+    @contextmanager
+    def throwaway_database(self):
+        """
+        Base de datos de pruebas temporal con el mismo motor que ``default``.
+        Las réplicas no tienen los datos sembrados: las lecturas van a ``default``.
+        """
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={DEFAULT_DB_ALIAS},
+                                     serialized_aliases=set())
+        try:
+            with override_settings(READ_REPLICAS={'ALIASES': []}):
+                yield
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+    # Se siembra con bulk_create y se limpia sin señales: la ocupación, los
+    # resúmenes y el índice de búsqueda de las reservas reales no cambian
+
+    def seed(self, options):
+        self.cleanup()
+        admin = User.objects.create_superuser(f'{SEED_PREFIX}admin', password=None)
+        token = Token.objects.create(user=admin)
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            [User(username=f'{SEED_PREFIX}{i}', password=password) for i in range(options['users'])]
+        )
+        menu = Menu.objects.bulk_create(
+            [Menu(Title=f'{SEED_PREFIX}{i}', Price=10 + i % 20, Inventory=100) for i in range(options['menu'])]
+        )
+        # Fechas lejanas para no tocar la ocupación de las reservas reales
+        start = datetime(2099, 1, 1, 12, tzinfo=timezone.utc)
+        bookings = Booking.objects.bulk_create([
+            Booking(Name=f'{SEED_PREFIX}{i}', No_of_guests=1 + i % 6,
+                    BookingDate=start + timedelta(minutes=30 * i))
+            for i in range(options['bookings'])
+        ])
+        menu_cache.invalidate()
+        return {
+            'token': token.key,
+            'user': users[0].pk if users else admin.pk,
+            'menu': menu[0].pk if menu else None,
+            'booking': bookings[0].pk if bookings else None,
+        }
+
+    def cleanup(self):
+        bookings = Booking.objects.filter(Name__startswith=SEED_PREFIX)
+        BookingSearchTrigram.objects.filter(Booking__in=bookings).delete()
+        # DELETE directo: queryset.delete() enviaría post_delete por fila y
+        # descontaría de la ocupación y los resúmenes plazas nunca sumadas
+        bookings._raw_delete(bookings.db)
+        Menu.objects.filter(Title__startswith=SEED_PREFIX).delete()
+        User.objects.filter(username__startswith=SEED_PREFIX).delete()
+        menu_cache.invalidate()
+
+    # ===========================================
+    # MEDICIÓN
+    # ===========================================
+
+    def make_client(self, token):
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        return Client(SERVER_NAME=host, headers={'Authorization': f'Token {token}'})
+
+    def run_route(self, style, pattern, target, seeded, options):
+        path = pattern
+        if target is not None:
+            if seeded[target] is None:
+                return {'style': style, 'route': pattern, 'skipped': f'sin datos de {target}'}
+            path = pattern.format(pk=seeded[target])
+
+        warmup = self.make_client(seeded['token'])
+        for _ in range(options['warmup']):
+            warmup.get(path)
+
+        concurrency = options['concurrency']
+        per_client = [options['requests'] // concurrency] * concurrency
+        for i in range(options['requests'] % concurrency):
+            per_client[i] += 1
+
+        samples, statuses, queries = [], {}, [0]
+        lock = threading.Lock()
+
+        def worker(count):
+            client = self.make_client(seeded['token'])
+            counter = QueryCounter()
+            local_samples, local_statuses = [], {}
+            try:
+                with ExitStack() as stack:
+                    for alias in connections:
+                        stack.enter_context(connections[alias].execute_wrapper(counter))
+                    for _ in range(count):
+                        started = time.perf_counter()
+                        response = client.get(path)
+                        if response.streaming:
+                            b''.join(response.streaming_content)
+                        local_samples.append(time.perf_counter() - started)
+                        local_statuses[response.status_code] = local_statuses.get(response.status_code, 0) + 1
+            finally:
+                if threading.current_thread() is not threading.main_thread():
+                    connections.close_all()
+                with lock:
+                    samples.extend(local_samples)
+                    queries[0] += counter.count
+                    for code, value in local_statuses.items():
+                        statuses[code] = statuses.get(code, 0) + value
+
+        started = time.perf_counter()
+        if concurrency == 1:
+            worker(per_client[0])
+        else:
+            threads = [threading.Thread(target=worker, args=(count,)) for count in per_client if count]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - started
+
+        samples.sort()
+        to_ms = lambda value: round(value * 1000, 3)  # noqa: E731
+        return {
+            'style': style,
+            'route': pattern,
+            'path': path,
+            'requests': len(samples),
+            'statuses': {str(code): count for code, count in sorted(statuses.items())},
+            'p50_ms': to_ms(percentile(samples, 0.50)),
+            'p95_ms': to_ms(percentile(samples, 0.95)),
+            'p99_ms': to_ms(percentile(samples, 0.99)),
+            'mean_ms': to_ms(sum(samples) / len(samples)),
+            'throughput_rps': round(len(samples) / elapsed, 1),
+            'queries_per_request': round(queries[0] / len(samples), 2),
+        }
+
+    # ===========================================
+    # INFORME
+    # ===========================================
+
+    def load(self, path):
+        try:
+            with open(path) as source:
+                return {(r['style'], r['route']): r for r in json.load(source)['routes']}
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'No se puede leer {path}: {exc}')
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def print_report(self, results, baseline):
+        header = f"{'estilo':<9}{'ruta':<32}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'consultas':>11}"
+        if baseline is not None:
+            header += f"{'Δ p95':>9}{'Δ cons.':>9}"
+        self.stdout.write(header)
+        for result in results:
+            if 'skipped' in result:
+                self.stdout.write(f"{result['style']:<9}{result['route']:<32}  omitida: {result['skipped']}")
+                continue
+            line = (
+                f"{result['style']:<9}{result['route']:<32}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+                f"{result['p99_ms']:>9.2f}{result['throughput_rps']:>9.1f}{result['queries_per_request']:>11.2f}"
+            )
+            previous = baseline.get((result['style'], result['route'])) if baseline is not None else None
+            if previous is not None and 'skipped' not in previous:
+                line += (
+                    f"{result['p95_ms'] - previous['p95_ms']:>+9.2f}"
+                    f"{result['queries_per_request'] - previous['queries_per_request']:>+9.2f}"
+                )
+            self.stdout.write(line)
+            errors = {code: count for code, count in result['statuses'].items() if not code.startswith('2')}
+            if errors:
+                self.stdout.write(self.style.WARNING(f'    respuestas no 2xx: {errors}'))
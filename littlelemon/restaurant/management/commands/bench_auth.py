@@ -0,0 +1,57 @@
+import base64
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import BasicAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from restaurant.authentication import CachedTokenAuthentication, token_cache
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el coste por petición de cada clase de autenticación. '
+        'Crea un usuario y un token temporales en la base de datos configurada y los elimina al terminar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Peticiones por clase (Basic usa una décima parte)')
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user('__bench_auth__', password='bench-password')
+        token = Token.objects.create(user=user)
+        factory = APIRequestFactory()
+        basic = factory.get('/', HTTP_AUTHORIZATION='Basic ' + self.basic_credentials())
+        token_request = factory.get('/', HTTP_AUTHORIZATION=f'Token {token.key}')
+        try:
+            token_cache.clear()
+            results = [
+                self.measure('TokenAuthentication', TokenAuthentication(), token_request, options['requests']),
+                self.measure('CachedTokenAuthentication', CachedTokenAuthentication(), token_request, options['requests']),
+                # PBKDF2 es lento a propósito: con menos iteraciones basta para estimar el coste
+                self.measure('BasicAuthentication', BasicAuthentication(), basic, max(1, options['requests'] // 10)),
+            ]
+        finally:
+            user.delete()
+            token_cache.clear()
+
+        self.stdout.write(f"{'clase':<28}{'µs/petición':>14}{'consultas/petición':>22}")
+        for name, micros, queries in results:
+            self.stdout.write(f'{name:<28}{micros:>14.1f}{queries:>22.2f}')
+
+    def basic_credentials(self):
+        return base64.b64encode(b'__bench_auth__:bench-password').decode()
+
+    def measure(self, name, authenticator, django_request, count):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for _ in range(count):
+                result = authenticator.authenticate(Request(django_request))
+                assert result is not None, name
+            elapsed = time.perf_counter() - started
+        return name, elapsed / count * 1e6, len(queries.captured_queries) / count
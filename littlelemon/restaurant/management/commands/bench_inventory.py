@@ -0,0 +1,86 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+
+from restaurant.inventory import InsufficientStock, reserve_stock
+from restaurant.models import Menu
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el descuento de inventario con muchos hilos concurrentes sobre la misma fila. '
+        'Crea un elemento temporal del menú en la base de datos configurada y lo elimina al terminar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16, help='Hilos concurrentes')
+        parser.add_argument('--per-thread', type=int, default=100, help='Descuentos por hilo')
+        parser.add_argument('--stock', type=int, default=None,
+                            help='Inventario inicial (por defecto la mitad de los descuentos totales)')
+        parser.add_argument('--mode', choices=['atomic', 'naive'], default='atomic',
+                            help='atomic: UPDATE condicional; naive: leer-modificar-guardar como un PUT')
+
+    def handle(self, *args, **options):
+        threads, per_thread = options['threads'], options['per_thread']
+        initial = options['stock'] if options['stock'] is not None else threads * per_thread // 2
+        item = Menu.objects.create(Title='__bench_inventory__', Price=0, Inventory=initial)
+        counters = {'sold': 0, 'rejected': 0, 'errors': 0}
+        lock = threading.Lock()
+        sell = self.sell_atomic if options['mode'] == 'atomic' else self.sell_naive
+
+        def worker():
+            local = {'sold': 0, 'rejected': 0, 'errors': 0}
+            try:
+                for _ in range(per_thread):
+                    try:
+                        local['sold' if sell(item.pk) else 'rejected'] += 1
+                    except OperationalError:
+                        # SQLite puede devolver "database is locked" con mucha contención
+                        local['errors'] += 1
+            finally:
+                connection.close()
+                with lock:
+                    for key, value in local.items():
+                        counters[key] += value
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        final = Menu.objects.filter(pk=item.pk).values_list('Inventory', flat=True).get()
+        item.delete()
+
+        attempts = threads * per_thread
+        # Ventas confirmadas cuyo descuento no llegó a la base de datos
+        lost = final - (initial - counters['sold'])
+        self.stdout.write(f"mode={options['mode']} threads={threads} attempts={attempts} initial_stock={initial}")
+        self.stdout.write(
+            f"elapsed={elapsed:.3f}s throughput={attempts / elapsed:.0f} ops/s "
+            f"sold={counters['sold']} rejected={counters['rejected']} errors={counters['errors']}"
+        )
+        self.stdout.write(f"final_stock={final} lost_updates={lost}")
+        if final < 0 or lost or counters['sold'] > initial:
+            self.stdout.write(self.style.ERROR('Inventario inconsistente: negativo, sobrevendido o con actualizaciones perdidas.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Inventario consistente.'))
+
+    def sell_atomic(self, item_id):
+        try:
+            reserve_stock({item_id: 1})
+        except InsufficientStock:
+            return False
+        return True
+
+    def sell_naive(self, item_id):
+        item = Menu.objects.get(pk=item_id)
+        if item.Inventory < 1:
+            return False
+        item.Inventory -= 1
+        item.save(update_fields=['Inventory'])
+        return True
@@ -0,0 +1,97 @@
+import io
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from restaurant import renderers
+from restaurant.renderers import FastJSONParser, FastJSONRenderer
+from restaurant.serializers import BookingSerializer, MenuSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara JSONRenderer/JSONParser de DRF con FastJSONRenderer/FastJSONParser sobre listados '
+        'del menú y de reservas generados en memoria (no usa la base de datos) y comprueba que la '
+        'salida es idéntica byte a byte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Filas de cada listado')
+        parser.add_argument('--repeat', type=int, default=5, help='Repeticiones; se toma la mejor')
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError('--rows y --repeat deben ser mayores que cero.')
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING('orjson no está instalado: se mide la implementación de reserva.'))
+
+        payloads = {'menu': self.menu_payload(options['rows']), 'bookings': self.booking_payload(options['rows'])}
+        self.stdout.write(
+            f"{'listado':<10}{'operación':<10}{'DRF ms':>10}{'rápido ms':>11}{'mejora':>9}{'KiB':>9}"
+        )
+        for name, data in payloads.items():
+            expected = JSONRenderer().render(data)
+            rendered = FastJSONRenderer().render(data)
+            if rendered != expected:
+                raise CommandError(f'La salida de FastJSONRenderer no coincide con la de DRF ({name}).')
+            if FastJSONParser().parse(self.stream(expected)) != JSONParser().parse(self.stream(expected)):
+                raise CommandError(f'FastJSONParser no devuelve lo mismo que JSONParser ({name}).')
+
+            size = len(expected) / 1024
+            self.report(name, 'render', size, options['repeat'],
+                        lambda: JSONRenderer().render(data), lambda: FastJSONRenderer().render(data))
+            self.report(name, 'parse', size, options['repeat'],
+                        lambda: JSONParser().parse(self.stream(expected)),
+                        lambda: FastJSONParser().parse(self.stream(expected)))
+
+    def menu_payload(self, rows):
+        # Filas serializadas como las devuelve la API: ``Price`` ya es una cadena
+        price = MenuSerializer().fields['Price']
+        return {
+            'count': rows,
+            'next': None,
+            'previous': None,
+            'results': [
+                {'id': i, 'Title': f'Plato {i} ñ', 'Price': price.to_representation(Decimal(10 + i % 20) / 4),
+                 'Inventory': i % 100}
+                for i in range(1, rows + 1)
+            ],
+        }
+
+    def booking_payload(self, rows):
+        date_field = BookingSerializer().fields['BookingDate']
+        start = datetime(2030, 1, 1, 12, tzinfo=timezone.utc)
+        return {
+            'count': rows,
+            'next': None,
+            'previous': None,
+            'results': [
+                {'id': i, 'Name': f'Reserva {i}', 'No_of_guests': 1 + i % 6,
+                 'BookingDate': date_field.to_representation(start + timedelta(minutes=30 * i))}
+                for i in range(1, rows + 1)
+            ],
+        }
+
+    def stream(self, content):
+        return io.BytesIO(content)
+
+    def measure(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000
+
+    def report(self, name, operation, size, repeat, baseline, fast):
+        baseline_ms = self.measure(baseline, repeat)
+        fast_ms = self.measure(fast, repeat)
+        self.stdout.write(
+            f'{name:<10}{operation:<10}{baseline_ms:>10.2f}{fast_ms:>11.2f}'
+            f'{baseline_ms / fast_ms:>8.1f}x{size:>9.0f}'
+        )
@@ -0,0 +1,76 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import AnonRateThrottle
+
+from restaurant.throttling import MenuAnonThrottle, bucket_store, get_throttle_settings
+
+
+class BenchAnonRateThrottle(AnonRateThrottle):
+    # Historial de marcas de tiempo en la caché por defecto (implementación de DRF)
+    rate = '1000000/min'
+
+
+class NoThrottle:
+    def allow_request(self, request, view):
+        return True
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el coste por petición de la limitación de peticiones: sin límite, cubeta local, '
+        'cubeta sincronizada con la caché y AnonRateThrottle de DRF.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000, help='Peticiones por variante')
+        parser.add_argument('--clients', type=int, default=100, help='IPs distintas que reparten las peticiones')
+        parser.add_argument('--cache', default='default', help='Alias de CACHES para la variante sincronizada')
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        requests = [
+            Request(factory.get('/api/menu/', REMOTE_ADDR=f'10.0.{i // 250}.{i % 250 + 1}'))
+            for i in range(max(1, options['clients']))
+        ]
+        for request in requests:
+            # Anónimo, sin pasar por la autenticación
+            request.user = AnonymousUser()
+
+        rates = {**get_throttle_settings(), 'ENABLED': True, 'RATES': {'menu_anon': '1000000/min'}}
+        variants = [
+            ('sin límite', NoThrottle, {}),
+            ('cubeta local', MenuAnonThrottle, {'THROTTLING': {**rates, 'SYNC_CACHE_ALIAS': None}}),
+            ('cubeta sincronizada', MenuAnonThrottle, {'THROTTLING': {**rates, 'SYNC_CACHE_ALIAS': options['cache'],
+                                                                      'SYNC_INTERVAL': 0.01}}),
+            ('AnonRateThrottle (DRF)', BenchAnonRateThrottle, {}),
+        ]
+        results = []
+        for name, throttle_class, overrides in variants:
+            bucket_store.clear()
+            with override_settings(**overrides):
+                results.append(self.measure(name, throttle_class, requests, options['requests']))
+        bucket_store.clear()
+
+        self.stdout.write(f"{'variante':<26}{'µs/petición':>14}{'consultas/petición':>22}")
+        for name, micros, queries in results:
+            self.stdout.write(f'{name:<26}{micros:>14.2f}{queries:>22.2f}')
+        if settings.CACHES.get(options['cache'], {}).get('BACKEND', '').endswith('LocMemCache'):
+            self.stdout.write('La caché es LocMemCache: la variante sincronizada no incluye la latencia de red.')
+
+    def measure(self, name, throttle_class, requests, count):
+        clients = len(requests)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for i in range(count):
+                # DRF crea un throttle por petición
+                allowed = throttle_class().allow_request(requests[i % clients], None)
+                assert allowed, name
+            elapsed = time.perf_counter() - started
+        return name, elapsed / count * 1e6, len(queries.captured_queries) / count
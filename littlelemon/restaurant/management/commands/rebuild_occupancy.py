@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from restaurant.capacity import rebuild_occupancy
+
+
+class Command(BaseCommand):
+    help = 'Recalcula la tabla de ocupación por franjas a partir de las reservas existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Filas leídas y escritas por lote')
+
+    def handle(self, *args, **options):
+        slots = rebuild_occupancy(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Ocupación recalculada: {slots} franjas con reservas.'))
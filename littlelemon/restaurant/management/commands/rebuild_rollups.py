@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from restaurant.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los resúmenes de reservas por día y hora a partir de las reservas existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Filas leídas y escritas por lote')
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollups(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Resúmenes recalculados: {rows} horas con reservas.'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from restaurant.search import booking_search_index
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda de reservas a partir de las reservas existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Filas leídas y escritas por lote')
+
+    def handle(self, *args, **options):
+        count = booking_search_index.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Índice de búsqueda reconstruido: {count} reservas.'))
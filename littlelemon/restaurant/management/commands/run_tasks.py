@@ -0,0 +1,61 @@
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from restaurant.tasks import drain, get_task_settings, purge_done
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta las tareas de la cola (outbox) por lotes en un pool de hilos. '
+        'Se pueden lanzar varios workers a la vez; cada tarea la ejecuta solo uno.'
+    )
+
+    def add_arguments(self, parser):
+        options = get_task_settings()
+        parser.add_argument('--workers', type=int, default=options['WORKERS'], help='Hilos del pool')
+        parser.add_argument('--batch-size', type=int, default=options['BATCH_SIZE'], help='Tareas reclamadas por lote')
+        parser.add_argument('--poll-interval', type=float, default=options['POLL_INTERVAL'],
+                            help='Segundos de espera cuando la cola está vacía')
+        parser.add_argument('--once', action='store_true', help='Vacía la cola y termina')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--workers y --batch-size deben ser mayores que cero.')
+
+        self.stopping = False
+        if not options['once']:
+            # Termina el lote en curso antes de salir
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        purged = purge_done()
+        if purged:
+            self.stdout.write(f'{purged} tareas completadas antiguas eliminadas.')
+
+        processed = failed = 0
+        # Con un solo worker las tareas se ejecutan en el hilo principal
+        executor = None
+        if options['workers'] > 1:
+            executor = ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='run_tasks')
+        with executor or nullcontext():
+            while not self.stopping:
+                count, errors = drain(options['batch_size'], executor)
+                close_old_connections()
+                processed += count
+                failed += errors
+                if count:
+                    self.stdout.write(f'Lote: {count} tareas ({errors} con error).')
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['poll_interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Tareas ejecutadas: {processed} ({failed} con error).'))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,378 @@
+"""
+Métricas de rendimiento por petición.
+
+``MetricsMiddleware`` mide, para cada ruta servida por vistas de
+``restaurant``:
+
+- la latencia total (histograma),
+- el número de consultas y el tiempo en base de datos (un
+  ``execute_wrapper`` instalado en todas las conexiones de todos los hilos,
+  que mide con el ``QueryTimer`` de la petición guardado en un contextvar;
+  así también cuentan las consultas del ORM asíncrono, que se ejecutan en el
+  hilo de ``sync_to_async``),
+- el tiempo de serialización (``timer('serialize')`` en los serializadores y
+  en la serialización rápida) y de renderizado de la respuesta,
+- el tamaño de la respuesta (histograma).
+
+Los datos se acumulan en memoria del proceso y se publican en formato de
+texto de Prometheus en ``/metrics``, solo para usuarios staff o con
+``Authorization: Bearer <TOKEN>``. Las respuestas a usuarios staff incluyen
+además una cabecera ``Server-Timing``; con ``PUBLIC_SERVER_TIMING`` se añade a
+todas (expone los tiempos de base de datos, desactivado por defecto). Con
+``PERFORMANCE_METRICS['ENABLED'] = False`` el middleware solo consulta la
+configuración y pasa la petición.
+
+En despliegues con varios workers cada proceso tiene sus propias métricas.
+"""
+import contextvars
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'SERVER_TIMING': True,
+    'PUBLIC_SERVER_TIMING': False,
+    'VIEW_MODULES': ['restaurant'],
+    'LATENCY_BUCKETS': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    'SIZE_BUCKETS': (256, 1024, 4096, 16384, 65536, 262144, 1048576),
+    # Token para que Prometheus lea /metrics (Authorization: Bearer <token>)
+    'TOKEN': '',
+}
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def get_metrics_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'PERFORMANCE_METRICS', {})}
+
+
+@dataclass
+class RequestMetrics:
+    """Tiempos acumulados de la petición en curso (en segundos)"""
+    db_queries: int = 0
+    db_time: float = 0.0
+    serialize_time: float = 0.0
+    render_time: float = 0.0
+
+
+_request_metrics = contextvars.ContextVar('request_metrics', default=None)
+
+
+def get_request_metrics():
+    return _request_metrics.get()
+
+
+@contextmanager
+def timer(phase):
+    """
+    Suma la duración del bloque a ``<phase>_time`` de la petición en curso.
+    Fuera de una petición medida no hace nada.
+    """
+    metrics = _request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        name = f'{phase}_time'
+        setattr(metrics, name, getattr(metrics, name) + time.perf_counter() - start)
+
+
+class QueryTimer:
+    """``execute_wrapper`` que cuenta las consultas y su duración"""
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.db_queries += 1
+            self.metrics.db_time += time.perf_counter() - start
+
+
+_query_timer = contextvars.ContextVar('query_timer', default=None)
+
+
+def timed_execute(execute, sql, params, many, context):
+    """``execute_wrapper`` de todas las conexiones: delega en el ``QueryTimer`` de la petición en curso"""
+    query_timer = _query_timer.get()
+    if query_timer is None:
+        return execute(sql, params, many, context)
+    return query_timer(execute, sql, params, many, context)
+
+
+def install_query_timer(connection, **kwargs):
+    """
+    Instala ``timed_execute`` en ``connection`` (una por alias y por hilo).
+    Va al principio de la lista: ``execute_wrapper()`` quita el último al salir.
+    """
+    if timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, timed_execute)
+
+
+# Conexiones abiertas en cualquier hilo, incluido el de sync_to_async
+connection_created.connect(install_query_timer)
+
+
+# ===========================================
+# REGISTRO
+# ===========================================
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class RouteMetrics:
+    """Acumulados de una combinación ruta/método"""
+    def __init__(self, options):
+        self.latency = Histogram(options['LATENCY_BUCKETS'])
+        self.size = Histogram(options['SIZE_BUCKETS'])
+        self.statuses = {}
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+
+
+class MetricsRegistry:
+    """Métricas del proceso agrupadas por ``(ruta, método)``"""
+    PREFIX = 'littlelemon'
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route, method, status, duration, metrics, size):
+        with self._lock:
+            entry = self._routes.get((route, method))
+            if entry is None:
+                entry = self._routes[(route, method)] = RouteMetrics(get_metrics_settings())
+            entry.latency.observe(duration)
+            if size is not None:
+                entry.size.observe(size)
+            entry.statuses[status] = entry.statuses.get(status, 0) + 1
+            entry.db_queries += metrics.db_queries
+            entry.db_time += metrics.db_time
+            entry.serialize_time += metrics.serialize_time
+            entry.render_time += metrics.render_time
+
+    def get(self, route, method):
+        return self._routes.get((route, method))
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+    def render(self):
+        """Exposición en formato de texto de Prometheus"""
+        prefix = self.PREFIX
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = []
+            self._render_histogram(lines, f'{prefix}_http_request_duration_seconds',
+                                   'Latencia de las peticiones', routes, 'latency')
+            self._render_histogram(lines, f'{prefix}_http_response_size_bytes',
+                                   'Tamaño del cuerpo de las respuestas', routes, 'size')
+
+            lines.append(f'# HELP {prefix}_http_requests_total Peticiones atendidas')
+            lines.append(f'# TYPE {prefix}_http_requests_total counter')
+            for (route, method), entry in routes:
+                for status, count in sorted(entry.statuses.items()):
+                    labels = format_labels(route=route, method=method, status=status)
+                    lines.append(f'{prefix}_http_requests_total{{{labels}}} {count}')
+
+            counters = (
+                ('db_queries_total', 'Consultas a la base de datos', 'db_queries'),
+                ('db_duration_seconds_total', 'Tiempo en la base de datos', 'db_time'),
+                ('serialize_duration_seconds_total', 'Tiempo de serialización', 'serialize_time'),
+                ('render_duration_seconds_total', 'Tiempo de renderizado', 'render_time'),
+            )
+            for name, help_text, attr in counters:
+                lines.append(f'# HELP {prefix}_{name} {help_text}')
+                lines.append(f'# TYPE {prefix}_{name} counter')
+                for (route, method), entry in routes:
+                    labels = format_labels(route=route, method=method)
+                    lines.append(f'{prefix}_{name}{{{labels}}} {format_value(getattr(entry, attr))}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_histogram(lines, name, help_text, routes, attr):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for (route, method), entry in routes:
+            histogram = getattr(entry, attr)
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+                cumulative += count
+                labels = format_labels(route=route, method=method, le=format_value(bound))
+                lines.append(f'{name}_bucket{{{labels}}} {cumulative}')
+            labels = format_labels(route=route, method=method)
+            lines.append(f'{name}_sum{{{labels}}} {format_value(histogram.total)}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+
+def format_labels(**labels):
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels.items()
+    )
+    return ','.join(f'{key}="{value}"' for key, value in escaped)
+
+
+def format_value(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+registry = MetricsRegistry()
+
+
+def is_staff(request):
+    # DRF copia en la petición de Django el usuario autenticado por token
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_staff
+
+
+# ===========================================
+# MIDDLEWARE
+# ===========================================
+
+class MetricsMiddleware:
+    """
+    Mide cada petición a las vistas de ``restaurant`` y añade ``Server-Timing``
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        options = get_metrics_settings()
+        if not options['ENABLED']:
+            return self.get_response(request)
+        start = time.perf_counter()
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        try:
+            with self.query_timers(metrics):
+                response = self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+        return self.finish(request, response, metrics, start, options)
+
+    async def __acall__(self, request):
+        options = get_metrics_settings()
+        if not options['ENABLED']:
+            return await self.get_response(request)
+        start = time.perf_counter()
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        try:
+            with self.query_timers(metrics):
+                response = await self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+        return self.finish(request, response, metrics, start, options)
+
+    @contextmanager
+    def query_timers(self, metrics):
+        # Conexiones del hilo actual abiertas antes de importar este módulo
+        for alias in connections:
+            install_query_timer(connections[alias])
+        token = _query_timer.set(QueryTimer(metrics))
+        try:
+            yield
+        finally:
+            _query_timer.reset(token)
+
+    def process_template_response(self, request, response):
+        # El handler renderiza justo después; se mide con un callback posterior
+        metrics = get_request_metrics()
+        if metrics is not None:
+            start = time.perf_counter()
+
+            def record_render(rendered):
+                metrics.render_time += time.perf_counter() - start
+                return rendered
+
+            response.add_post_render_callback(record_render)
+        return response
+
+    def get_route(self, request, options):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return None
+        module = match._func_path.rpartition('.')[0]
+        if not any(module == prefix or module.startswith(prefix + '.') for prefix in options['VIEW_MODULES']):
+            return None
+        return match.view_name or match.route
+
+    def finish(self, request, response, metrics, start, options):
+        duration = time.perf_counter() - start
+        route = self.get_route(request, options)
+        if route is None:
+            return response
+
+        size = None if response.streaming else len(response.content)
+        registry.observe(route, request.method, response.status_code, duration, metrics, size)
+
+        if options['SERVER_TIMING'] and (options['PUBLIC_SERVER_TIMING'] or is_staff(request)):
+            response['Server-Timing'] = ', '.join((
+                f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.db_queries} queries"',
+                f'serialize;dur={metrics.serialize_time * 1000:.2f}',
+                f'render;dur={metrics.render_time * 1000:.2f}',
+                f'total;dur={duration * 1000:.2f}',
+            ))
+        return response
+
+
+# ===========================================
+# ENDPOINT
+# ===========================================
+
+def has_metrics_token(request, token):
+    keyword, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    return bool(token) and keyword == 'Bearer' and hmac.compare_digest(credentials.strip(), token)
+
+
+def metrics_view(request):
+    """
+    Métricas en formato Prometheus, para usuarios staff o con el token
+    ``TOKEN``. No se permite por IP: detrás de un proxy local todas las
+    peticiones llegan desde 127.0.0.1.
+    """
+    options = get_metrics_settings()
+    if not has_metrics_token(request, options['TOKEN']) and not is_staff(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0002_menu'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['BookingDate'], name='booking_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['BookingDate', 'No_of_guests'], name='booking_date_guests_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['Name'], name='booking_name_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
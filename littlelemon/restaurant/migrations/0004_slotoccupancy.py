@@ -0,0 +1,48 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:44
+
+from django.db import migrations, models
+
+
+def fill_existing_bookings(apps, schema_editor):
+    """Ocupa las franjas de las reservas existentes, como ``rebuild_occupancy``"""
+    from restaurant.capacity import booking_slots
+
+    Booking = apps.get_model('restaurant', 'Booking')
+    SlotOccupancy = apps.get_model('restaurant', 'SlotOccupancy')
+    db_alias = schema_editor.connection.alias
+    totals = {}
+    rows = Booking.objects.using(db_alias).order_by().values_list('BookingDate', 'No_of_guests')
+    for booking_date, guests in rows.iterator(chunk_size=1000):
+        if not guests or guests <= 0:
+            continue
+        for slot in booking_slots(booking_date):
+            totals[slot] = totals.get(slot, 0) + guests
+    SlotOccupancy.objects.using(db_alias).bulk_create(
+        [SlotOccupancy(SlotStart=slot, Guests=guests) for slot, guests in totals.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0003_booking_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('SlotStart', models.DateTimeField(help_text='Inicio de la franja', unique=True)),
+                ('Guests', models.PositiveIntegerField(default=0, help_text='Plazas ocupadas en la franja')),
+            ],
+            options={
+                'verbose_name': 'Ocupación por franja',
+                'verbose_name_plural': 'Ocupación por franjas',
+                'db_table': 'restaurant_slot_occupancy',
+                'ordering': ['SlotStart'],
+            },
+        ),
+        migrations.RunPython(fill_existing_bookings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-18 21:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0004_slotoccupancy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='LastModified',
+            field=models.DateTimeField(auto_now=True, help_text='Fecha de la última modificación'),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='Version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Versión de la fila'),
+        ),
+        migrations.AddField(
+            model_name='menu',
+            name='LastModified',
+            field=models.DateTimeField(auto_now=True, help_text='Fecha de la última modificación'),
+        ),
+        migrations.AddField(
+            model_name='menu',
+            name='Version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Versión de la fila'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-18 21:18
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0005_versioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Topic', models.CharField(help_text='Nombre de la tarea registrada', max_length=100)),
+                ('Payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Argumentos de la tarea')),
+                ('Status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En ejecución'), ('done', 'Completada'), ('failed', 'Fallida')], default='pending', max_length=10)),
+                ('Attempts', models.PositiveIntegerField(default=0, help_text='Ejecuciones iniciadas')),
+                ('AvailableAt', models.DateTimeField(default=django.utils.timezone.now, help_text='No se ejecuta antes de esta fecha')),
+                ('LockedBy', models.CharField(blank=True, default='', help_text='Lote del worker que la ejecuta', max_length=32)),
+                ('LockedUntil', models.DateTimeField(blank=True, help_text='Tras esta fecha otro worker puede reclamarla', null=True)),
+                ('LastError', models.TextField(blank=True, default='')),
+                ('CreatedAt', models.DateTimeField(auto_now_add=True)),
+                ('ProcessedAt', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Tarea en cola',
+                'verbose_name_plural': 'Tareas en cola',
+                'db_table': 'restaurant_outbox_task',
+                'ordering': ['AvailableAt', 'id'],
+                'indexes': [models.Index(fields=['Status', 'AvailableAt'], name='outbox_ready_idx')],
+            },
+        ),
+    ]
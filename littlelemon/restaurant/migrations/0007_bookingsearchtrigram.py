@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-18 21:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_existing_bookings(apps, schema_editor):
+    """Indexa las reservas existentes, como ``rebuild_search_index``"""
+    from restaurant.search import text_trigrams
+
+    Booking = apps.get_model('restaurant', 'Booking')
+    BookingSearchTrigram = apps.get_model('restaurant', 'BookingSearchTrigram')
+    db_alias = schema_editor.connection.alias
+    batch = []
+    for pk, name in Booking.objects.using(db_alias).order_by().values_list('pk', 'Name').iterator(chunk_size=1000):
+        batch.extend(BookingSearchTrigram(Booking_id=pk, Trigram=trigram) for trigram in sorted(text_trigrams(name)))
+        if len(batch) >= 1000:
+            BookingSearchTrigram.objects.using(db_alias).bulk_create(batch)
+            batch = []
+    BookingSearchTrigram.objects.using(db_alias).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0006_outboxtask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingSearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Trigram', models.CharField(help_text='Trigrama del nombre normalizado', max_length=3)),
+                ('Booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_trigrams', to='restaurant.booking')),
+            ],
+            options={
+                'verbose_name': 'Trigrama de búsqueda de reservas',
+                'verbose_name_plural': 'Trigramas de búsqueda de reservas',
+                'db_table': 'restaurant_booking_search_trigram',
+                'constraints': [models.UniqueConstraint(fields=('Trigram', 'Booking'), name='booking_trigram_uniq')],
+            },
+        ),
+        migrations.RunPython(index_existing_bookings, migrations.RunPython.noop),
+    ]
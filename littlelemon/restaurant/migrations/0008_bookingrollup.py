@@ -0,0 +1,55 @@
+# Generated by Django 5.2.3 on 2026-10-18 21:42
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def summarize_existing_bookings(apps, schema_editor):
+    """Resume las reservas existentes, como ``rebuild_rollups``"""
+    from restaurant.rollups import rollup_key
+
+    Booking = apps.get_model('restaurant', 'Booking')
+    BookingRollup = apps.get_model('restaurant', 'BookingRollup')
+    db_alias = schema_editor.connection.alias
+    totals = defaultdict(lambda: [0, 0])
+    rows = Booking.objects.using(db_alias).order_by().values_list('BookingDate', 'No_of_guests')
+    for booking_date, guests in rows.iterator(chunk_size=1000):
+        total = totals[rollup_key(booking_date)]
+        total[0] += 1
+        total[1] += max(guests or 0, 0)
+    BookingRollup.objects.using(db_alias).bulk_create(
+        [
+            BookingRollup(Date=day, Hour=hour, Bookings=count, Guests=guests)
+            for (day, hour), (count, guests) in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0007_bookingsearchtrigram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Date', models.DateField(help_text='Día de las reservas')),
+                ('Hour', models.PositiveSmallIntegerField(help_text='Hora de inicio (0-23)')),
+                ('Bookings', models.PositiveIntegerField(default=0, help_text='Número de reservas')),
+                ('Guests', models.PositiveIntegerField(default=0, help_text='Suma de invitados')),
+            ],
+            options={
+                'verbose_name': 'Resumen de reservas por hora',
+                'verbose_name_plural': 'Resúmenes de reservas por hora',
+                'db_table': 'restaurant_booking_rollup',
+                'ordering': ['Date', 'Hour'],
+                'constraints': [models.UniqueConstraint(fields=('Date', 'Hour'), name='booking_rollup_date_hour_uniq')],
+            },
+        ),
+        migrations.RunPython(summarize_existing_bookings, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,64 @@
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models, transaction
+from django.db.models.sql import UpdateQuery
+from django.utils import timezone
 
 # Create your models here.
 
-class Booking(models.Model):
+def can_return_from_update(connection):
+    """``UPDATE ... RETURNING``: PostgreSQL y SQLite >= 3.35"""
+    if connection.vendor == 'postgresql':
+        return True
+    return connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35)
+
+
+class VersionedModel(models.Model):
+    """
+    Fecha de última modificación y número de versión de cada fila, para los
+    ``ETag``/``Last-Modified`` de los endpoints de detalle.
+    La versión se incrementa en la base de datos (``Version + 1``) en cada
+    actualización, así dos escrituras concurrentes nunca comparten versión.
+    El valor resultante se lee con ``UPDATE ... RETURNING`` en la misma
+    consulta (PostgreSQL y SQLite >= 3.35); en el resto, con un ``SELECT``.
+    """
+    LastModified = models.DateTimeField(auto_now=True, help_text="Fecha de la última modificación")
+    Version = models.PositiveIntegerField(default=1, editable=False, help_text="Versión de la fila")
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.Version = models.F('Version') + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'Version', 'LastModified'}
+        super().save(*args, **kwargs)
+        if not isinstance(self.Version, int):
+            self.refresh_from_db(fields=['Version'])
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        connection = connections[using]
+        if isinstance(self.Version, int) or not values or not can_return_from_update(connection):
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        query = base_qs.filter(pk=pk_val).query.chain(UpdateQuery)
+        query.add_update_fields(values)
+        sql, params = query.get_compiler(using).as_sql()
+        column = connection.ops.quote_name(self._meta.get_field('Version').column)
+        with connection.cursor() as cursor:
+            cursor.execute('%s RETURNING %s' % (sql, column), params)
+            row = cursor.fetchone()
+        if row is None:
+            return False
+        self.Version = row[0]
+        return True
+
+    @staticmethod
+    def version_bump():
+        """Valores para ``update()``/``bulk_update()``, que no pasan por ``save()``"""
+        return {'Version': models.F('Version') + 1, 'LastModified': timezone.now()}
+
+
+class Booking(VersionedModel):
     """
     Modelo para manejar las reservas del restaurante Little Lemon
     """
@@ -16,12 +72,73 @@ class Booking(models.Model):
         verbose_name = 'Reserva'
         verbose_name_plural = 'Reservas'
         ordering = ['BookingDate']
+        indexes = [
+            # Orden por defecto, date_hierarchy del admin y filtros por fecha
+            models.Index(fields=['BookingDate'], name='booking_date_idx'),
+            models.Index(fields=['BookingDate', 'No_of_guests'], name='booking_date_guests_idx'),
+            # Búsqueda por prefijo del nombre (LIKE 'abc%'); el opclass solo aplica en PostgreSQL
+            models.Index(fields=['Name'], name='booking_name_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ]
     
     def __str__(self):
         return f"{self.Name} - {self.No_of_guests} invitados - {self.BookingDate.strftime('%d/%m/%Y %H:%M')}"
 
+    def save(self, *args, **kwargs):
+        """
+        Guarda la reserva y aplica la diferencia en la ocupación de las
+        franjas y en los resúmenes, todo en la misma transacción: si no hay
+        plazas (``CapacityExceeded``) no se guarda nada, aunque quien llama no
+        haya abierto una transacción.
+        """
+        from . import capacity, rollups
+        with transaction.atomic():
+            previous = capacity.get_previous_occupancy(self)
+            super().save(*args, **kwargs)
+            current = (self.BookingDate, self.No_of_guests)
+            capacity.move(previous, current)
+            rollups.move(previous, current)
+        self._loaded_occupancy = current
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valores cargados, para que la ocupación se actualice por diferencia al guardar
+        if 'BookingDate' in field_names and 'No_of_guests' in field_names:
+            instance._loaded_occupancy = (instance.BookingDate, instance.No_of_guests)
+        # Nombre cargado, para reindexar la búsqueda solo si cambia
+        if 'Name' in field_names:
+            instance._loaded_name = instance.Name
+        return instance
 
-class Menu(models.Model):
+    def clean(self):
+        """Comprueba que haya plazas libres (el admin valida con esto antes de guardar)"""
+        from .capacity import check_capacity
+        check_capacity(self)
+
+
+class BookingSearchTrigram(models.Model):
+    """
+    Índice de búsqueda de reservas: una fila por trigrama del nombre
+    normalizado (ver search.py). Se actualiza al crear, renombrar o eliminar
+    reservas, así la búsqueda solo lee las filas de los trigramas buscados.
+    """
+    Booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name='search_trigrams')
+    Trigram = models.CharField(max_length=3, help_text="Trigrama del nombre normalizado")
+
+    class Meta:
+        db_table = 'restaurant_booking_search_trigram'
+        verbose_name = 'Trigrama de búsqueda de reservas'
+        verbose_name_plural = 'Trigramas de búsqueda de reservas'
+        constraints = [
+            # También es el índice de búsqueda: (Trigram, Booking_id) sin leer la tabla
+            models.UniqueConstraint(fields=['Trigram', 'Booking'], name='booking_trigram_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.Trigram!r} - reserva #{self.Booking_id}"
+
+
+class Menu(VersionedModel):
     """
     Modelo para manejar los elementos del menú del restaurante Little Lemon
     """
@@ -38,3 +155,89 @@ class Menu(models.Model):
     
     def __str__(self):
         return f"{self.Title} - ${self.Price} (Stock: {self.Inventory})"
+
+
+class SlotOccupancy(models.Model):
+    """
+    Ocupación precalculada por franja horaria.
+    Se actualiza de forma incremental al crear, modificar o eliminar reservas,
+    así la disponibilidad se consulta sin recorrer la tabla de reservas.
+    """
+    SlotStart = models.DateTimeField(unique=True, help_text="Inicio de la franja")
+    Guests = models.PositiveIntegerField(default=0, help_text="Plazas ocupadas en la franja")
+
+    class Meta:
+        db_table = 'restaurant_slot_occupancy'
+        verbose_name = 'Ocupación por franja'
+        verbose_name_plural = 'Ocupación por franjas'
+        ordering = ['SlotStart']
+
+    def __str__(self):
+        return f"{self.SlotStart.strftime('%d/%m/%Y %H:%M')} - {self.Guests} plazas ocupadas"
+
+
+class BookingRollup(models.Model):
+    """
+    Reservas e invitados (cubiertos) por día y hora de inicio, en la zona
+    horaria del proyecto. Se actualiza de forma incremental al crear,
+    modificar o eliminar reservas (ver rollups.py), así las estadísticas se
+    calculan sin agrupar la tabla de reservas.
+    """
+    Date = models.DateField(help_text="Día de las reservas")
+    Hour = models.PositiveSmallIntegerField(help_text="Hora de inicio (0-23)")
+    Bookings = models.PositiveIntegerField(default=0, help_text="Número de reservas")
+    Guests = models.PositiveIntegerField(default=0, help_text="Suma de invitados")
+
+    class Meta:
+        db_table = 'restaurant_booking_rollup'
+        verbose_name = 'Resumen de reservas por hora'
+        verbose_name_plural = 'Resúmenes de reservas por hora'
+        ordering = ['Date', 'Hour']
+        constraints = [
+            models.UniqueConstraint(fields=['Date', 'Hour'], name='booking_rollup_date_hour_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.Date.strftime('%d/%m/%Y')} {self.Hour:02d}h - {self.Bookings} reservas, {self.Guests} invitados"
+
+
+class OutboxTask(models.Model):
+    """
+    Tarea pendiente de la cola de efectos secundarios (patrón outbox).
+    Se escribe en la misma transacción que el cambio que la origina y la
+    ejecuta después ``python manage.py run_tasks`` (ver tasks.py).
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pendiente'),
+        (RUNNING, 'En ejecución'),
+        (DONE, 'Completada'),
+        (FAILED, 'Fallida'),
+    ]
+
+    Topic = models.CharField(max_length=100, help_text="Nombre de la tarea registrada")
+    Payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder, help_text="Argumentos de la tarea")
+    Status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    Attempts = models.PositiveIntegerField(default=0, help_text="Ejecuciones iniciadas")
+    AvailableAt = models.DateTimeField(default=timezone.now, help_text="No se ejecuta antes de esta fecha")
+    LockedBy = models.CharField(max_length=32, blank=True, default='', help_text="Lote del worker que la ejecuta")
+    LockedUntil = models.DateTimeField(null=True, blank=True, help_text="Tras esta fecha otro worker puede reclamarla")
+    LastError = models.TextField(blank=True, default='')
+    CreatedAt = models.DateTimeField(auto_now_add=True)
+    ProcessedAt = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'restaurant_outbox_task'
+        verbose_name = 'Tarea en cola'
+        verbose_name_plural = 'Tareas en cola'
+        ordering = ['AvailableAt', 'id']
+        indexes = [
+            # Búsqueda de tareas listas por los workers
+            models.Index(fields=['Status', 'AvailableAt'], name='outbox_ready_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.Topic} #{self.pk} ({self.get_Status_display()})"
@@ -0,0 +1,178 @@
+"""
+Clases de paginación de la API.
+
+Los endpoints de listas grandes (reservas, usuarios) admiten dos modos,
+seleccionables por petición con ``?pagination=``:
+
+- ``page`` (por defecto): paginación por número de página, compatible con
+  los clientes actuales. Con ``?count=false`` se omite el ``COUNT(*)``.
+- ``cursor``: paginación keyset; cada página es una consulta indexada
+  ``WHERE (orden) > cursor LIMIT n`` sin ``OFFSET`` ni ``COUNT(*)``.
+"""
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+FALSE_VALUES = ('0', 'false', 'no', 'off')
+
+
+def get_ordering_fields(view):
+    """Columnas que el paginador de la vista necesita leer de cada fila"""
+    get_fields = getattr(view.paginator, 'get_ordering_fields', None)
+    return get_fields(view.request) if get_fields is not None else ()
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """
+    Paginación por número de página con la opción de omitir el total.
+    Con ``?count=false`` se lee una fila de más para saber si hay página
+    siguiente y la respuesta no incluye ``count``.
+    """
+    count_query_param = 'count'
+
+    def skips_count(self, request):
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in FALSE_VALUES
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.skip_count = self.skips_count(request)
+        if not self.skip_count:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+            if self.page_number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param),
+                message='Invalid page.',
+            ))
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=self.page_number, message='That page contains no results',
+            ))
+        self.has_next = len(rows) > page_size
+        self.request = request
+        self.display_page_controls = False
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if not self.skip_count:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.skip_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if not self.skip_count:
+            return super().get_previous_link()
+        if self.page_number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+
+class BookingCursorPagination(pagination.CursorPagination):
+    """
+    Paginación keyset para reservas, en el mismo orden que ``Booking.Meta.ordering``
+    (con ``id`` para desempatar reservas a la misma hora)
+    """
+    ordering = ('BookingDate', 'id')
+
+
+class UserCursorPagination(pagination.CursorPagination):
+    """
+    Paginación keyset para usuarios sobre la clave primaria
+    """
+    ordering = ('id',)
+
+
+class SelectablePagination(pagination.BasePagination):
+    """
+    Delega en la paginación por páginas o por cursor según ``?pagination=``.
+    Sin el parámetro se mantiene la paginación por número de página.
+    """
+    mode_query_param = 'pagination'
+    page_class = PageNumberPagination
+    cursor_class = None
+
+    def __init__(self):
+        self.paginator = self.page_class()
+
+    def get_paginator_class(self, request):
+        mode = request.query_params.get(self.mode_query_param)
+        if mode == 'cursor' and self.cursor_class is not None:
+            return self.cursor_class
+        return self.page_class
+
+    def get_ordering_fields(self, request):
+        """
+        Columnas de las que el cursor lee su posición; la vista las carga
+        aunque ``?fields=`` no las pida (vacío en la paginación por páginas)
+        """
+        paginator_class = self.get_paginator_class(request)
+        if not issubclass(paginator_class, pagination.CursorPagination):
+            return ()
+        ordering = paginator_class.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return tuple(field.lstrip('-') for field in ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator_class(request)()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return self.paginator.get_results(data)
+
+    def get_schema_operation_parameters(self, view):
+        return self.paginator.get_schema_operation_parameters(view)
+
+    def __getattr__(self, name):
+        # page_size, cursor_query_param, etc. vienen del paginador activo
+        if name == 'paginator':
+            raise AttributeError(name)
+        return getattr(self.paginator, name)
+
+
+class BookingPagination(SelectablePagination):
+    cursor_class = BookingCursorPagination
+
+
+class UserPagination(SelectablePagination):
+    cursor_class = UserCursorPagination
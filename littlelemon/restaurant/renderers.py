@@ -0,0 +1,108 @@
+"""
+Renderer y parser JSON rápidos.
+
+``FastJSONRenderer`` y ``FastJSONParser`` sustituyen a ``JSONRenderer`` y
+``JSONParser`` de DRF usando ``orjson`` cuando está instalado (dependencia
+opcional) y la implementación de DRF si no lo está. La salida es la misma
+que la de DRF con ``COMPACT_JSON`` y ``UNICODE_JSON``:
+
+- Los tipos que ``orjson`` no conoce (``Decimal``, fechas, cadenas
+  traducibles...) pasan por ``JSONEncoder.default`` de DRF, así que un
+  ``Decimal`` fuera del serializador se sigue escribiendo como número y los
+  ``datetime`` en UTC terminan en ``Z``. ``Menu.Price`` ya llega como cadena
+  desde el serializador (``COERCE_DECIMAL_TO_STRING``) y no cambia.
+- ``\\u2028`` y ``\\u2029`` se escapan igual que en DRF.
+- Lo que ``orjson`` no puede codificar (enteros de más de 64 bits) se
+  delega en DRF.
+
+Diferencias conocidas: los ``float`` con exponente se escriben ``1e16`` en
+vez de ``1e+16`` (mismo valor) y ``NaN``/``Infinity`` se escriben ``null``.
+La API no devuelve ``float``.
+"""
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import json as drf_json
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional
+    orjson = None
+
+
+if orjson is not None:
+    ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+_default = JSONEncoder().default
+
+
+def escape_line_separators(content):
+    # JSON válido como subconjunto estricto de JavaScript (igual que DRF)
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+    return content
+
+
+def stdlib_dumps(data):
+    """JSON compacto en UTF-8 con el codificador de DRF"""
+    content = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    return content.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+def dumps(data):
+    """``data`` en JSON compacto (bytes UTF-8), con la salida del ``JSONRenderer`` de DRF"""
+    if orjson is not None:
+        try:
+            return escape_line_separators(orjson.dumps(data, default=_default, option=ORJSON_OPTIONS))
+        except orjson.JSONEncodeError:
+            pass
+    return stdlib_dumps(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` con ``orjson``; la salida indentada (``?indent=``, API
+    navegable) y la configuración no compacta siguen usando DRF
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """
+    ``JSONParser`` con ``orjson``; lo que ``orjson`` rechaza (otras
+    codificaciones, ``NaN`` sin ``STRICT_JSON``, enteros de más de 64 bits)
+    se analiza con la biblioteca estándar
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        content = stream.read()
+
+        if orjson is not None and codecs.lookup(encoding).name == 'utf-8':
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+
+        try:
+            parse_constant = drf_json.strict_constant if self.strict else None
+            return json.loads(content.decode(encoding), parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,151 @@
+"""
+Resúmenes de reservas para las estadísticas (``/api/bookings/stats/``).
+
+``BookingRollup`` guarda, por día y hora de inicio (en ``TIME_ZONE``), el
+número de reservas y la suma de invitados. Cada alta, cambio o baja de una
+reserva aplica su diferencia con un ``UPDATE ... SET Bookings = Bookings + n``
+por cada (día, hora) afectado, así las estadísticas por día, hora o día de
+la semana agrupan como mucho 24 filas por día en vez de toda la tabla de
+reservas.
+
+La migración que crea la tabla resume las reservas existentes; si cambia
+``TIME_ZONE``, ejecuta ``python manage.py rebuild_rollups``.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractIsoWeekDay, Greatest
+from django.utils import timezone
+
+from .models import Booking, BookingRollup
+
+
+WEEKDAY_NAMES = {1: 'lunes', 2: 'martes', 3: 'miércoles', 4: 'jueves', 5: 'viernes', 6: 'sábado', 7: 'domingo'}
+
+
+def rollup_key(booking_date):
+    """``(día, hora)`` de ``booking_date`` en la zona horaria del proyecto"""
+    if isinstance(booking_date, str):
+        booking_date = Booking._meta.get_field('BookingDate').to_python(booking_date)
+    local = timezone.localtime(booking_date, timezone.get_default_timezone())
+    return local.date(), local.hour
+
+
+# ===========================================
+# ACTUALIZACIÓN INCREMENTAL
+# ===========================================
+
+def apply_changes(removed=(), added=()):
+    """
+    Aplica un lote de reservas eliminadas y añadidas, ambas como pares
+    ``(BookingDate, No_of_guests)``. Los cambios se agregan por (día, hora):
+    cada fila recibe un único ``UPDATE`` aunque el lote tenga muchas reservas.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for sign, items in ((-1, removed), (1, added)):
+        for booking_date, guests in items:
+            delta = deltas[rollup_key(booking_date)]
+            delta[0] += sign
+            delta[1] += sign * max(guests or 0, 0)
+    deltas = {key: delta for key, delta in deltas.items() if delta != [0, 0]}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        BookingRollup.objects.bulk_create(
+            [BookingRollup(Date=day, Hour=hour) for (day, hour), (count, _) in deltas.items() if count > 0],
+            ignore_conflicts=True,
+        )
+        # En orden ascendente para que las transacciones concurrentes bloqueen las filas en el mismo orden
+        for (day, hour) in sorted(deltas):
+            count, guests = deltas[(day, hour)]
+            # Nunca por debajo de 0 (filas que faltaban o reservas anteriores a la tabla)
+            BookingRollup.objects.filter(Date=day, Hour=hour).update(
+                Bookings=Greatest(F('Bookings') + count, 0), Guests=Greatest(F('Guests') + guests, 0),
+            )
+
+
+def move(previous, current):
+    """Cambio de una reserva de ``previous`` a ``current`` (tuplas ``(BookingDate, No_of_guests)`` o ``None``)"""
+    if previous == current:
+        return
+    apply_changes(
+        removed=[previous] if previous is not None else [],
+        added=[current] if current is not None else [],
+    )
+
+
+# ===========================================
+# CONSULTA Y RECONSTRUCCIÓN
+# ===========================================
+
+def summarize(row):
+    bookings, guests = row['bookings'] or 0, row['guests'] or 0
+    return {
+        'bookings': bookings,
+        'guests': guests,
+        'average_party_size': round(guests / bookings, 2) if bookings else None,
+    }
+
+
+def get_stats(date_from=None, date_to=None):
+    """
+    Reservas, invitados y tamaño medio de grupo en total y por día, hora y
+    día de la semana (1 = lunes), entre ``date_from`` y ``date_to`` incluidos
+    """
+    rollups = BookingRollup.objects.filter(Bookings__gt=0).order_by()
+    if date_from is not None:
+        rollups = rollups.filter(Date__gte=date_from)
+    if date_to is not None:
+        rollups = rollups.filter(Date__lte=date_to)
+    totals = {'bookings': Sum('Bookings'), 'guests': Sum('Guests')}
+
+    by_day = [
+        {'date': row['Date'], **summarize(row)}
+        for row in rollups.values('Date').annotate(**totals).order_by('Date')
+    ]
+    by_hour = [
+        {'hour': row['Hour'], **summarize(row)}
+        for row in rollups.values('Hour').annotate(**totals).order_by('Hour')
+    ]
+    by_weekday = [
+        {'weekday': row['weekday'], 'name': WEEKDAY_NAMES[row['weekday']], 'days': row['days'], **summarize(row)}
+        for row in rollups.annotate(weekday=ExtractIsoWeekDay('Date')).values('weekday')
+        .annotate(days=Count('Date', distinct=True), **totals).order_by('weekday')
+    ]
+    overall = {
+        'bookings': sum(row['bookings'] for row in by_day),
+        'guests': sum(row['guests'] for row in by_day),
+    }
+    return {
+        'date_from': date_from,
+        'date_to': date_to,
+        'totals': summarize(overall),
+        'by_day': by_day,
+        'by_hour': by_hour,
+        'by_weekday': by_weekday,
+    }
+
+
+def rebuild_rollups(batch_size=1000):
+    """
+    Recalcula todos los resúmenes a partir de las reservas.
+    Devuelve el número de filas (día, hora) con reservas.
+    """
+    totals = defaultdict(lambda: [0, 0])
+    rows = Booking.objects.order_by().values_list('BookingDate', 'No_of_guests').iterator(chunk_size=batch_size)
+    for booking_date, guests in rows:
+        total = totals[rollup_key(booking_date)]
+        total[0] += 1
+        total[1] += max(guests or 0, 0)
+    with transaction.atomic():
+        BookingRollup.objects.all().delete()
+        BookingRollup.objects.bulk_create(
+            [
+                BookingRollup(Date=day, Hour=hour, Bookings=count, Guests=guests)
+                for (day, hour), (count, guests) in totals.items()
+            ],
+            batch_size=batch_size,
+        )
+    return len(totals)
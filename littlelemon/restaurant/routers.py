@@ -0,0 +1,259 @@
+"""
+Enrutado de lecturas a réplicas de la base de datos.
+
+``ReplicaRoutingMiddleware`` marca las peticiones GET/HEAD/OPTIONS atendidas
+por vistas de ``restaurant`` como aptas para leer de una réplica, y
+``ReplicaRouter`` envía entonces las lecturas de los modelos de las apps
+configuradas a una réplica sana. El resto (escrituras, transacciones,
+comandos de gestión, otras apps como ``auth``) va siempre a ``default``.
+
+Lectura de las propias escrituras: cuando una petición escribe en un modelo
+enrutado, el cliente queda fijado a ``default`` durante ``PIN_SECONDS``
+mediante una cookie y, si la petición traía cabecera ``Authorization``, una
+marca en la caché de Django asociada a esas credenciales.
+
+Las lecturas cuyo resultado se reutiliza para otros clientes (el relleno de
+la caché del menú) se hacen dentro de ``read_from_primary()``: una réplica
+con retraso no puede dejar en la caché datos previos a la última escritura.
+
+Si una réplica no responde se descarta durante ``HEALTH_CHECK_INTERVAL``
+segundos y las lecturas vuelven a ``default``.
+"""
+import contextvars
+import hashlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.dispatch import receiver
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+DEFAULT_SETTINGS = {
+    'ALIASES': [],
+    'APPS': ['restaurant'],
+    'VIEW_MODULES': ['restaurant'],
+    'PIN_SECONDS': 5,
+    'PIN_COOKIE': 'primary_pin',
+    'HEALTH_CHECK_INTERVAL': 10,
+}
+
+
+def get_replica_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'READ_REPLICAS', {})}
+
+
+@dataclass
+class RoutingState:
+    """Estado de enrutado de la petición en curso"""
+    pinned: bool = False
+    use_replica: bool = False
+    wrote: bool = False
+
+
+# Fuera de una petición (shell, comandos, tareas) no hay estado: todo va a default
+_routing_state = contextvars.ContextVar('replica_routing_state', default=None)
+
+
+def get_routing_state():
+    return _routing_state.get()
+
+
+@contextmanager
+def read_from_primary():
+    """Las lecturas del bloque van a ``default`` aunque la petición pueda usar réplicas"""
+    state = _routing_state.get()
+    if state is None or not state.use_replica:
+        yield
+        return
+    state.use_replica = False
+    try:
+        yield
+    finally:
+        state.use_replica = True
+
+
+# ===========================================
+# SALUD DE LAS RÉPLICAS
+# ===========================================
+
+class ReplicaHealth:
+    """
+    Resultado de la última comprobación de cada réplica, válido durante
+    ``HEALTH_CHECK_INTERVAL`` segundos
+    """
+    def __init__(self):
+        self._checked = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='replica-health')
+
+    def record(self, alias, healthy):
+        with self._lock:
+            self._checked[alias] = (time.monotonic(), healthy)
+
+    def check(self, alias):
+        # Conexión propia en un hilo aparte: el router también se consulta
+        # desde vistas asíncronas, donde no se puede abrir una conexión
+        return self._executor.submit(self._ping, alias).result()
+
+    @staticmethod
+    def _ping(alias):
+        try:
+            connection = connections.create_connection(alias)
+        except Exception:
+            return False
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except Exception:
+            return False
+        finally:
+            connection.close()
+        return True
+
+    def is_healthy(self, alias):
+        interval = get_replica_settings()['HEALTH_CHECK_INTERVAL']
+        checked = self._checked.get(alias)
+        if checked is not None and time.monotonic() - checked[0] < interval:
+            return checked[1]
+        healthy = self.check(alias)
+        self.record(alias, healthy)
+        return healthy
+
+    def clear(self):
+        with self._lock:
+            self._checked.clear()
+
+
+replica_health = ReplicaHealth()
+
+
+@receiver(setting_changed)
+def reset_replica_health(setting, **kwargs):
+    if setting in ('READ_REPLICAS', 'DATABASES'):
+        replica_health.clear()
+
+
+# ===========================================
+# ROUTER
+# ===========================================
+
+class ReplicaRouter:
+    """
+    Router de ``DATABASE_ROUTERS``: lecturas a réplicas, escrituras a ``default``
+    """
+    def is_routed(self, model):
+        return model._meta.app_label in get_replica_settings()['APPS']
+
+    def db_for_read(self, model, **hints):
+        state = get_routing_state()
+        if state is None or not state.use_replica or state.pinned or state.wrote:
+            return None
+        if not self.is_routed(model):
+            return None
+        # Dentro de una transacción se lee de donde se escribe
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        healthy = [alias for alias in get_replica_settings()['ALIASES'] if replica_health.is_healthy(alias)]
+        return random.choice(healthy) if healthy else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = get_routing_state()
+        if state is not None and self.is_routed(model):
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replica_settings()['ALIASES']}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema por replicación
+        if db in get_replica_settings()['ALIASES']:
+            return False
+        return None
+
+
+# ===========================================
+# MIDDLEWARE
+# ===========================================
+
+def get_pin_cache_key(request):
+    authorization = request.headers.get('Authorization')
+    if not authorization:
+        return None
+    return 'replica-pin:' + hashlib.sha256(authorization.encode()).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Abre el estado de enrutado de cada petición y fija el cliente a
+    ``default`` tras una escritura
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _routing_state.set(self.start(request))
+        try:
+            response = self.get_response(request)
+            return self.finish(request, response)
+        finally:
+            _routing_state.reset(token)
+
+    async def __acall__(self, request):
+        token = _routing_state.set(self.start(request))
+        try:
+            response = await self.get_response(request)
+            return self.finish(request, response)
+        finally:
+            _routing_state.reset(token)
+
+    def start(self, request):
+        options = get_replica_settings()
+        pinned = options['PIN_COOKIE'] in request.COOKIES
+        if not pinned:
+            key = get_pin_cache_key(request)
+            pinned = key is not None and cache.get(key) is not None
+        return RoutingState(pinned=pinned)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = get_routing_state()
+        if state is None or request.method not in SAFE_METHODS:
+            return None
+        module = getattr(view_func, 'cls', view_func).__module__
+        state.use_replica = any(
+            module == prefix or module.startswith(prefix + '.')
+            for prefix in get_replica_settings()['VIEW_MODULES']
+        )
+        return None
+
+    def finish(self, request, response):
+        state = get_routing_state()
+        if state.wrote:
+            options = get_replica_settings()
+            response.set_cookie(options['PIN_COOKIE'], '1', max_age=options['PIN_SECONDS'],
+                                httponly=True, samesite='Lax')
+            key = get_pin_cache_key(request)
+            if key is not None:
+                cache.set(key, True, options['PIN_SECONDS'])
+        return response
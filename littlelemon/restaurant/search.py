@@ -0,0 +1,311 @@
+"""
+Búsqueda aproximada por trigramas en los títulos del menú y los nombres de
+las reservas (``?search=`` en la API y buscador del admin).
+
+El texto se normaliza (minúsculas, sin acentos ni signos) y se divide en
+palabras; cada palabra se descompone en trigramas (``'  p'``, ``' pa'``,
+``'pae'``, ``'ael'``, ``'ell'``, ``'lla'``, ``'la '``), como ``pg_trgm``.
+Un índice invertido da los candidatos que comparten trigramas con la
+búsqueda, sin recorrer la tabla, y cada candidato se puntúa por palabra:
+1 si una palabra suya empieza por la palabra buscada y, si no, la similitud
+de trigramas con la palabra más parecida. Se devuelven los que alcanzan
+``THRESHOLD`` de media, de mayor a menor puntuación. Así "paela" encuentra
+"Paella" y "jose" encuentra "José".
+
+- Menú (``menu_search_index``): índice en memoria del proceso, construido
+  con una consulta en la primera búsqueda y actualizado al confirmar cada
+  cambio. Los cambios hechos en otros procesos se ven tras
+  ``REFRESH_INTERVAL`` segundos, cuando se reconstruye.
+- Reservas (``booking_search_index``): índice en la base de datos
+  (``BookingSearchTrigram``), actualizado en la misma transacción que la
+  reserva. La migración que lo crea indexa las reservas existentes;
+  ``python manage.py rebuild_search_index`` lo reconstruye si hace falta
+  (p. ej. tras cargar reservas con ``update()`` o SQL directo).
+"""
+import math
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, When
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Booking, BookingSearchTrigram, Menu
+
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'THRESHOLD': 0.3,
+    'MAX_CANDIDATES': 1000,
+    'MAX_RESULTS': 500,
+    'REFRESH_INTERVAL': 300,
+}
+
+
+def get_search_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'SEARCH_INDEX', {})}
+
+
+# ===========================================
+# TEXTO
+# ===========================================
+
+def normalize(text):
+    """Minúsculas, sin acentos y con los signos convertidos en espacios"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(
+        char if char.isalnum() else ' '
+        for char in decomposed.casefold() if not unicodedata.combining(char)
+    )
+
+
+def tokenize(text):
+    return normalize(text).split()
+
+
+def word_trigrams(word):
+    padded = f'  {word} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def text_trigrams(text):
+    trigrams = set()
+    for word in tokenize(text):
+        trigrams |= word_trigrams(word)
+    return trigrams
+
+
+class SearchQuery:
+    """Palabras de la búsqueda con sus trigramas"""
+    def __init__(self, text, options):
+        self.words = [(word, word_trigrams(word)) for word in dict.fromkeys(tokenize(text))]
+        self.trigrams = set().union(*(trigrams for _, trigrams in self.words))
+        self.threshold = options['THRESHOLD']
+        # Un candidato debe compartir al menos esta parte de los trigramas buscados
+        self.min_shared = max(1, math.floor(len(self.trigrams) * self.threshold))
+
+    def __bool__(self):
+        return bool(self.words)
+
+    def score(self, words):
+        """Puntuación (0-1) de un texto ya dividido en ``words``"""
+        total = 0.0
+        for word, trigrams in self.words:
+            best = 0.0
+            for candidate in words:
+                if candidate.startswith(word):
+                    best = 1.0
+                    break
+                other = word_trigrams(candidate)
+                best = max(best, len(trigrams & other) / len(trigrams | other))
+            total += best
+        return total / len(self.words)
+
+    def rank(self, candidates, limit):
+        """Ids de ``candidates`` (pares ``(id, palabras)``) que superan el umbral, de más a menos parecido"""
+        scored = [(self.score(words), pk) for pk, words in candidates]
+        scored = [(score, pk) for score, pk in scored if score >= self.threshold]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [pk for _, pk in scored[:limit]]
+
+
+# ===========================================
+# ÍNDICES
+# ===========================================
+
+class SearchIndex:
+    """Interfaz común de los índices: ``search()`` devuelve ids ordenados por relevancia"""
+    model = None
+    field = None
+
+    def search(self, text):
+        raise NotImplementedError('.search() must be overridden')
+
+    def filter(self, queryset, text, ranked=True):
+        """
+        ``queryset`` limitado a los resultados de ``text``; con ``ranked``,
+        ordenado por relevancia. Sin el índice activo se usa ``icontains``.
+        """
+        if not get_search_settings()['ENABLED']:
+            return queryset.filter(**{f'{self.field}__icontains': text})
+        ids = self.search(text)
+        if not ids:
+            return queryset.none()
+        queryset = queryset.filter(pk__in=ids)
+        if ranked:
+            queryset = queryset.order_by(
+                Case(*[When(pk=pk, then=position) for position, pk in enumerate(ids)], output_field=IntegerField())
+            )
+        return queryset
+
+
+class MenuSearchIndex(SearchIndex):
+    """Índice invertido de trigramas de ``Menu.Title`` en memoria del proceso"""
+    model = Menu
+    field = 'Title'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._postings = defaultdict(set)
+            self._words = {}
+            self._built_at = None
+
+    def ensure_built(self):
+        built_at = self._built_at
+        if built_at is None or time.monotonic() - built_at >= get_search_settings()['REFRESH_INTERVAL']:
+            self.rebuild()
+
+    def rebuild(self):
+        rows = list(Menu.objects.order_by().values_list('pk', 'Title'))
+        postings, words = defaultdict(set), {}
+        for pk, title in rows:
+            self._index(postings, words, pk, title)
+        with self._lock:
+            self._postings, self._words, self._built_at = postings, words, time.monotonic()
+
+    def _index(self, postings, words, pk, title):
+        words[pk] = tuple(tokenize(title))
+        for trigram in text_trigrams(title):
+            postings[trigram].add(pk)
+
+    def _unindex(self, pk):
+        for word in self._words.pop(pk, ()):
+            for trigram in word_trigrams(word):
+                posting = self._postings.get(trigram)
+                if posting is not None:
+                    posting.discard(pk)
+                    if not posting:
+                        del self._postings[trigram]
+
+    def update(self, pk, title):
+        self.update_many([(pk, title)])
+
+    def update_many(self, titles):
+        """Reindexa pares ``(id, título)``; sin índice construido no hace nada"""
+        with self._lock:
+            if self._built_at is None:
+                return
+            for pk, title in titles:
+                self._unindex(pk)
+                self._index(self._postings, self._words, pk, title)
+
+    def remove(self, pk):
+        with self._lock:
+            if self._built_at is not None:
+                self._unindex(pk)
+
+    def search(self, text):
+        options = get_search_settings()
+        query = SearchQuery(text, options)
+        if not query:
+            return []
+        self.ensure_built()
+        with self._lock:
+            shared = Counter()
+            for trigram in query.trigrams:
+                shared.update(self._postings.get(trigram, ()))
+            candidates = [
+                (pk, self._words[pk])
+                for pk, count in shared.most_common(options['MAX_CANDIDATES']) if count >= query.min_shared
+            ]
+        return query.rank(candidates, options['MAX_RESULTS'])
+
+
+class BookingSearchIndex(SearchIndex):
+    """Índice invertido de trigramas de ``Booking.Name`` en ``BookingSearchTrigram``"""
+    model = Booking
+    field = 'Name'
+
+    def index(self, bookings, replace=True, batch_size=1000):
+        """
+        Indexa ``bookings`` (instancias guardadas); con ``replace`` borra antes
+        sus trigramas anteriores. Debe llamarse dentro de su transacción.
+        """
+        bookings = [booking for booking in bookings if booking.pk is not None]
+        if not bookings:
+            return
+        with transaction.atomic():
+            if replace:
+                BookingSearchTrigram.objects.filter(Booking_id__in=[booking.pk for booking in bookings]).delete()
+            BookingSearchTrigram.objects.bulk_create(
+                [
+                    BookingSearchTrigram(Booking_id=booking.pk, Trigram=trigram)
+                    for booking in bookings for trigram in sorted(text_trigrams(booking.Name))
+                ],
+                batch_size=batch_size,
+            )
+
+    def rebuild(self, batch_size=1000):
+        """Reconstruye el índice completo. Devuelve el número de reservas indexadas."""
+        count = 0
+        rows = Booking.objects.order_by().values_list('pk', 'Name').iterator(chunk_size=batch_size)
+        with transaction.atomic():
+            BookingSearchTrigram.objects.all().delete()
+            batch = []
+            for pk, name in rows:
+                batch.extend(BookingSearchTrigram(Booking_id=pk, Trigram=trigram) for trigram in sorted(text_trigrams(name)))
+                count += 1
+                if len(batch) >= batch_size:
+                    BookingSearchTrigram.objects.bulk_create(batch)
+                    batch = []
+            BookingSearchTrigram.objects.bulk_create(batch)
+        return count
+
+    def search(self, text):
+        options = get_search_settings()
+        query = SearchQuery(text, options)
+        if not query:
+            return []
+        # GROUP BY solo sobre las filas de los trigramas buscados (índice booking_trigram_uniq)
+        ids = list(
+            BookingSearchTrigram.objects.filter(Trigram__in=query.trigrams)
+            .values('Booking_id').annotate(shared=Count('pk')).filter(shared__gte=query.min_shared)
+            .order_by('-shared', 'Booking_id').values_list('Booking_id', flat=True)[:options['MAX_CANDIDATES']]
+        )
+        if not ids:
+            return []
+        names = Booking.objects.filter(pk__in=ids).order_by().values_list('pk', 'Name')
+        return query.rank(((pk, tokenize(name)) for pk, name in names), options['MAX_RESULTS'])
+
+
+menu_search_index = MenuSearchIndex()
+booking_search_index = BookingSearchIndex()
+
+
+# ===========================================
+# API Y ADMIN
+# ===========================================
+
+class IndexedSearchFilter(BaseFilterBackend):
+    """
+    ``?search=texto`` con el índice de la vista (``search_index``); los
+    resultados se ordenan por relevancia
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        index = getattr(view, 'search_index', None)
+        if not text or index is None:
+            return queryset
+        return index.filter(queryset, text)
+
+
+class IndexedSearchAdminMixin:
+    """Buscador del admin con el índice ``search_index`` en lugar de ``icontains`` sobre ``search_fields``"""
+    search_index = None
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term or self.search_index is None:
+            return super().get_search_results(request, queryset, search_term)
+        # El orden lo sigue decidiendo el listado
+        return self.search_index.filter(queryset, search_term, ranked=False), False
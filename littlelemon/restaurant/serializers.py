@@ -1,18 +1,56 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
+from .capacity import CapacityExceeded
+from .metrics import timer
 from .models import Booking, Menu
+from .sparse import SparseFieldsSerializerMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class TimedSerializerMixin:
     """
-    Serializador para el modelo User de Django
+    Suma el tiempo de ``to_representation`` a la fase ``serialize`` de las
+    métricas de la petición. En los listados se mide cada objeto, de modo que
+    la lectura del queryset queda en el tiempo de base de datos.
     """
+    def to_representation(self, instance):
+        with timer('serialize'):
+            return super().to_representation(instance)
+
+
+class CachedHyperlinkedIdentityField(serializers.HyperlinkedIdentityField):
+    """
+    ``HyperlinkedIdentityField`` que resuelve la URL una sola vez por petición.
+    Se hace ``reverse`` con un identificador de relleno y en cada fila solo se
+    sustituye la clave, en lugar de recorrer el URLconf por cada objeto.
+    """
+    PLACEHOLDER = '987654321'
+
+    def get_url(self, obj, view_name, request, format):
+        if hasattr(obj, 'pk') and obj.pk in (None, ''):
+            return None
+        cached = getattr(self, '_url_template', None)
+        if cached is None or cached[:3] != (view_name, request, format):
+            template = self.reverse(
+                view_name, kwargs={self.lookup_url_kwarg: self.PLACEHOLDER},
+                request=request, format=format,
+            )
+            cached = self._url_template = (view_name, request, format, template)
+        return cached[3].replace(self.PLACEHOLDER, str(getattr(obj, self.lookup_field)), 1)
+
+
+class UserSerializer(SparseFieldsSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializador para el modelo User de Django.
+    Las vistas de listado deben usar ``prefetch_related('groups')``.
+    """
+    serializer_url_field = CachedHyperlinkedIdentityField
+
     class Meta:
         model = User
         fields = ['url', 'username', 'email', 'groups']
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Booking
     """
@@ -20,11 +58,40 @@ class BookingSerializer(serializers.ModelSerializer):
         model = Booking
         fields = ['id', 'Name', 'No_of_guests', 'BookingDate']
 
+    # La reserva y la ocupación de sus franjas se guardan en la misma
+    # transacción (Booking.save); sin plazas se responde 400
+
+    def create(self, validated_data):
+        try:
+            return super().create(validated_data)
+        except CapacityExceeded as exc:
+            raise serializers.ValidationError({'BookingDate': [str(exc)]})
 
-class MenuSerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        try:
+            return super().update(instance, validated_data)
+        except CapacityExceeded as exc:
+            raise serializers.ValidationError({'BookingDate': [str(exc)]})
+
+
+class MenuSerializer(SparseFieldsSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Menu
     """
     class Meta:
         model = Menu
         fields = ['id', 'Title', 'Price', 'Inventory']
+
+
+class StockReservationSerializer(serializers.Serializer):
+    """
+    Cantidad a descontar del inventario de un elemento del menú
+    """
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class StockReservationItemSerializer(StockReservationSerializer):
+    """
+    Elemento de un descuento de inventario de varios platos
+    """
+    id = serializers.IntegerField()
@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from . import capacity, rollups
+from .authentication import token_cache
+from .cache import menu_cache
+from .models import Booking, Menu
+from .search import booking_search_index, menu_search_index
+
+
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+def invalidate_menu_cache(sender, **kwargs):
+    """
+    Invalida la caché del menú cuando cambia un elemento.
+    Se invalida en el momento y de nuevo tras el commit, para que una lectura
+    concurrente que cachee datos previos al commit no sobreviva.
+    """
+    menu_cache.invalidate()
+    transaction.on_commit(menu_cache.invalidate)
+
+
+@receiver(post_save, sender=Menu)
+def index_menu_title(sender, instance, raw=False, **kwargs):
+    """Actualiza el índice de búsqueda del menú al confirmar el cambio"""
+    if raw:
+        return
+    pk, title = instance.pk, instance.Title
+    transaction.on_commit(lambda: menu_search_index.update(pk, title))
+
+
+@receiver(post_delete, sender=Menu)
+def unindex_menu_title(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: menu_search_index.remove(pk))
+
+
+@receiver(post_save, sender=Booking)
+def index_booking_name(sender, instance, created, raw=False, **kwargs):
+    """Indexa el nombre de las reservas nuevas o renombradas (sus trigramas se borran en cascada)"""
+    if raw:
+        return
+    if created or getattr(instance, '_loaded_name', None) != instance.Name:
+        booking_search_index.index([instance], replace=not created)
+        instance._loaded_name = instance.Name
+
+
+@receiver(post_delete, sender=Booking)
+def release_slot_occupancy(sender, instance, **kwargs):
+    """Libera las plazas de una reserva eliminada y la descuenta de los resúmenes"""
+    capacity.release(instance.BookingDate, instance.No_of_guests)
+    rollups.apply_changes(removed=[(instance.BookingDate, instance.No_of_guests)])
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    """El logout de djoser elimina el token: deja de aceptarse al instante"""
+    token_cache.evict(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def evict_saved_user_tokens(sender, instance, **kwargs):
+    """Un usuario modificado (p. ej. desactivado) vuelve a leerse de la base de datos"""
+    token_cache.evict_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def evict_logged_out_user_tokens(sender, user=None, **kwargs):
+    if user is not None:
+        token_cache.evict_user(user.pk)
@@ -0,0 +1,92 @@
+"""
+Campos dispersos: ``GET /api/menu/?fields=id,Title,Price``.
+
+``SparseFieldsMixin`` limita el serializador a los campos pedidos y la
+consulta SQL a las columnas que necesitan (``.only()``); si no se pide
+ningún campo muchos-a-muchos se omiten también sus ``prefetch_related``.
+Un campo desconocido devuelve ``400``. Solo se aplica a GET/HEAD: las
+escrituras siempre validan y devuelven el objeto completo.
+"""
+from django.db.models import ManyToManyField
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+from .pagination import get_ordering_fields
+
+
+FIELDS_PARAM = 'fields'
+
+_NOT_RESOLVED = object()
+
+
+def parse_fields(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Serializador que acepta ``fields=[...]`` para devolver solo esos campos
+    """
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """
+    ``?fields=`` para las vistas genéricas. ``sparse_extra_fields`` son
+    columnas que la vista necesita aunque no se serialicen; las columnas de
+    orden de la paginación por cursor se añaden siempre.
+    """
+    sparse_extra_fields = ()
+
+    def get_sparse_fields(self):
+        """Campos pedidos en el orden del serializador, o ``None`` si son todos"""
+        cached = getattr(self, '_sparse_fields', _NOT_RESOLVED)
+        if cached is not _NOT_RESOLVED:
+            return cached
+        fields = None
+        value = self.request.query_params.get(FIELDS_PARAM) if self.request.method in SAFE_METHODS else None
+        if value:
+            requested = parse_fields(value)
+            available = self.get_serializer_class()().fields
+            unknown = [name for name in requested if name not in available]
+            if unknown:
+                raise ValidationError({FIELDS_PARAM: [f"Campos desconocidos: {', '.join(unknown)}."]})
+            fields = [name for name in available if name in requested]
+            self._serializer_fields = available
+        self._sparse_fields = fields
+        return fields
+
+    def get_list_fields(self):
+        return self.get_sparse_fields()
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+
+        serializer_fields = self._serializer_fields
+        model_fields = {field.name: field for field in queryset.model._meta.get_fields()}
+        columns, many_to_many = {*self.sparse_extra_fields, *get_ordering_fields(self)}, False
+        for name in fields:
+            source = serializer_fields[name].source
+            field = model_fields.get(source)
+            if isinstance(field, ManyToManyField):
+                many_to_many = True
+            elif field is not None and field.concrete:
+                columns.add(source)
+        if not many_to_many:
+            queryset = queryset.prefetch_related(None)
+        # La clave primaria siempre se carga (también para el campo ``url``)
+        return queryset.only(*columns) if columns else queryset.only('pk')
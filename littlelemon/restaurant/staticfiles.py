@@ -0,0 +1,198 @@
+"""
+Archivos estáticos en producción (``STATIC_PIPELINE``).
+
+- ``CompressedManifestStaticFilesStorage``: ``collectstatic`` copia cada
+  archivo con el hash de su contenido en el nombre (``logo.3f2a1b9c0d4e.png``)
+  y, para los de texto (CSS, JS, SVG...), guarda al lado las versiones
+  ``.gz`` y ``.br`` (con ``brotli`` instalado) con la máxima compresión.
+- ``StaticFilesMiddleware``: sirve ``STATIC_ROOT`` desde el propio proceso.
+  Recorre el directorio una sola vez al arrancar y guarda en memoria las
+  cabeceras de cada archivo, así cada petición es una búsqueda en un
+  diccionario y un ``open()``, sin ``stat()``. Los archivos con hash se
+  sirven con ``Cache-Control: max-age`` de un año e ``immutable``; el resto
+  con ``MAX_AGE``. La versión comprimida se elige según ``Accept-Encoding``.
+
+Con ``whitenoise`` instalado, ``settings.py`` usa su middleware en lugar de
+``StaticFilesMiddleware``; sirve igualmente los ``.gz``/``.br`` generados.
+Los archivos añadidos tras arrancar no se sirven hasta reiniciar el proceso.
+"""
+import mimetypes
+import os
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags
+
+from .compression import choose_encoding, compress, get_available_encodings
+
+
+DEFAULT_SETTINGS = {
+    'ENABLED': False,
+    'MAX_AGE': 60,
+    'IMMUTABLE_MAX_AGE': 365 * 24 * 60 * 60,
+    'COMPRESS_MIN_SIZE': 256,
+}
+
+COMPRESSION_LEVELS = {'GZIP_LEVEL': 9, 'BROTLI_QUALITY': 11}
+
+ENCODING_EXTENSIONS = {'br': '.br', 'gzip': '.gz'}
+
+TEXT_TYPES = ('application/javascript', 'application/json', 'application/xml', 'image/svg+xml', 'text/javascript')
+
+
+def get_static_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'STATIC_PIPELINE', {})}
+
+
+def is_compressible(name):
+    content_type, encoding = mimetypes.guess_type(name)
+    return encoding is None and content_type is not None and (
+        content_type.startswith('text/') or content_type in TEXT_TYPES
+    )
+
+
+# ===========================================
+# COLLECTSTATIC
+# ===========================================
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """``ManifestStaticFilesStorage`` que además precomprime los archivos de texto"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(paths) | set(self.hashed_files.values())):
+            if is_compressible(name):
+                self.compress_file(name)
+
+    def compress_file(self, name):
+        with self.open(name) as source:
+            content = source.read()
+        if len(content) < get_static_settings()['COMPRESS_MIN_SIZE']:
+            return
+        for encoding in get_available_encodings():
+            compressed = compress(encoding, content, COMPRESSION_LEVELS)
+            # Solo si compensa: el cliente descomprime cada vez
+            if len(compressed) < len(content) * 0.95:
+                with open(self.path(name + ENCODING_EXTENSIONS[encoding]), 'wb') as target:
+                    target.write(compressed)
+
+
+# ===========================================
+# SERVIDOR
+# ===========================================
+
+class StaticFile:
+    """Cabeceras de un archivo de ``STATIC_ROOT`` y rutas de sus versiones comprimidas"""
+    __slots__ = ('headers', 'variants')
+
+    def __init__(self, headers, variants):
+        self.headers = headers
+        # {codificación o None: (ruta, tamaño, etag)}
+        self.variants = variants
+
+
+def scan_static_root(root, immutable, options):
+    """Indexa los archivos de ``root`` por su ruta relativa (con ``/``)"""
+    files = {}
+    for directory, _, filenames in os.walk(root):
+        present = set(filenames)
+        for filename in filenames:
+            if filename.endswith(('.gz', '.br')) and filename[:-3] in present:
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            stat = os.stat(path)
+            etag = f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+            content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            if content_type.startswith('text/') or content_type == 'application/javascript':
+                content_type += '; charset=utf-8'
+            max_age = options['IMMUTABLE_MAX_AGE'] if name in immutable else options['MAX_AGE']
+            headers = {
+                'Content-Type': content_type,
+                'Last-Modified': http_date(stat.st_mtime),
+                'Cache-Control': f'public, max-age={max_age}' + (', immutable' if name in immutable else ''),
+            }
+            variants = {None: (path, stat.st_size, etag)}
+            for encoding, extension in ENCODING_EXTENSIONS.items():
+                if filename + extension in present:
+                    variant = path + extension
+                    variants[encoding] = (variant, os.path.getsize(variant), f'{etag[:-1]}-{encoding}"')
+            if len(variants) > 1:
+                headers['Vary'] = 'Accept-Encoding'
+            files[name] = StaticFile(headers, variants)
+    return files
+
+
+class StaticFilesMiddleware:
+    """
+    Sirve los archivos de ``STATIC_ROOT`` con cabeceras de caché y versiones
+    precomprimidas (ver el docstring del módulo). Admite ASGI sin pasar a
+    código síncrono en cada petición (``__acall__``).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        options = get_static_settings()
+        if not options['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        self.prefix = urlsplit(settings.STATIC_URL).path
+        # Nombres con hash del manifiesto de collectstatic
+        immutable = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        root = settings.STATIC_ROOT
+        self.files = scan_static_root(root, immutable, options) if root and os.path.isdir(root) else {}
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        static_file = self.get_static_file(request)
+        if static_file is not None:
+            return self.serve(request, static_file)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        static_file = self.get_static_file(request)
+        if static_file is not None:
+            return self.serve(request, static_file)
+        return await self.get_response(request)
+
+    def get_static_file(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            return self.files.get(request.path_info[len(self.prefix):])
+        return None
+
+    def serve(self, request, static_file):
+        encoding = None
+        if len(static_file.variants) > 1:
+            # Servir un .br no requiere el paquete brotli
+            encodings = [coding for coding in ENCODING_EXTENSIONS if coding in static_file.variants]
+            encoding = choose_encoding(request.headers.get('Accept-Encoding', ''), encodings)
+        path, size, etag = static_file.variants[encoding]
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            if request.method == 'HEAD':
+                response = HttpResponse()
+            else:
+                response = FileResponse(open(path, 'rb'))
+                del response['Content-Disposition']
+            response['Content-Type'] = static_file.headers['Content-Type']
+            response['Content-Length'] = str(size)
+            if encoding:
+                response['Content-Encoding'] = encoding
+        for header in ('Last-Modified', 'Cache-Control', 'Vary'):
+            if header in static_file.headers:
+                response[header] = static_file.headers[header]
+        response['ETag'] = etag
+        return response
@@ -0,0 +1,244 @@
+"""
+Cola de tareas en segundo plano para los efectos secundarios de las reservas.
+
+Patrón outbox: la vista escribe las tareas (``OutboxTask``) en la misma
+transacción que la reserva, así o se guardan ambas o ninguna, y la petición
+solo paga un ``INSERT``. ``python manage.py run_tasks`` las reclama por
+lotes y las ejecuta en un pool de hilos; se pueden lanzar varios workers a
+la vez (en una o varias máquinas).
+
+Reclamar un lote es un ``UPDATE`` condicional con un identificador de lote
+(``LockedBy``), portable a cualquier base de datos: si dos workers eligen la
+misma tarea solo uno la actualiza. Una tarea cuyo worker muere vuelve a
+estar disponible al vencer ``LOCK_TIMEOUT``. Los fallos se reintentan con
+espera exponencial (``RETRY_DELAY``, ``2 * RETRY_DELAY``...) hasta
+``MAX_ATTEMPTS``; después la tarea queda ``failed`` con el último error.
+
+Las tareas pueden ejecutarse más de una vez (un worker que muere tras
+ejecutarla pero antes de marcarla), así que deben ser idempotentes o
+tolerar duplicados.
+"""
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import capacity
+from .models import Booking, OutboxTask
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'BATCH_SIZE': 100,
+    'WORKERS': 4,
+    'POLL_INTERVAL': 1.0,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 30,
+    'LOCK_TIMEOUT': 300,
+    'KEEP_DONE_DAYS': 7,
+    'KITCHEN_EMAILS': [],
+}
+
+
+def get_task_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'TASK_QUEUE', {})}
+
+
+# ===========================================
+# REGISTRO
+# ===========================================
+
+_handlers = {}
+
+
+def task(topic):
+    """Registra la función como manejador de las tareas ``topic``"""
+    def decorator(func):
+        _handlers[topic] = func
+        return func
+    return decorator
+
+
+def get_handler(topic):
+    return _handlers.get(topic)
+
+
+# ===========================================
+# ENCOLADO
+# ===========================================
+
+def enqueue(*items, delay=0):
+    """
+    Encola pares ``(topic, payload)`` con un único ``INSERT``. Debe llamarse
+    dentro de la transacción del cambio que origina las tareas.
+    """
+    if not items or not get_task_settings()['ENABLED']:
+        return []
+    available_at = timezone.now() + timedelta(seconds=delay)
+    return OutboxTask.objects.bulk_create([
+        OutboxTask(Topic=topic, Payload=payload, AvailableAt=available_at) for topic, payload in items
+    ])
+
+
+# ===========================================
+# EJECUCIÓN
+# ===========================================
+
+def ready_filter(now):
+    return Q(Status=OutboxTask.PENDING, AvailableAt__lte=now) | Q(Status=OutboxTask.RUNNING, LockedUntil__lt=now)
+
+
+def claim(batch_size=None):
+    """Reclama hasta ``batch_size`` tareas listas y las devuelve"""
+    options = get_task_settings()
+    batch_size = batch_size or options['BATCH_SIZE']
+    now = timezone.now()
+    ids = list(
+        OutboxTask.objects.filter(ready_filter(now)).order_by('AvailableAt', 'pk')
+        .values_list('pk', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+    token = uuid.uuid4().hex
+    OutboxTask.objects.filter(ready_filter(now), pk__in=ids).update(
+        Status=OutboxTask.RUNNING,
+        LockedBy=token,
+        LockedUntil=now + timedelta(seconds=options['LOCK_TIMEOUT']),
+        Attempts=F('Attempts') + 1,
+    )
+    return list(OutboxTask.objects.filter(pk__in=ids, LockedBy=token, Status=OutboxTask.RUNNING))
+
+
+def run(outbox_task):
+    """Ejecuta una tarea reclamada y guarda el resultado. Devuelve ``True`` si terminó bien."""
+    options = get_task_settings()
+    owned = OutboxTask.objects.filter(pk=outbox_task.pk, LockedBy=outbox_task.LockedBy)
+    handler = get_handler(outbox_task.Topic)
+    try:
+        if handler is None:
+            raise LookupError(f'No hay ninguna tarea registrada como {outbox_task.Topic!r}.')
+        with transaction.atomic():
+            handler(**outbox_task.Payload)
+    except Exception:
+        error = traceback.format_exc()
+        if outbox_task.Attempts >= options['MAX_ATTEMPTS']:
+            logger.error('Tarea %s fallida definitivamente:\n%s', outbox_task, error)
+            owned.update(Status=OutboxTask.FAILED, LockedBy='', LockedUntil=None, LastError=error,
+                         ProcessedAt=timezone.now())
+        else:
+            delay = options['RETRY_DELAY'] * 2 ** (outbox_task.Attempts - 1)
+            logger.warning('Tarea %s fallida, se reintenta en %ss:\n%s', outbox_task, delay, error)
+            owned.update(Status=OutboxTask.PENDING, LockedBy='', LockedUntil=None, LastError=error,
+                         AvailableAt=timezone.now() + timedelta(seconds=delay))
+        return False
+    owned.update(Status=OutboxTask.DONE, LockedBy='', LockedUntil=None, LastError='', ProcessedAt=timezone.now())
+    return True
+
+
+def run_in_worker(outbox_task):
+    # Cada hilo del pool usa su propia conexión: se revisa al terminar, como tras una petición
+    try:
+        return run(outbox_task)
+    finally:
+        close_old_connections()
+
+
+def drain(batch_size=None, executor=None):
+    """
+    Reclama y ejecuta un lote (en los hilos de ``executor`` si se indica).
+    Devuelve ``(ejecutadas, fallidas)``.
+    """
+    claimed = claim(batch_size)
+    results = list(executor.map(run_in_worker, claimed) if executor is not None else map(run, claimed))
+    return len(results), results.count(False)
+
+
+def purge_done(days=None):
+    """Elimina las tareas completadas hace más de ``days`` días"""
+    days = get_task_settings()['KEEP_DONE_DAYS'] if days is None else days
+    deleted, _ = OutboxTask.objects.filter(
+        Status=OutboxTask.DONE, ProcessedAt__lt=timezone.now() - timedelta(days=days),
+    ).delete()
+    return deleted
+
+
+# ===========================================
+# TAREAS DE RESERVAS
+# ===========================================
+
+EVENT_LABELS = {'created': 'nueva', 'updated': 'modificada', 'deleted': 'cancelada'}
+
+
+def booking_snapshot(booking):
+    return {'id': booking.pk, 'Name': booking.Name, 'No_of_guests': booking.No_of_guests,
+            'BookingDate': booking.BookingDate}
+
+
+def enqueue_booking_tasks(event, bookings, email='', previous=()):
+    """
+    Encola los efectos secundarios de crear (``created``), modificar
+    (``updated``) o eliminar (``deleted``) ``bookings``. ``previous`` son las
+    fechas anteriores de las reservas modificadas, cuyas franjas también se
+    revisan.
+    """
+    items, slots = [], set()
+    for booking in bookings:
+        snapshot = booking_snapshot(booking)
+        if event == 'created' and email:
+            items.append(('booking.confirmation', {'booking_id': booking.pk, 'email': email}))
+        items.append(('booking.kitchen', {'event': event, 'booking': snapshot}))
+        slots.update(capacity.booking_slots(booking.BookingDate))
+    for booking_date in previous:
+        slots.update(capacity.booking_slots(booking_date))
+    if slots:
+        items.append(('capacity.reconcile', {'slots': sorted(slots)}))
+    return enqueue(*items)
+
+
+@task('booking.confirmation')
+def send_booking_confirmation(booking_id, email):
+    """Confirmación de la reserva al usuario que la creó"""
+    booking = Booking.objects.filter(pk=booking_id).first()
+    if booking is None:
+        # Eliminada antes de enviar la confirmación
+        return
+    send_mail(
+        'Confirmación de reserva - Little Lemon',
+        f"Hola {booking.Name}, tu reserva para {booking.No_of_guests} personas el "
+        f"{timezone.localtime(booking.BookingDate).strftime('%d/%m/%Y a las %H:%M')} está confirmada.",
+        None,
+        [email],
+    )
+
+
+@task('booking.kitchen')
+def notify_kitchen(event, booking):
+    """Aviso a cocina de cada alta, cambio o cancelación"""
+    booking_date = timezone.localtime(parse_datetime(booking['BookingDate']))
+    message = (
+        f"Reserva {EVENT_LABELS[event]}: {booking['Name']}, {booking['No_of_guests']} personas, "
+        f"{booking_date.strftime('%d/%m/%Y %H:%M')} (#{booking['id']})"
+    )
+    recipients = get_task_settings()['KITCHEN_EMAILS']
+    if recipients:
+        send_mail(f"Cocina - reserva {EVENT_LABELS[event]}", message, None, recipients)
+    else:
+        logger.info(message)
+
+
+@task('capacity.reconcile')
+def reconcile_capacity(slots):
+    """Corrige la ocupación de las franjas afectadas si se ha desviado de las reservas"""
+    fixed = capacity.reconcile_slots([parse_datetime(slot) for slot in slots])
+    if fixed:
+        logger.warning('Ocupación corregida en %s franjas', fixed)
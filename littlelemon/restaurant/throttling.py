@@ -0,0 +1,231 @@
+"""
+Limitación de peticiones con cubetas de tokens (token bucket).
+
+Cada cliente (IP o usuario, según el ámbito) tiene una cubeta de ``burst``
+tokens que se rellena a ``N`` tokens por periodo (``RATES``: ``'120/min'``).
+Cada petición consume un token; sin tokens se responde ``429`` con
+``Retry-After`` igual al tiempo que falta para el siguiente token.
+
+Las cubetas viven en memoria del proceso (``BucketStore``): decidir cuesta
+un acceso a un diccionario, sin base de datos ni caché. Con varios workers
+cada uno aplica el límite por separado; con ``SYNC_CACHE_ALIAS`` los
+procesos publican cada ``SYNC_INTERVAL`` segundos lo que han consumido en un
+contador compartido (Redis/Memcached vía ``CACHES``) y descuentan de su
+cubeta lo consumido por los demás, así el límite global se respeta de forma
+aproximada con una operación de caché por cliente e intervalo.
+
+Ámbitos:
+
+- ``menu_anon``: lecturas anónimas del menú (también las asíncronas), por IP.
+- ``booking_write``: escrituras de reservas de usuarios autenticados, por usuario.
+- ``login``: obtención de tokens, por IP.
+
+La IP es ``REMOTE_ADDR``. ``X-Forwarded-For`` solo se tiene en cuenta con
+``REST_FRAMEWORK['NUM_PROXIES']`` (número de proxies de confianza delante de
+la aplicación); si no, cualquier cliente podría inventarse una IP por
+petición y esquivar los límites.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'RATES': {
+        'menu_anon': '120/min',
+        'booking_write': '30/min',
+        'login': '10/min',
+    },
+    # Tokens máximos por cubeta (ráfaga); por defecto, el número de peticiones del periodo
+    'BURST': {},
+    'MAX_KEYS': 100000,
+    'SYNC_CACHE_ALIAS': None,
+    'SYNC_INTERVAL': 1.0,
+}
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def get_throttle_settings():
+    """Combina la configuración del proyecto con los valores por defecto"""
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'THROTTLING', {})}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """``'120/min'`` -> ``(120, 60)``"""
+    try:
+        count, period = rate.split('/')
+        return int(count), PERIODS[period]
+    except (AttributeError, ValueError, KeyError):
+        raise ImproperlyConfigured(f'Tasa de THROTTLING no válida: {rate!r}')
+
+
+class Bucket:
+    __slots__ = ('tokens', 'updated', 'pending', 'seen', 'synced')
+
+    def __init__(self, tokens, now):
+        self.tokens = tokens
+        self.updated = now
+        # Consumo local aún no publicado y último total compartido visto
+        self.pending = 0
+        self.seen = 0
+        self.synced = now
+
+
+class BucketStore:
+    """
+    Cubetas en memoria del proceso, con como mucho ``MAX_KEYS`` clientes (LRU)
+    """
+    timer = time.monotonic
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, rate, burst, options):
+        """
+        Consume un token de la cubeta ``key``. Devuelve ``0`` si se permite la
+        petición o los segundos que faltan para el siguiente token.
+        """
+        count, period = rate
+        refill = count / period
+        now = self.timer()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = Bucket(burst, now)
+                if len(self._buckets) > options['MAX_KEYS']:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * refill)
+                bucket.updated = now
+
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                bucket.pending += 1
+                wait = 0
+            else:
+                wait = (1 - bucket.tokens) / refill
+            needs_sync = options['SYNC_CACHE_ALIAS'] and now - bucket.synced >= options['SYNC_INTERVAL']
+            if needs_sync:
+                bucket.synced = now
+                pending, bucket.pending = bucket.pending, 0
+
+        if needs_sync:
+            self.sync(key, bucket, pending, burst, period, options)
+        return wait
+
+    def sync(self, key, bucket, pending, burst, period, options):
+        """Publica el consumo local y descuenta el de los demás procesos"""
+        cache = caches[options['SYNC_CACHE_ALIAS']]
+        shared_key = f'throttle:{key}'
+        cache.add(shared_key, 0, timeout=period * 2)
+        try:
+            total = cache.incr(shared_key, pending) if pending else cache.get(shared_key, 0)
+        except ValueError:
+            # El contador ha caducado entre add() e incr()
+            cache.set(shared_key, pending, timeout=period * 2)
+            total = pending
+        with self._lock:
+            others = total - bucket.seen - pending
+            bucket.seen = total
+            if others > 0:
+                bucket.tokens = max(-burst, bucket.tokens - others)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+bucket_store = BucketStore()
+
+
+# ===========================================
+# CLASES DE DRF
+# ===========================================
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle de DRF sobre ``bucket_store``. Las subclases definen ``scope`` y
+    ``get_ident_key`` (``None`` para no limitar la petición).
+    """
+    scope = None
+    store = bucket_store
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError('.get_ident_key() must be overridden')
+
+    def get_ident(self, request):
+        # Sin NUM_PROXIES, DRF usaría X-Forwarded-For tal cual llega del cliente
+        if api_settings.NUM_PROXIES is None:
+            return request.META.get('REMOTE_ADDR')
+        return super().get_ident(request)
+
+    def is_active(self, options):
+        return options['ENABLED'] and self.scope in options['RATES']
+
+    def consume(self, ident, options):
+        """
+        Consume un token de la cubeta de ``ident`` en este ámbito. Devuelve
+        ``0`` si se permite la petición o los segundos que faltan. Las vistas
+        que no son de DRF (async_views.py) lo llaman directamente.
+        """
+        rate = parse_rate(options['RATES'][self.scope])
+        burst = options['BURST'].get(self.scope, rate[0])
+        return self.store.consume(f'{self.scope}:{ident}', rate, burst, options)
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        options = get_throttle_settings()
+        if not self.is_active(options):
+            return True
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+        wait = self.consume(ident, options)
+        if wait:
+            self.retry_after = wait
+            return False
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class MenuAnonThrottle(TokenBucketThrottle):
+    """Lecturas anónimas del menú, por IP"""
+    scope = 'menu_anon'
+
+    def get_ident_key(self, request, view):
+        if request.method not in SAFE_METHODS or request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class BookingWriteThrottle(TokenBucketThrottle):
+    """Creación, modificación y borrado de reservas, por usuario"""
+    scope = 'booking_write'
+
+    def get_ident_key(self, request, view):
+        if request.method in SAFE_METHODS or not request.user.is_authenticated:
+            return None
+        return request.user.pk
+
+
+class LoginThrottle(TokenBucketThrottle):
+    """Obtención de tokens (login), por IP"""
+    scope = 'login'
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
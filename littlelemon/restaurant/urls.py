@@ -1,8 +1,9 @@
 from django.contrib import admin 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework.authtoken.views import obtain_auth_token
-from . import views
+from rest_framework.authtoken.views import ObtainAuthToken
+from . import async_views, views
+from .throttling import LoginThrottle
 
 # ===========================================
 # ROUTER PARA VIEWSETS
@@ -21,7 +22,7 @@ urlpatterns = [
     # VIEWSETS (Recomendado - Automático)
     # ===========================================
     path('api/', include(router.urls)),
-    path('api-token-auth/', obtain_auth_token),
+    path('api-token-auth/', ObtainAuthToken.as_view(throttle_classes=[LoginThrottle])),
     # ===========================================
     # FUNCTION-BASED VIEWS
     # ===========================================
@@ -33,6 +34,7 @@ urlpatterns = [
     # ===========================================
     path('api/class/bookings/', views.BookingListAPIView.as_view(), name='booking-list-class'),
     path('api/class/bookings/<int:pk>/', views.BookingDetailAPIView.as_view(), name='booking-detail-class'),
+    path('api/availability/', views.AvailabilityAPIView.as_view(), name='availability'),
     
     # ===========================================
     # MIXINS
@@ -47,4 +49,12 @@ urlpatterns = [
     path('api/generic/users/<int:pk>/', views.UserDetailGeneric.as_view(), name='user-detail-generic'),
     path('api/generic/bookings/', views.BookingListGeneric.as_view(), name='booking-list-generic'),
     path('api/generic/bookings/<int:pk>/', views.BookingDetailGeneric.as_view(), name='booking-detail-generic'),
+
+    # ===========================================
+    # ASYNC VIEWS (ASGI, solo lectura)
+    # ===========================================
+    path('api/async/menu/', async_views.menu_list_async, name='menu-list-async'),
+    path('api/async/menu/<int:pk>/', async_views.menu_detail_async, name='menu-detail-async'),
+    path('api/async/bookings/', async_views.booking_list_async, name='booking-list-async'),
+    path('api/async/bookings/<int:pk>/', async_views.booking_detail_async, name='booking-detail-async'),
 ]
\ No newline at end of file
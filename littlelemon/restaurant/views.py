@@ -1,13 +1,35 @@
+from functools import partial
+
 from django.shortcuts import render
 from django.contrib.auth.models import User
-from rest_framework import status, viewsets, mixins, generics
-from rest_framework.decorators import api_view
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from .authentication import get_hot_authentication_classes
+from .bulk import BulkModelMixin
+from .cache import MenuCacheMixin, menu_cache
+from .capacity import CapacityExceeded, apply_changes, get_availability, get_capacity_settings
+from .conditional import ConditionalDetailMixin
+from .export import CONTENT_TYPES, streaming_export_response
+from .fastpath import FastListMixin
+from .filters import BookingFilterBackend, parse_booking_date, parse_day
+from .inventory import InsufficientStock, reserve_stock
 from .models import Booking, Menu
-from .serializers import UserSerializer, BookingSerializer, MenuSerializer
+from .pagination import BookingPagination, UserPagination
+from . import rollups
+from .search import IndexedSearchFilter, booking_search_index, menu_search_index
+from .sparse import SparseFieldsMixin
+from .tasks import enqueue_booking_tasks
+from .throttling import BookingWriteThrottle, MenuAnonThrottle
+from .serializers import (
+    UserSerializer, BookingSerializer, MenuSerializer,
+    StockReservationSerializer, StockReservationItemSerializer,
+)
 
 # Create your views here.
 def index(request):
@@ -15,256 +37,385 @@ def index(request):
 
 
 # ===========================================
-# 1. FUNCTION-BASED VIEWS
+# VIEWSETS (implementación principal de cada recurso)
 # ===========================================
 
-@api_view(['GET', 'POST'])
-def user_list_function(request):
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
-    Function-based view para listar usuarios o crear uno nuevo
+    ViewSet para gestión de usuarios
+    - Solo ADMINISTRADORES pueden crear/editar/eliminar usuarios
+    - Usuarios autenticados pueden VER la lista de usuarios
+    - Usuarios no autenticados NO pueden hacer nada
     """
-    if request.method == 'GET':
-        users = User.objects.all()
-        serializer = UserSerializer(users, many=True, context={'request': request})
-        return Response(serializer.data)
+    queryset = User.objects.prefetch_related('groups').order_by('id')
+    serializer_class = UserSerializer
+    pagination_class = UserPagination
+    authentication_classes = get_hot_authentication_classes()
     
-    elif request.method == 'POST':
-        serializer = UserSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    def get_permissions(self):
+        """
+        Permisos específicos por acción
+        """
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            # Solo administradores pueden crear/editar/eliminar usuarios
+            permission_classes = [IsAdminUser]
+        elif self.action in ['list', 'retrieve']:
+            # Usuarios autenticados pueden ver usuarios
+            permission_classes = [IsAuthenticated]
+        else:
+            # Por defecto, requiere autenticación
+            permission_classes = [IsAuthenticated]
+        
+        return [permission() for permission in permission_classes]
 
 
-@api_view(['GET', 'PUT', 'DELETE'])
-def user_detail_function(request, pk):
+class BookingViewSet(ConditionalDetailMixin, SparseFieldsMixin, FastListMixin, BulkModelMixin,
+                     viewsets.ModelViewSet):
     """
-    Function-based view para obtener, actualizar o eliminar un usuario específico
+    ViewSet para reservas
+    - Solo usuarios autenticados pueden acceder a las reservas
+    - Filtros: date_from, date_to, min_guests, name (ver BookingFilterBackend)
+    - Operaciones masivas en /api/bookings/bulk/
+    - Exportación completa en streaming en /api/bookings/export/
+    - Confirmación, aviso a cocina y revisión de ocupación en la cola de tareas (tasks.py)
+    - Detalle condicional: ETag/Last-Modified, 304 e If-Match (ver conditional.py)
+    - Escrituras limitadas por usuario (ver throttling.py)
+    - Búsqueda aproximada por nombre con ?search= (ver search.py)
+    - Estadísticas por día, hora y día de la semana en /api/bookings/stats/ (ver rollups.py)
     """
-    try:
-        user = User.objects.get(pk=pk)
-    except User.DoesNotExist:
-        return Response(status=status.HTTP_404_NOT_FOUND)
-    
-    if request.method == 'GET':
-        serializer = UserSerializer(user, context={'request': request})
-        return Response(serializer.data)
-    
-    elif request.method == 'PUT':
-        serializer = UserSerializer(user, data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    elif request.method == 'DELETE':
-        user.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
-
-
-# ===========================================
-# 2. CLASS-BASED VIEWS (APIView)
-# ===========================================
-
-class BookingListAPIView(APIView):
+    queryset = Booking.objects.all()
+    serializer_class = BookingSerializer
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [BookingWriteThrottle]
+    pagination_class = BookingPagination
+    filter_backends = [BookingFilterBackend, IndexedSearchFilter]
+    search_index = booking_search_index
+    authentication_classes = get_hot_authentication_classes()
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Exporta todas las reservas (con los mismos filtros que la lista) sin paginar.
+        ?output=ndjson (por defecto) o ?output=json para un array JSON.
+        """
+        output = request.query_params.get('output', 'ndjson')
+        if output not in CONTENT_TYPES:
+            return Response(
+                {'output': [f"Formato no soportado. Usa: {', '.join(CONTENT_TYPES)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return streaming_export_response(self.filter_queryset(self.get_queryset()), output)
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Reservas, invitados y tamaño medio de grupo por día, hora y día de la
+        semana, leídos de los resúmenes (sin agrupar la tabla de reservas).
+        ?date_from=YYYY-MM-DD y ?date_to=YYYY-MM-DD (incluidos) limitan el periodo.
+        """
+        params = request.query_params
+        date_from = parse_day(params['date_from'], 'date_from') if params.get('date_from') else None
+        date_to = parse_day(params['date_to'], 'date_to') if params.get('date_to') else None
+        return Response(rollups.get_stats(date_from, date_to))
+
+    # La reserva y sus tareas (confirmación, cocina, ocupación) se guardan en
+    # la misma transacción; las ejecuta el worker (run_tasks), no la petición
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+            enqueue_booking_tasks('created', [serializer.instance], email=self.request.user.email)
+
+    def perform_update(self, serializer):
+        previous = serializer.instance.BookingDate
+        with transaction.atomic():
+            super().perform_update(serializer)
+            enqueue_booking_tasks('updated', [serializer.instance], previous=[previous])
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            enqueue_booking_tasks('deleted', [instance])
+            super().perform_destroy(instance)
+
+    def apply_capacity(self, released=(), reserved=()):
+        # bulk_create/bulk_update no envían señales: la ocupación se actualiza aquí
+        try:
+            apply_changes(released=released, reserved=reserved)
+        except CapacityExceeded as exc:
+            raise serializers.ValidationError({'detail': str(exc)})
+
+    def perform_bulk_create(self, objs):
+        objs = super().perform_bulk_create(objs)
+        self.apply_capacity(reserved=[(obj.BookingDate, obj.No_of_guests) for obj in objs])
+        rollups.apply_changes(added=[(obj.BookingDate, obj.No_of_guests) for obj in objs])
+        booking_search_index.index(objs, replace=False)
+        enqueue_booking_tasks('created', objs, email=self.request.user.email)
+        return objs
+
+    def perform_bulk_update(self, changes):
+        released = [(instance.BookingDate, instance.No_of_guests) for instance, _ in changes]
+        super().perform_bulk_update(changes)
+        reserved = [(instance.BookingDate, instance.No_of_guests) for instance, _ in changes]
+        self.apply_capacity(released=released, reserved=reserved)
+        rollups.apply_changes(removed=released, added=reserved)
+        booking_search_index.index([instance for instance, validated_data in changes if 'Name' in validated_data])
+        enqueue_booking_tasks(
+            'updated', [instance for instance, _ in changes], previous=[booking_date for booking_date, _ in released],
+        )
+
+    def perform_bulk_destroy(self, queryset):
+        enqueue_booking_tasks('deleted', list(queryset))
+        return super().perform_bulk_destroy(queryset)
+
+
+class MenuViewSet(MenuCacheMixin, ConditionalDetailMixin, SparseFieldsMixin, FastListMixin, BulkModelMixin,
+                  viewsets.ModelViewSet):
     """
-    Class-based view para listar reservas o crear una nueva
+    ViewSet para menú
+    - Solo ADMINISTRADORES pueden modificar el menú
+    - Todos pueden VER el menú (para elegir platos)
+    - Las lecturas se sirven desde la caché del menú
+    - Operaciones masivas en /api/menu/bulk/ (solo administradores)
+    - Usuarios autenticados pueden descontar inventario (reserve)
+    - Detalle condicional: ETag/Last-Modified, 304 e If-Match (ver conditional.py)
+    - Lecturas anónimas limitadas por IP (ver throttling.py)
+    - Búsqueda aproximada por título con ?search= (ver search.py)
     """
-    def get(self, request):
-        bookings = Booking.objects.all()
-        serializer = BookingSerializer(bookings, many=True)
-        return Response(serializer.data)
+    queryset = Menu.objects.all()
+    serializer_class = MenuSerializer
+    authentication_classes = get_hot_authentication_classes()
+    throttle_classes = [MenuAnonThrottle]
+    filter_backends = [IndexedSearchFilter]
+    search_index = menu_search_index
     
-    def post(self, request):
-        serializer = BookingSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    def get_permissions(self):
+        """
+        Permisos específicos por acción
+        """
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'cache_stats',
+                           'bulk', 'bulk_update', 'bulk_partial_update', 'bulk_destroy']:
+            # Solo administradores pueden modificar el menú
+            permission_classes = [IsAdminUser]
+        elif self.action in ['reserve', 'reserve_many']:
+            # Las cajas descuentan inventario con su usuario
+            permission_classes = [IsAuthenticated]
+        else:
+            # Todos pueden ver el menú
+            permission_classes = [AllowAny]
+        
+        return [permission() for permission in permission_classes]
 
+    @action(detail=False, methods=['get'], url_path='cache-stats')
+    def cache_stats(self, request):
+        """
+        Contadores de la caché del menú (solo administradores)
+        """
+        version, _ = menu_cache.get_version()
+        return Response({**menu_cache.stats.as_dict(), 'version': version})
 
-class BookingDetailAPIView(APIView):
-    """
-    Class-based view para obtener, actualizar o eliminar una reserva específica
-    """
-    def get_object(self, pk):
+    @action(detail=True, methods=['post'])
+    def reserve(self, request, pk=None):
+        """
+        Descuenta inventario de un plato: POST /api/menu/{id}/reserve/ {"quantity": n}
+        """
+        serializer = StockReservationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         try:
-            return Booking.objects.get(pk=pk)
-        except Booking.DoesNotExist:
-            return None
-    
-    def get(self, request, pk):
-        booking = self.get_object(pk)
-        if not booking:
-            return Response(status=status.HTTP_404_NOT_FOUND)
-        serializer = BookingSerializer(booking)
-        return Response(serializer.data)
-    
-    def put(self, request, pk):
-        booking = self.get_object(pk)
-        if not booking:
+            item_id = int(pk)
+        except (TypeError, ValueError):
             return Response(status=status.HTTP_404_NOT_FOUND)
-        serializer = BookingSerializer(booking, data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    def delete(self, request, pk):
-        booking = self.get_object(pk)
-        if not booking:
-            return Response(status=status.HTTP_404_NOT_FOUND)
-        booking.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        return self.stock_response({item_id: serializer.validated_data['quantity']})
+
+    @action(detail=False, methods=['post'], url_path='reserve')
+    def reserve_many(self, request):
+        """
+        Descuenta inventario de varios platos a la vez (todo o nada):
+        POST /api/menu/reserve/ [{"id": 1, "quantity": 2}, ...]
+        """
+        serializer = StockReservationItemSerializer(data=request.data, many=True, allow_empty=False)
+        serializer.is_valid(raise_exception=True)
+        quantities = {}
+        for item in serializer.validated_data:
+            quantities[item['id']] = quantities.get(item['id'], 0) + item['quantity']
+        return self.stock_response(quantities)
+
+    def stock_response(self, quantities):
+        try:
+            stock = reserve_stock(quantities)
+        except Menu.DoesNotExist as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_404_NOT_FOUND)
+        except InsufficientStock as exc:
+            return Response(
+                {'detail': str(exc), 'id': exc.item_id, 'available': exc.available},
+                status=status.HTTP_409_CONFLICT,
+            )
+        items = [{'id': item_id, 'Inventory': stock[item_id]} for item_id in sorted(stock)]
+        return Response(items[0] if self.detail else items)
+
+    # bulk_create/bulk_update no envían señales: se invalida la caché una vez por lote
+    # (en el momento y tras el commit, como invalidate_menu_cache) y el índice
+    # de búsqueda se actualiza al confirmar
+    def perform_bulk_create(self, objs):
+        objs = super().perform_bulk_create(objs)
+        self.invalidate_cache()
+        self.reindex_titles(objs)
+        return objs
+
+    def perform_bulk_update(self, changes):
+        super().perform_bulk_update(changes)
+        self.invalidate_cache()
+        self.reindex_titles([instance for instance, validated_data in changes if 'Title' in validated_data])
+
+    def invalidate_cache(self):
+        menu_cache.invalidate()
+        transaction.on_commit(menu_cache.invalidate)
+
+    def perform_bulk_destroy(self, queryset):
+        with menu_cache.batch():
+            return super().perform_bulk_destroy(queryset)
+
+    def reindex_titles(self, objs):
+        titles = [(obj.pk, obj.Title) for obj in objs]
+        if titles:
+            transaction.on_commit(partial(menu_search_index.update_many, titles))
 
 
 # ===========================================
-# 3. MIXINS
+# VIEWSET PERSONALIZADO CON ACCIONES LIMITADAS
 # ===========================================
 
-class MenuListMixin(mixins.ListModelMixin, 
-                    mixins.CreateModelMixin,
-                    generics.GenericAPIView):
+class MenuReadOnlyViewSet(MenuCacheMixin, ConditionalDetailMixin, SparseFieldsMixin,
+                          viewsets.ReadOnlyModelViewSet):
     """
-    Vista usando mixins para listar y crear elementos del menú
+    ViewSet de solo lectura para el menú (GET solamente)
     """
     queryset = Menu.objects.all()
     serializer_class = MenuSerializer
-    
-    def get(self, request, *args, **kwargs):
-        return self.list(request, *args, **kwargs)
-    
-    def post(self, request, *args, **kwargs):
-        return self.create(request, *args, **kwargs)
+    authentication_classes = get_hot_authentication_classes()
+    throttle_classes = [MenuAnonThrottle]
 
+# ===========================================
+# RUTAS ALTERNATIVAS
+# ===========================================
+# Las rutas /api/function/, /api/class/, /api/mixin/ y /api/generic/ mantienen
+# sus URLs, métodos y permisos, pero se sirven con el ViewSet del recurso:
+# comparten caché, paginación, filtros y consultas optimizadas.
 
-class MenuDetailMixin(mixins.RetrieveModelMixin,
-                     mixins.UpdateModelMixin,
-                     mixins.DestroyModelMixin,
-                     generics.GenericAPIView):
+class LegacyRouteMixin:
     """
-    Vista usando mixins para obtener, actualizar y eliminar elementos del menú
+    Expone un ViewSet en una ruta alternativa con los métodos de ``route_actions``.
+    Usa la autenticación y los permisos por defecto del proyecto
+    (``IsAuthenticatedOrReadOnly``), como las vistas originales de estas rutas.
     """
-    queryset = Menu.objects.all()
-    serializer_class = MenuSerializer
-    
-    def get(self, request, *args, **kwargs):
-        return self.retrieve(request, *args, **kwargs)
-    
-    def put(self, request, *args, **kwargs):
-        return self.update(request, *args, **kwargs)
-    
-    def delete(self, request, *args, **kwargs):
-        return self.destroy(request, *args, **kwargs)
+    route_actions = None
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        return super().as_view(actions or cls.route_actions, **initkwargs)
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
 
 
 # ===========================================
-# 4. GENERIC VIEW CLASSES
+# 1. FUNCTION-BASED VIEWS
 # ===========================================
 
-class UserListGeneric(generics.ListCreateAPIView):
+class UserRouteViewSet(LegacyRouteMixin, UserViewSet):
     """
-    Generic view para listar y crear usuarios
+    Usuarios en /api/function/users/ y /api/generic/users/
     """
-    queryset = User.objects.all()
-    serializer_class = UserSerializer
 
 
-class UserDetailGeneric(generics.RetrieveUpdateDestroyAPIView):
+user_list_function = UserRouteViewSet.as_view({'get': 'list', 'post': 'create'})
+user_detail_function = UserRouteViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'})
+
+
+# ===========================================
+# 2. CLASS-BASED VIEWS (APIView)
+# ===========================================
+
+class BookingListAPIView(LegacyRouteMixin, BookingViewSet):
     """
-    Generic view para obtener, actualizar y eliminar usuarios
+    Listar (paginado) o crear reservas
     """
-    queryset = User.objects.all()
-    serializer_class = UserSerializer
+    route_actions = {'get': 'list', 'post': 'create'}
 
 
-class BookingListGeneric(generics.ListCreateAPIView):
+class BookingDetailAPIView(LegacyRouteMixin, BookingViewSet):
     """
-    Generic view para listar y crear reservas
+    Obtener, actualizar o eliminar una reserva específica
     """
-    queryset = Booking.objects.all()
-    serializer_class = BookingSerializer
+    route_actions = {'get': 'retrieve', 'put': 'update', 'delete': 'destroy'}
 
 
-class BookingDetailGeneric(generics.RetrieveUpdateDestroyAPIView):
+class AvailabilityAPIView(APIView):
     """
-    Generic view para obtener, actualizar y eliminar reservas
+    Disponibilidad por franjas de un día: GET /api/availability/?date=YYYY-MM-DD
+    Lee la ocupación precalculada, sin recorrer las reservas.
     """
-    queryset = Booking.objects.all()
-    serializer_class = BookingSerializer
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        value = request.query_params.get('date')
+        if not value:
+            return Response({'date': ['Este parámetro es obligatorio.']}, status=status.HTTP_400_BAD_REQUEST)
+        day = timezone.localdate(parse_booking_date(value, 'date'))
+        options = get_capacity_settings()
+        return Response({
+            'date': day,
+            'slot_minutes': options['SLOT_MINUTES'],
+            'capacity': options['SEATS_PER_SLOT'],
+            'slots': get_availability(day),
+        })
 
 
 # ===========================================
-# 5. VIEWSETS
+# 3. MIXINS
 # ===========================================
 
-class UserViewSet(viewsets.ModelViewSet):
+class MenuListMixin(LegacyRouteMixin, MenuViewSet):
     """
-    ViewSet para gestión de usuarios
-    - Solo ADMINISTRADORES pueden crear/editar/eliminar usuarios
-    - Usuarios autenticados pueden VER la lista de usuarios
-    - Usuarios no autenticados NO pueden hacer nada
+    Listar y crear elementos del menú
     """
-    queryset = User.objects.all()
-    serializer_class = UserSerializer
-    
-    def get_permissions(self):
-        """
-        Permisos específicos por acción
-        """
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
-            # Solo administradores pueden crear/editar/eliminar usuarios
-            permission_classes = [IsAdminUser]
-        elif self.action in ['list', 'retrieve']:
-            # Usuarios autenticados pueden ver usuarios
-            permission_classes = [IsAuthenticated]
-        else:
-            # Por defecto, requiere autenticación
-            permission_classes = [IsAuthenticated]
-        
-        return [permission() for permission in permission_classes]
+    route_actions = {'get': 'list', 'post': 'create'}
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class MenuDetailMixin(LegacyRouteMixin, MenuViewSet):
     """
-    ViewSet para reservas
-    - Solo usuarios autenticados pueden acceder a las reservas
+    Obtener, actualizar y eliminar elementos del menú
     """
-    queryset = Booking.objects.all()
-    serializer_class = BookingSerializer
-    permission_classes = [IsAuthenticated]
+    route_actions = {'get': 'retrieve', 'put': 'update', 'delete': 'destroy'}
+
 
+# ===========================================
+# 4. GENERIC VIEW CLASSES
+# ===========================================
 
-class MenuViewSet(viewsets.ModelViewSet):
+class UserListGeneric(UserRouteViewSet):
     """
-    ViewSet para menú
-    - Solo ADMINISTRADORES pueden modificar el menú
-    - Todos pueden VER el menú (para elegir platos)
+    Listar y crear usuarios
     """
-    queryset = Menu.objects.all()
-    serializer_class = MenuSerializer
-    
-    def get_permissions(self):
-        """
-        Permisos específicos por acción
-        """
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
-            # Solo administradores pueden modificar el menú
-            permission_classes = [IsAdminUser]
-        else:
-            # Todos pueden ver el menú
-            permission_classes = [AllowAny]
-        
-        return [permission() for permission in permission_classes]
+    route_actions = {'get': 'list', 'post': 'create'}
 
 
-# ===========================================
-# VIEWSET PERSONALIZADO CON ACCIONES LIMITADAS
-# ===========================================
+class UserDetailGeneric(UserRouteViewSet):
+    """
+    Obtener, actualizar y eliminar usuarios
+    """
+    route_actions = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
 
-class MenuReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+
+class BookingListGeneric(BookingListAPIView):
     """
-    ViewSet de solo lectura para el menú (GET solamente)
+    Listar y crear reservas
     """
-    queryset = Menu.objects.all()
-    serializer_class = MenuSerializer
\ No newline at end of file
+
+
+class BookingDetailGeneric(LegacyRouteMixin, BookingViewSet):
+    """
+    Obtener, actualizar y eliminar reservas
+    """
+    route_actions = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
@@ -0,0 +1,99 @@
+from decimal import Decimal
+
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from restaurant.cache import menu_cache
+from restaurant.models import Booking, Menu
+
+
+class AdminPerformanceTest(TestCase):
+    """
+    Clase de prueba para el modo rendimiento de los listados del admin
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        for i in range(30):
+            Booking.objects.create(Name=f'Cliente {i}', No_of_guests=1 + i % 5,
+                                   BookingDate=f'2030-01-{1 + i % 28:02d}T20:00:00Z')
+        self.menu = [Menu.objects.create(Title=f'Plato {i:02d}', Price=5 + i, Inventory=i) for i in range(30)]
+        # Tipo de contenido del historial en la caché de ContentType, como en un proceso ya arrancado
+        ContentType.objects.get_for_model(Menu)
+
+    def test_booking_changelist_query_count(self):
+        # Primera carga: sesión, usuario, valores de No_of_guests, conteo y página
+        with self.assertNumQueries(5):
+            response = self.client.get('/admin/restaurant/booking/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['cl'].full_result_count)
+        self.assertIsNone(response.context['cl'].date_hierarchy)
+        # Con los valores del filtro en caché: sin SELECT DISTINCT, también al filtrar
+        with self.assertNumQueries(4):
+            self.client.get('/admin/restaurant/booking/')
+        with self.assertNumQueries(4):
+            response = self.client.get('/admin/restaurant/booking/?No_of_guests=2')
+        self.assertContains(response, '6 Reservas')
+
+    def test_menu_changelist_query_count(self):
+        with self.assertNumQueries(4):
+            response = self.client.get('/admin/restaurant/menu/?price_range=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '10 - 20')
+        self.assertContains(response, '10 Elementos del Menú')
+
+    def test_range_filter(self):
+        response = self.client.get('/admin/restaurant/menu/?inventory_range=0')
+        self.assertEqual([obj.Title for obj in response.context['cl'].result_list], ['Plato 00'])
+
+    @override_settings(ADMIN_PERFORMANCE={'COUNT_LIMIT': 20})
+    def test_count_is_capped(self):
+        response = self.client.get('/admin/restaurant/booking/')
+        self.assertContains(response, 'más de 20 Reservas')
+        self.assertContains(response, '5 Reservas', count=0)
+
+    @override_settings(ADMIN_PERFORMANCE={'ENABLED': False})
+    def test_disabled_keeps_default_admin(self):
+        with self.assertNumQueries(8):
+            response = self.client.get('/admin/restaurant/booking/')
+        self.assertEqual(response.context['cl'].date_hierarchy, 'BookingDate')
+        self.assertContains(response, '30 Reservas')
+
+    def list_editable_post(self, changes):
+        data = {
+            'form-TOTAL_FORMS': str(len(self.menu[:20])),
+            'form-INITIAL_FORMS': str(len(self.menu[:20])),
+            '_save': 'Guardar',
+        }
+        # Primera página del listado (orden por título)
+        for index, item in enumerate(self.menu[:20]):
+            price, inventory = changes.get(item.pk, (item.Price, item.Inventory))
+            data.update({
+                f'form-{index}-id': str(item.pk),
+                f'form-{index}-Price': str(price),
+                f'form-{index}-Inventory': str(inventory),
+            })
+        return self.client.post('/admin/restaurant/menu/', data)
+
+    def test_list_editable_saves_in_bulk(self):
+        version = menu_cache.backend.get_version()
+        changes = {item.pk: (Decimal('99.00'), 77) for item in self.menu[:5]}
+        # Sesión, usuario, conteo, objetos editados, UPDATE en bloque, INSERT del
+        # historial y dos pares SAVEPOINT/RELEASE
+        with self.assertNumQueries(10):
+            response = self.list_editable_post(changes)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Menu.objects.filter(Price=Decimal('99.00'), Inventory=77).count(), 5)
+        self.assertEqual(set(Menu.objects.filter(Inventory=77).values_list('Version', flat=True)), {2})
+        self.assertEqual(LogEntry.objects.count(), 5)
+        self.assertNotEqual(menu_cache.backend.get_version(), version)
+
+    def test_list_editable_query_count_does_not_grow(self):
+        with self.assertNumQueries(10):
+            self.list_editable_post({self.menu[0].pk: (Decimal('1.00'), 1)})
+        with self.assertNumQueries(10):
+            self.list_editable_post({item.pk: (Decimal('2.00'), 2) for item in self.menu[:15]})
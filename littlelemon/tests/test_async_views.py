@@ -0,0 +1,73 @@
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from restaurant.models import Booking, Menu
+from restaurant.throttling import bucket_store
+from decimal import Decimal
+
+
+class AsyncViewsTest(TestCase):
+    """
+    Clase de prueba para las vistas asíncronas de solo lectura
+    """
+
+    def setUp(self):
+        for i in range(25):
+            Menu.objects.create(Title=f"Plato {i:02d}", Price=Decimal('9.90'), Inventory=i)
+        Booking.objects.create(Name="Juan Perez", No_of_guests=2, BookingDate="2025-06-25T19:00:00Z")
+        user = User.objects.create_user('host', password='pass')
+        self.token = Token.objects.create(user=user).key
+
+    def test_menu_list_matches_sync_api(self):
+        """
+        La respuesta asíncrona es idéntica a la de MenuViewSet
+        """
+        sync = APIClient().get('/api/menu/', {'page': 2}, HTTP_ACCEPT='application/json')
+        response = self.client.get('/api/async/menu/', {'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 25)
+        self.assertEqual(response.json()['previous'], 'http://testserver/api/async/menu/')
+        self.assertEqual(response.json()['results'], sync.json()['results'])
+
+    async def test_menu_list_async_client(self):
+        response = await AsyncClient().get('/api/async/menu/')
+        self.assertEqual(len(response.json()['results']), 20)
+
+    @override_settings(THROTTLING={'RATES': {'menu_anon': '2/min'}})
+    def test_menu_reads_share_anonymous_throttle(self):
+        """
+        Las rutas asíncronas no permiten saltarse el límite de /api/menu/
+        """
+        bucket_store.clear()
+        self.addCleanup(bucket_store.clear)
+        self.assertEqual(APIClient().get('/api/menu/').status_code, 200)
+        self.assertEqual(self.client.get('/api/async/menu/').status_code, 200)
+        response = self.client.get(f'/api/async/menu/{Menu.objects.first().pk}/')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(int(response['Retry-After']), (29, 30))
+        self.assertIn('throttled', response.json()['detail'])
+        # Con token no se limita
+        response = self.client.get('/api/async/menu/', headers={'Authorization': f'Token {self.token}'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_menu_detail_matches_sync_api(self):
+        item = Menu.objects.first()
+        sync = APIClient().get(f'/api/menu/{item.pk}/', HTTP_ACCEPT='application/json').content
+        async_ = self.client.get(f'/api/async/menu/{item.pk}/').content
+        self.assertEqual(sync, async_)
+
+    async def test_bookings_require_authentication(self):
+        client = AsyncClient()
+        response = await client.get('/api/async/bookings/')
+        self.assertEqual(response.status_code, 401)
+
+        response = await client.get('/api/async/bookings/', headers={'Authorization': f'Token {self.token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['Name'], "Juan Perez")
+
+    async def test_unknown_booking_is_404(self):
+        response = await AsyncClient().get(
+            '/api/async/bookings/999/', headers={'Authorization': f'Token {self.token}'},
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,55 @@
+import base64
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    """
+    Clase de prueba para la autenticación por token cacheada
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('host', password='pass')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.url = '/api/bookings/?count=false'
+
+    def test_second_request_skips_token_lookup(self):
+        """
+        Con el token en caché solo se consulta la lista de reservas
+        """
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('authtoken_token' in q['sql'] for q in queries.captured_queries))
+
+    def test_logout_invalidates_token(self):
+        """
+        Tras el logout de djoser el token deja de aceptarse de inmediato
+        """
+        self.client.get(self.url)
+        self.client.post('/auth/token/logout/')
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_hot_routes_reject_basic_auth(self):
+        """
+        Los ViewSets no aceptan BasicAuthentication; las rutas antiguas sí
+        """
+        client = APIClient()
+        credentials = base64.b64encode(b'host:pass').decode()
+        client.credentials(HTTP_AUTHORIZATION=f'Basic {credentials}')
+        self.assertEqual(client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(client.get('/api/generic/bookings/').status_code, status.HTTP_200_OK)
@@ -0,0 +1,55 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from restaurant.models import Booking, BookingRollup, Menu, SlotOccupancy
+
+
+class BenchApiCommandTest(TestCase):
+    """
+    Clase de prueba para el comando bench_api
+    """
+
+    def test_writes_json_report_and_cleans_up(self):
+        booking = Booking.objects.create(Name='Ana', No_of_guests=2, BookingDate='2030-06-10T19:00:00Z')
+        occupancy = list(SlotOccupancy.objects.values_list('SlotStart', 'Guests'))
+        rollups = list(BookingRollup.objects.values_list('Date', 'Hour', 'Bookings', 'Guests'))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.json')
+            call_command(
+                'bench_api', menu=3, bookings=3, users=3, requests=4, concurrency=1, warmup=0,
+                routes='menu', output=path, current_database=True, stdout=io.StringIO(),
+            )
+            with open(path) as source:
+                report = json.load(source)
+
+        self.assertEqual(report['meta']['seed'], {'menu': 3, 'bookings': 3, 'users': 3})
+        routes = {result['route']: result for result in report['routes']}
+        self.assertIn('/api/menu/{pk}/', routes)
+        for result in routes.values():
+            self.assertEqual(result['requests'], 4)
+            self.assertEqual(result['statuses'], {'200': 4})
+            for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'queries_per_request'):
+                self.assertIn(key, result)
+
+        self.assertFalse(Menu.objects.exists())
+        self.assertEqual(list(Booking.objects.all()), [booking])
+        self.assertFalse(User.objects.exists())
+        # Lo sembrado no pasó por la ocupación ni los resúmenes, y la limpieza tampoco
+        self.assertEqual(list(SlotOccupancy.objects.values_list('SlotStart', 'Guests')), occupancy)
+        self.assertEqual(list(BookingRollup.objects.values_list('Date', 'Hour', 'Bookings', 'Guests')), rollups)
+
+    def test_uses_throwaway_database_by_default(self):
+        module = 'restaurant.management.commands.bench_api'
+        with mock.patch(f'{module}.setup_databases', return_value='old-config') as setup, \
+                mock.patch(f'{module}.teardown_databases') as teardown:
+            call_command('bench_api', menu=1, bookings=1, users=1, requests=1, concurrency=1, warmup=0,
+                         routes='/api/menu/', stdout=io.StringIO())
+        setup.assert_called_once()
+        teardown.assert_called_once_with('old-config', verbosity=0)
@@ -0,0 +1,117 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from restaurant.cache import menu_cache
+from restaurant.models import Booking, Menu, SlotOccupancy
+from decimal import Decimal
+
+
+class MenuBulkTest(TestCase):
+    """
+    Clase de prueba para los endpoints masivos del menú
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        self.url = '/api/menu/bulk/'
+
+    def test_bulk_create(self):
+        """
+        Crea el lote completo y devuelve un resultado por elemento
+        """
+        payload = [{'Title': f'Plato {i}', 'Price': '9.99', 'Inventory': i} for i in range(5)]
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        results = response.json()['results']
+        self.assertEqual([r['status'] for r in results], ['created'] * 5)
+        self.assertTrue(all(r['data']['id'] for r in results))
+        self.assertEqual(Menu.objects.count(), 5)
+
+    def test_invalid_item_rejects_whole_batch(self):
+        """
+        Si un elemento no es válido no se guarda ninguno
+        """
+        payload = [{'Title': 'Ok', 'Price': '1.00', 'Inventory': 1}, {'Title': 'Sin precio', 'Inventory': 1}]
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        results = response.json()['results']
+        self.assertEqual(results[0]['status'], 'valid')
+        self.assertIn('Price', results[1]['errors'])
+        self.assertEqual(Menu.objects.count(), 0)
+
+    def test_bulk_update_and_delete(self):
+        items = [Menu.objects.create(Title=f'Plato {i}', Price=Decimal('5.00'), Inventory=1) for i in range(3)]
+        response = self.client.patch(self.url, [{'id': item.pk, 'Inventory': 9} for item in items], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(Menu.objects.values_list('Inventory', flat=True)), {9})
+
+        response = self.client.delete(self.url, [items[0].pk, 999], format='json')
+        statuses = [r['status'] for r in response.json()['results']]
+        self.assertEqual(statuses, ['deleted', 'not_found'])
+        self.assertEqual(Menu.objects.count(), 2)
+
+    def test_bulk_update_invalidates_cache_on_commit(self):
+        """
+        La caché se invalida también tras el commit, como en los guardados individuales
+        """
+        item = Menu.objects.create(Title='Plato', Price=Decimal('5.00'), Inventory=1)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.patch(self.url, [{'id': item.pk, 'Inventory': 2}], format='json')
+        version, _ = menu_cache.get_version()
+        for callback in callbacks:
+            callback()
+        self.assertGreater(menu_cache.get_version()[0], version)
+
+    @override_settings(BULK_MAX_BATCH_SIZE=2)
+    def test_max_batch_size(self):
+        payload = [{'Title': 'Plato', 'Price': '1.00', 'Inventory': 1}] * 3
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_admin(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('host', password='pass'))
+        response = client.post(self.url, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(BOOKING_CAPACITY={'SEATS_PER_SLOT': 10, 'SLOT_MINUTES': 30, 'BOOKING_DURATION_MINUTES': 30})
+class BookingBulkTest(TestCase):
+    """
+    Clase de prueba para los endpoints masivos de reservas
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('host', password='pass'))
+        self.url = '/api/bookings/bulk/'
+
+    def test_bulk_create_updates_occupancy(self):
+        payload = [{'Name': f'Cliente {i}', 'No_of_guests': 3, 'BookingDate': '2025-06-25T19:00:00Z'} for i in range(3)]
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SlotOccupancy.objects.get().Guests, 9)
+
+    def test_bulk_create_over_capacity_rolls_back(self):
+        payload = [{'Name': f'Cliente {i}', 'No_of_guests': 4, 'BookingDate': '2025-06-25T19:00:00Z'} for i in range(3)]
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Booking.objects.count(), 0)
+
+    def test_duplicate_ids_are_rejected(self):
+        """
+        Un id repetido invalida el lote: sus cambios de ocupación se aplicarían dos veces
+        """
+        booking = Booking.objects.create(Name='Cliente', No_of_guests=2, BookingDate='2025-06-25T19:00:00Z')
+        response = self.client.patch(self.url, [
+            {'id': booking.pk, 'No_of_guests': 4}, {'id': booking.pk, 'No_of_guests': 6},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        results = response.json()['results']
+        self.assertEqual(results[0]['status'], 'valid')
+        self.assertIn('id', results[1]['errors'])
+        booking.refresh_from_db()
+        self.assertEqual(booking.No_of_guests, 2)
+        self.assertEqual(SlotOccupancy.objects.get().Guests, 2)
@@ -0,0 +1,91 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from restaurant.cache import menu_cache
+from restaurant.models import Menu
+from decimal import Decimal
+
+
+class MenuCacheTest(TestCase):
+    """
+    Clase de prueba para la caché de respuestas del menú
+    """
+
+    def setUp(self):
+        menu_cache.reset()
+        self.item = Menu.objects.create(Title="Greek Salad", Price=Decimal('12.50'), Inventory=20)
+        self.client = APIClient()
+        self.url = reverse('menu-list')
+
+    def test_second_request_is_a_hit(self):
+        """
+        La segunda petición se sirve desde la caché sin consultar la base de datos
+        """
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(menu_cache.stats.as_dict()['hits'], 1)
+
+    def test_save_invalidates(self):
+        """
+        Guardar un elemento del menú invalida las respuestas cacheadas
+        """
+        self.client.get(self.url)
+        self.item.Price = Decimal('13.00')
+        self.item.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['Price'], '13.00')
+
+    def test_delete_invalidates(self):
+        """
+        Eliminar un elemento del menú invalida las respuestas cacheadas
+        """
+        self.client.get(self.url)
+        self.item.delete()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()['count'], 0)
+
+    def test_etag_returns_304(self):
+        """
+        Una petición con If-None-Match coincidente devuelve 304 sin cuerpo
+        """
+        response = self.client.get(reverse('menu-detail', args=[self.item.pk]))
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(
+            reverse('menu-detail', args=[self.item.pk]),
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_lru_eviction(self):
+        """
+        El backend LRU desaloja las entradas más antiguas al superar MAX_ENTRIES
+        """
+        with override_settings(MENU_CACHE={'MAX_ENTRIES': 1}):
+            self.client.get(self.url)
+            self.client.get(self.url, {'page': 1})
+            self.assertEqual(menu_cache.stats.as_dict()['evictions'], 1)
+
+    def test_cache_stats_requires_admin(self):
+        """
+        Los contadores de la caché solo son visibles para administradores
+        """
+        url = reverse('menu-cache-stats')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_authenticate(admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('hits', response.json())
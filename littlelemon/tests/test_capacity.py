@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+from importlib import import_module
+from types import SimpleNamespace
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from restaurant.capacity import CapacityExceeded
+from restaurant.models import Booking, SlotOccupancy
+
+
+@override_settings(BOOKING_CAPACITY={'SEATS_PER_SLOT': 10, 'SLOT_MINUTES': 30, 'BOOKING_DURATION_MINUTES': 60})
+class CapacityTest(TestCase):
+    """
+    Clase de prueba para el motor de capacidad de reservas
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('host', password='pass'))
+        self.url = reverse('booking-list')
+
+    def book(self, guests, when='2025-06-25T19:00:00Z', url=None):
+        return self.client.post(url or self.url, {
+            'Name': 'Cliente', 'No_of_guests': guests, 'BookingDate': when,
+        }, format='json')
+
+    def occupancy(self):
+        return list(SlotOccupancy.objects.values_list('SlotStart', 'Guests'))
+
+    def test_create_updates_covered_slots(self):
+        """
+        Una reserva ocupa plazas en todas las franjas de su duración
+        """
+        self.assertEqual(self.book(4).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.occupancy(), [
+            (datetime(2025, 6, 25, 19, 0, tzinfo=timezone.utc), 4),
+            (datetime(2025, 6, 25, 19, 30, tzinfo=timezone.utc), 4),
+        ])
+
+    def test_over_capacity_is_rejected_atomically(self):
+        """
+        Si una franja se llena, la reserva se rechaza y no se guarda nada
+        """
+        self.book(8, when='2025-06-25T19:30:00Z')
+        response = self.book(4)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('BookingDate', response.json())
+        self.assertEqual(Booking.objects.count(), 1)
+        # La franja de las 19:00 no conserva el incremento parcial
+        self.assertFalse(SlotOccupancy.objects.filter(SlotStart='2025-06-25T19:00:00Z', Guests__gt=0).exists())
+
+    def test_save_outside_a_transaction_is_atomic(self):
+        """
+        Un guardado directo (admin, shell) sin plazas no deja la reserva escrita
+        """
+        Booking.objects.create(Name='Cliente', No_of_guests=8, BookingDate='2025-06-25T19:30:00Z')
+        with self.assertRaises(CapacityExceeded):
+            Booking.objects.create(Name='Cliente', No_of_guests=4, BookingDate='2025-06-25T19:00:00Z')
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertFalse(SlotOccupancy.objects.filter(SlotStart='2025-06-25T19:00:00Z', Guests__gt=0).exists())
+
+    def test_class_based_view_is_also_checked(self):
+        self.book(10)
+        response = self.book(1, url=reverse('booking-list-class'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_update_and_delete_are_incremental(self):
+        """
+        Modificar o eliminar una reserva aplica solo la diferencia
+        """
+        booking_id = self.book(4).json()['id']
+        self.client.put(reverse('booking-detail', args=[booking_id]), {
+            'Name': 'Cliente', 'No_of_guests': 10, 'BookingDate': '2025-06-25T19:00:00Z',
+        }, format='json')
+        self.assertEqual({guests for _, guests in self.occupancy()}, {10})
+
+        self.client.delete(reverse('booking-detail', args=[booking_id]))
+        self.assertEqual({guests for _, guests in self.occupancy()}, {0})
+
+    def test_availability_endpoint(self):
+        """
+        La disponibilidad se calcula sin consultar la tabla de reservas
+        """
+        self.book(3)
+        anonymous = APIClient()
+        with self.assertNumQueries(1):
+            data = anonymous.get(reverse('availability'), {'date': '2025-06-25'}).json()
+        slot = next(s for s in data['slots'] if s['start'] == '2025-06-25T19:00:00Z')
+        self.assertEqual((slot['booked'], slot['available']), (3, 7))
+
+    def test_rebuild_command(self):
+        self.book(5)
+        SlotOccupancy.objects.all().delete()
+        call_command('rebuild_occupancy', stdout=open('/dev/null', 'w'))
+        self.assertEqual({guests for _, guests in self.occupancy()}, {5})
+
+    def test_migration_fills_existing_bookings(self):
+        migration = import_module('restaurant.migrations.0004_slotoccupancy')
+        self.book(5)
+        expected = self.occupancy()
+        SlotOccupancy.objects.all().delete()
+        migration.fill_existing_bookings(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(self.occupancy(), expected)
+        self.assertEqual(self.book(6).status_code, status.HTTP_400_BAD_REQUEST)
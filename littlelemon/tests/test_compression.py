@@ -0,0 +1,80 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurant.compression import choose_encoding
+from restaurant.models import Booking, Menu
+
+
+class ChooseEncodingTest(SimpleTestCase):
+    """
+    Clase de prueba para la negociación de Accept-Encoding
+    """
+
+    def test_negotiation(self):
+        self.assertEqual(choose_encoding('gzip, deflate, br', ('br', 'gzip')), 'br')
+        self.assertEqual(choose_encoding('gzip, deflate, br', ('gzip',)), 'gzip')
+        self.assertEqual(choose_encoding('br;q=0.5, gzip', ('br', 'gzip')), 'gzip')
+        self.assertEqual(choose_encoding('*', ('gzip',)), 'gzip')
+        self.assertIsNone(choose_encoding('gzip;q=0', ('gzip',)))
+        self.assertIsNone(choose_encoding('identity', ('br', 'gzip')))
+        self.assertIsNone(choose_encoding('', ('gzip',)))
+
+
+@override_settings(RESPONSE_COMPRESSION={'MIN_SIZE': 1024})
+class CompressionMiddlewareTest(TestCase):
+    """
+    Clase de prueba para la compresión de las respuestas JSON
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('host', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        start = datetime(2030, 1, 1, 12, tzinfo=timezone.utc)
+        for i in range(20):
+            Booking.objects.create(Name=f'Cliente {i}', No_of_guests=2, BookingDate=start + timedelta(hours=i))
+
+    def test_large_json_is_gzipped(self):
+        plain = self.client.get('/api/bookings/', HTTP_ACCEPT='application/json')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+
+        response = self.client.get('/api/bookings/', HTTP_ACCEPT='application/json', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(json.loads(gzip.decompress(response.content)), plain.json())
+
+    def test_small_json_is_not_compressed(self):
+        item = Menu.objects.create(Title='Paella', Price=Decimal('18.00'), Inventory=10)
+        response = self.client.get(f'/api/menu/{item.pk}/', HTTP_ACCEPT='application/json',
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_html_is_not_compressed(self):
+        response = self.client.get('/api/bookings/', HTTP_ACCEPT='text/html', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming_export_is_gzipped(self):
+        response = self.client.get('/api/bookings/export/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(len(lines), 20)
+        self.assertEqual(json.loads(lines[0])['Name'], 'Cliente 0')
+
+    @override_settings(RESPONSE_COMPRESSION={'MIN_SIZE': 10})
+    def test_weak_etag_is_accepted_by_if_match(self):
+        booking = Booking.objects.first()
+        booking.Name = 'Cliente ' * 20
+        booking.save()
+        url = f'/api/bookings/{booking.pk}/'
+        etag = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_ACCEPT_ENCODING='gzip')['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        response = self.client.patch(url, {'No_of_guests': 3}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
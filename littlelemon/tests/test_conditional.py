@@ -0,0 +1,138 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurant.cache import menu_cache
+from restaurant.models import Booking, Menu
+
+
+class VersionedModelTest(TestCase):
+    """
+    Clase de prueba para las columnas Version y LastModified
+    """
+
+    def test_version_increments_on_every_write(self):
+        item = Menu.objects.create(Title='Paella', Price=Decimal('18.00'), Inventory=10)
+        self.assertEqual(item.Version, 1)
+        modified = item.LastModified
+
+        item.Inventory = 9
+        with self.assertNumQueries(1):
+            item.save()
+        self.assertEqual(item.Version, 2)
+        self.assertGreater(item.LastModified, modified)
+
+        item.save(update_fields=['Inventory'])
+        self.assertEqual(Menu.objects.get(pk=item.pk).Version, 3)
+
+    def test_stock_reservation_bumps_version(self):
+        item = Menu.objects.create(Title='Paella', Price=Decimal('18.00'), Inventory=10)
+        user = User.objects.create_user('cashier', password='pass')
+        client = APIClient()
+        client.force_authenticate(user)
+        client.post(f'/api/menu/{item.pk}/reserve/', {'quantity': 2}, format='json')
+        self.assertEqual(Menu.objects.get(pk=item.pk).Version, 2)
+
+
+class ConditionalDetailTest(TestCase):
+    """
+    Clase de prueba para ETag, 304 e If-Match en los endpoints de detalle
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('host', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.booking = Booking.objects.create(
+            Name='Ana', No_of_guests=2, BookingDate=datetime(2030, 1, 1, 20, tzinfo=timezone.utc),
+        )
+        self.url = f'/api/bookings/{self.booking.pk}/'
+
+    def test_detail_sends_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['ETag'], f'"{self.booking.pk}-1"')
+        self.assertIn('Last-Modified', response)
+
+    def test_if_none_match_returns_304_with_one_query(self):
+        etag = self.client.get(self.url)['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertNotIn('"Name"', queries.captured_queries[0]['sql'])
+
+        Booking.objects.filter(pk=self.booking.pk).update(Name='Ana María', **Booking.version_bump())
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['Name'], 'Ana María')
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_match_on_put_and_delete(self):
+        etag = self.client.get(self.url)['ETag']
+        data = {'Name': 'Ana', 'No_of_guests': 3, 'BookingDate': '2030-01-01T20:00:00Z'}
+
+        response = self.client.put(self.url, data, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        new_etag = response['ETag']
+        self.assertEqual(new_etag, f'"{self.booking.pk}-2"')
+
+        # Otro cliente con la versión anterior
+        response = self.client.put(self.url, {**data, 'No_of_guests': 4}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(response['ETag'], new_etag)
+        self.assertEqual(Booking.objects.get(pk=self.booking.pk).No_of_guests, 3)
+
+        response = self.client.delete(self.url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        response = self.client.delete(self.url, HTTP_IF_MATCH=new_etag)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_missing_object_returns_404(self):
+        response = self.client.get('/api/bookings/999999/', HTTP_IF_NONE_MATCH='"999999-1"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_menu_detail_routes(self):
+        """
+        Menú (con caché), ruta alternativa y vista asíncrona comparten validadores
+        """
+        item = Menu.objects.create(Title='Paella', Price=Decimal('18.00'), Inventory=10)
+        etag = f'"{item.pk}-1"'
+        for url in (f'/api/menu/{item.pk}/', f'/api/mixin/menu/{item.pk}/', f'/api/async/menu/{item.pk}/'):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_ACCEPT='application/json')
+                self.assertEqual(response['ETag'], etag)
+                response = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_menu_cache_hit_needs_no_queries(self):
+        """
+        Los aciertos de la caché del menú, incluidos los 304, no consultan la base de datos
+        """
+        menu_cache.reset()
+        item = Menu.objects.create(Title='Paella', Price=Decimal('18.00'), Inventory=10)
+        for url in (f'/api/menu/{item.pk}/', '/api/menu/'):
+            with self.subTest(url=url):
+                first = self.client.get(url, HTTP_ACCEPT='application/json')
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_ACCEPT='application/json')
+                    self.assertEqual(response['X-Cache'], 'HIT')
+                    self.assertEqual(response['ETag'], first['ETag'])
+                    response = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=first['ETag'])
+                    self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(first['ETag'][:6], '"menu-')
+
+        item.Inventory = 9
+        item.save()
+        response = self.client.get('/api/menu/', HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,35 @@
+from django.test import SimpleTestCase
+from littlelemon.database import SQLITE_WAL_INIT_COMMAND, build_database_config
+
+
+class DatabaseConfigTest(SimpleTestCase):
+    """
+    Clase de prueba para la configuración de la base de datos por entorno
+    """
+
+    def test_sqlite_uses_wal_and_persistent_connections(self):
+        config = build_database_config('sqlite:////tmp/littlelemon.sqlite3', conn_max_age=120)
+        self.assertEqual(config['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(config['CONN_MAX_AGE'], 120)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertEqual(config['OPTIONS']['init_command'], SQLITE_WAL_INIT_COMMAND)
+        self.assertEqual(config['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+
+    def test_sqlite_without_wal(self):
+        config = build_database_config('sqlite:////tmp/littlelemon.sqlite3', sqlite_wal=False)
+        self.assertEqual(config['OPTIONS'], {})
+
+    def test_postgres_persistent_connections(self):
+        config = build_database_config('postgres://lemon:secret@db:5432/littlelemon', conn_max_age=300)
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(config['CONN_MAX_AGE'], 300)
+        self.assertNotIn('pool', config['OPTIONS'])
+
+    def test_postgres_pool_disables_conn_max_age(self):
+        """
+        Con el pool de psycopg Django exige CONN_MAX_AGE = 0
+        """
+        config = build_database_config('postgres://lemon:secret@db:5432/littlelemon',
+                                       pool=True, pool_min_size=4, pool_max_size=20)
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertEqual(config['OPTIONS']['pool'], {'min_size': 4, 'max_size': 20, 'timeout': 10})
@@ -0,0 +1,42 @@
+import json
+from datetime import datetime, timedelta, timezone
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from restaurant.models import Booking
+from restaurant.serializers import BookingSerializer
+
+
+class BookingExportTest(TestCase):
+    """
+    Clase de prueba para la exportación en streaming de reservas
+    """
+
+    def setUp(self):
+        start = datetime(2025, 6, 25, 12, 0, tzinfo=timezone.utc)
+        Booking.objects.bulk_create([
+            Booking(Name=f"Cliente {i} ñ", No_of_guests=i % 6 + 1, BookingDate=start + timedelta(hours=i))
+            for i in range(30)
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('host', password='pass'))
+        self.expected = BookingSerializer(Booking.objects.all(), many=True).data
+
+    def content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_matches_serializer(self):
+        response = self.client.get('/api/bookings/export/')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(rows, self.expected)
+
+    def test_json_array_with_date_filter(self):
+        response = self.client.get('/api/bookings/export/', {'output': 'json', 'date_to': '2025-06-25'})
+        rows = json.loads(self.content(response))
+        self.assertEqual(rows, self.expected[:12])
+
+    def test_unknown_output_and_anonymous(self):
+        self.assertEqual(self.client.get('/api/bookings/export/', {'output': 'csv'}).status_code, 400)
+        self.assertEqual(APIClient().get('/api/bookings/export/').status_code, 401)
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta, timezone
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from restaurant.fastpath import ValuesSerializer
+from restaurant.models import Booking, Menu
+from restaurant.serializers import BookingSerializer, MenuSerializer
+from decimal import Decimal
+
+
+@override_settings(MENU_CACHE={'ENABLED': False})
+class FastListParityTest(TestCase):
+    """
+    Los listados rápidos deben ser idénticos byte a byte a los del ModelSerializer
+    """
+
+    def setUp(self):
+        prices = [Decimal('8.5'), Decimal('12.50'), Decimal('0.99'), Decimal('1000'), Decimal('7.125')]
+        for i, price in enumerate(prices):
+            Menu.objects.create(Title=f"Plato «{i}» ñ", Price=price, Inventory=i * 3)
+        start = datetime(2025, 6, 25, 19, 0, 0, 123456, tzinfo=timezone.utc)
+        for i in range(25):
+            Booking.objects.create(Name=f"Cliente {i} \"José\"", No_of_guests=i % 4 + 1,
+                                   BookingDate=start + timedelta(minutes=97 * i, seconds=i))
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('host', password='pass'))
+
+    def assert_same_bytes(self, url, params=None):
+        with override_settings(FAST_LIST_SERIALIZATION=False):
+            slow = self.client.get(url, params, HTTP_ACCEPT='application/json')
+        with override_settings(FAST_LIST_SERIALIZATION=True):
+            fast = self.client.get(url, params, HTTP_ACCEPT='application/json')
+        self.assertEqual(slow.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_menu_list(self):
+        self.assert_same_bytes('/api/menu/')
+
+    def test_booking_list_pages_and_cursor(self):
+        self.assert_same_bytes('/api/bookings/')
+        self.assert_same_bytes('/api/bookings/', {'page': 2})
+        self.assert_same_bytes('/api/bookings/', {'pagination': 'cursor'})
+        self.assert_same_bytes('/api/bookings/', {'min_guests': 3})
+
+    def test_values_serializer_matches_model_serializer(self):
+        for model, serializer_class in ((Menu, MenuSerializer), (Booking, BookingSerializer)):
+            fast = ValuesSerializer(serializer_class)
+            rows = fast.serialize(model.objects.values(*fast.value_fields))
+            self.assertEqual(rows, serializer_class(model.objects.all(), many=True).data)
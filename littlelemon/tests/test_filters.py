@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from restaurant.models import Booking
+
+
+class BookingFilterTest(TestCase):
+    """
+    Clase de prueba para los filtros de reservas
+    """
+
+    def setUp(self):
+        Booking.objects.create(Name="Juan Perez", No_of_guests=2,
+                               BookingDate=datetime(2025, 6, 25, 13, 0, tzinfo=timezone.utc))
+        Booking.objects.create(Name="Juana Lopez", No_of_guests=6,
+                               BookingDate=datetime(2025, 6, 25, 21, 30, tzinfo=timezone.utc))
+        Booking.objects.create(Name="Maria Rodriguez", No_of_guests=4,
+                               BookingDate=datetime(2025, 6, 26, 20, 0, tzinfo=timezone.utc))
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('host', password='pass'))
+        self.url = reverse('booking-list')
+
+    def names(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['Name'] for item in response.json()['results']]
+
+    def test_date_range_includes_whole_day(self):
+        """
+        date_to con solo fecha incluye todas las reservas de ese día
+        """
+        self.assertEqual(self.names(date_from='2025-06-25', date_to='2025-06-25'),
+                         ["Juan Perez", "Juana Lopez"])
+        self.assertEqual(self.names(date_from='2025-06-25T20:00:00Z'),
+                         ["Juana Lopez", "Maria Rodriguez"])
+
+    def test_min_guests_and_name_prefix(self):
+        """
+        min_guests y el prefijo de name se combinan en la misma consulta
+        """
+        self.assertEqual(self.names(name='Juan'), ["Juan Perez", "Juana Lopez"])
+        self.assertEqual(self.names(name='Juan', min_guests=4), ["Juana Lopez"])
+
+    def test_name_prefix_is_case_sensitive(self):
+        """
+        name distingue mayúsculas en todos los motores (LIKE no lo hace en SQLite)
+        """
+        Booking.objects.create(Name="juan*[x]", No_of_guests=2,
+                               BookingDate=datetime(2025, 6, 27, 20, 0, tzinfo=timezone.utc))
+        self.assertEqual(self.names(name='juan'), ["juan*[x]"])
+        self.assertEqual(self.names(name='JUAN'), [])
+        self.assertEqual(self.names(name='juan*['), ["juan*[x]"])
+        self.assertEqual(self.names(name='Jua?'), [])
+
+    def test_invalid_date_is_rejected(self):
+        """
+        Una fecha inválida devuelve 400 en lugar de ignorarse
+        """
+        response = self.client.get(self.url, {'date_from': '25/06/2025'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('date_from', response.json())
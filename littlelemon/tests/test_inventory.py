@@ -0,0 +1,58 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from restaurant.models import Menu
+from decimal import Decimal
+
+
+class InventoryReserveTest(TestCase):
+    """
+    Clase de prueba para el descuento atómico de inventario
+    """
+
+    def setUp(self):
+        self.salad = Menu.objects.create(Title="Greek Salad", Price=Decimal('12.50'), Inventory=5)
+        self.dessert = Menu.objects.create(Title="Lemon Dessert", Price=Decimal('6.75'), Inventory=1)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('till', password='pass'))
+
+    def test_reserve_returns_new_stock(self):
+        response = self.client.post(f'/api/menu/{self.salad.pk}/reserve/', {'quantity': 2}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'id': self.salad.pk, 'Inventory': 3})
+
+    def test_never_goes_negative(self):
+        """
+        Un descuento mayor que el inventario se rechaza con 409 y no modifica nada
+        """
+        response = self.client.post(f'/api/menu/{self.salad.pk}/reserve/', {'quantity': 6}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.json()['available'], 5)
+        self.salad.refresh_from_db()
+        self.assertEqual(self.salad.Inventory, 5)
+
+    def test_multi_item_is_all_or_nothing(self):
+        payload = [{'id': self.salad.pk, 'quantity': 1}, {'id': self.dessert.pk, 'quantity': 2}]
+        response = self.client.post('/api/menu/reserve/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Menu.objects.get(pk=self.salad.pk).Inventory, 5)
+
+        payload[1]['quantity'] = 1
+        response = self.client.post('/api/menu/reserve/', payload, format='json')
+        self.assertEqual(response.json(), [
+            {'id': self.salad.pk, 'Inventory': 4},
+            {'id': self.dessert.pk, 'Inventory': 0},
+        ])
+
+    def test_reserve_invalidates_menu_cache(self):
+        url = f'/api/menu/{self.salad.pk}/'
+        self.client.get(url)
+        self.client.post(f'/api/menu/{self.salad.pk}/reserve/', {}, format='json')
+        self.assertEqual(self.client.get(url).json()['Inventory'], 4)
+
+    def test_unknown_item_and_anonymous(self):
+        response = self.client.post('/api/menu/999/reserve/', {'quantity': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = APIClient().post(f'/api/menu/{self.salad.pk}/reserve/', {'quantity': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
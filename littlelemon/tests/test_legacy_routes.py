@@ -0,0 +1,79 @@
+import base64
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurant.models import Booking, Menu
+
+
+class LegacyRoutesTest(TestCase):
+    """
+    Las rutas alternativas se sirven con el ViewSet de cada recurso
+    """
+
+    def setUp(self):
+        start = datetime(2030, 6, 25, 12, 0, tzinfo=timezone.utc)
+        for i in range(25):
+            Booking.objects.create(Name=f'Cliente {i}', No_of_guests=2, BookingDate=start + timedelta(hours=i))
+        self.item = Menu.objects.create(Title='Paella', Price=Decimal('18.00'), Inventory=10)
+        self.user = User.objects.create_user('host', password='pass')
+        self.client = APIClient()
+
+    def test_lists_are_paginated_like_the_viewsets(self):
+        self.client.force_authenticate(self.user)
+        for legacy, viewset in (
+            ('/api/class/bookings/', '/api/bookings/'),
+            ('/api/generic/bookings/', '/api/bookings/'),
+            ('/api/function/users/', '/api/users/'),
+            ('/api/generic/users/', '/api/users/'),
+            ('/api/mixin/menu/', '/api/menu/'),
+        ):
+            with self.subTest(url=legacy):
+                response = self.client.get(legacy, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                expected = self.client.get(viewset, HTTP_ACCEPT='application/json').json()
+                data = response.json()
+                self.assertEqual(data['results'], expected['results'])
+                self.assertEqual(data['count'], expected['count'])
+
+        data = self.client.get('/api/class/bookings/').json()
+        self.assertEqual(data['count'], 25)
+        self.assertEqual(len(data['results']), 20)
+
+    def test_filters_and_cursor_pagination_apply(self):
+        response = self.client.get('/api/class/bookings/?pagination=cursor&name=Cliente 1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [booking['Name'] for booking in response.json()['results']]
+        self.assertEqual(names, ['Cliente 1'] + [f'Cliente {i}' for i in range(10, 20)])
+
+    def test_legacy_permissions_are_kept(self):
+        """
+        Lectura anónima y escritura con cualquier usuario autenticado, como antes
+        """
+        self.assertEqual(self.client.get('/api/class/bookings/').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get('/api/function/users/').status_code, status.HTTP_200_OK)
+        response = self.client.post('/api/mixin/menu/', {'Title': 'Tarta', 'Price': '5.00', 'Inventory': 3})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        credentials = base64.b64encode(b'host:pass').decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Basic {credentials}')
+        response = self.client.post('/api/mixin/menu/', {'Title': 'Tarta', 'Price': '5.00', 'Inventory': 3})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_detail_methods_are_kept(self):
+        self.client.force_authenticate(self.user)
+        booking = Booking.objects.first()
+        url = f'/api/class/bookings/{booking.pk}/'
+        self.assertEqual(self.client.patch(url, {'No_of_guests': 3}).status_code,
+                         status.HTTP_405_METHOD_NOT_ALLOWED)
+        response = self.client.patch(f'/api/generic/bookings/{booking.pk}/', {'No_of_guests': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(f'/api/mixin/menu/{self.item.pk}/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.json()['Title'], 'Paella')
@@ -0,0 +1,95 @@
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurant.metrics import registry
+from restaurant.models import Booking, Menu
+
+
+class MetricsMiddlewareTest(TestCase):
+    """
+    Clase de prueba para la instrumentación de peticiones y el endpoint /metrics
+    """
+
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+        Menu.objects.create(Title='Paella', Price=18, Inventory=10)
+        Booking.objects.create(Name='Ana', No_of_guests=2, BookingDate='2030-01-01T20:00:00Z')
+        self.user = User.objects.create_user('host', password='pass')
+
+    def test_server_timing_header(self):
+        self.client.force_authenticate(User.objects.create_user('staff', password='pass', is_staff=True))
+        response = self.client.get('/api/menu/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response['Server-Timing']
+        for phase in ('db;dur=', 'serialize;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(phase, timing)
+        self.assertIn('queries"', timing)
+
+    def test_server_timing_is_staff_only(self):
+        self.assertFalse(self.client.get('/api/menu/').has_header('Server-Timing'))
+        self.client.force_authenticate(self.user)
+        self.assertFalse(self.client.get('/api/bookings/').has_header('Server-Timing'))
+        with override_settings(PERFORMANCE_METRICS={'PUBLIC_SERVER_TIMING': True}):
+            self.assertTrue(self.client.get('/api/bookings/').has_header('Server-Timing'))
+
+    def test_route_metrics_are_recorded(self):
+        self.client.force_authenticate(self.user)
+        self.client.get('/api/bookings/')
+        self.client.get('/api/bookings/')
+
+        entry = registry.get('booking-list', 'GET')
+        self.assertEqual(entry.latency.count, 2)
+        self.assertEqual(entry.statuses, {200: 2})
+        self.assertGreater(entry.db_queries, 0)
+        self.assertGreater(entry.db_time, 0)
+        self.assertGreater(entry.serialize_time, 0)
+        self.assertGreater(entry.render_time, 0)
+        self.assertEqual(entry.size.count, 2)
+
+    async def test_async_views_count_queries(self):
+        # El ORM asíncrono consulta desde el hilo de sync_to_async, no desde el del bucle
+        response = await AsyncClient().get('/api/async/menu/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entry = registry.get('menu-list-async', 'GET')
+        self.assertGreater(entry.db_queries, 0)
+        self.assertGreater(entry.db_time, 0)
+
+    def test_other_apps_are_not_recorded(self):
+        self.client.get('/auth/users/')
+        self.assertEqual(registry.render().count('route='), 0)
+
+    def test_prometheus_endpoint(self):
+        self.client.get('/api/menu/')
+        self.client.force_login(User.objects.create_user('staff', password='pass', is_staff=True))
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE littlelemon_http_request_duration_seconds histogram', body)
+        self.assertIn(
+            'littlelemon_http_request_duration_seconds_bucket{route="menu-list",method="GET",le="+Inf"} 1',
+            body,
+        )
+        self.assertIn('littlelemon_http_requests_total{route="menu-list",method="GET",status="200"} 1', body)
+
+    def test_metrics_endpoint_is_restricted(self):
+        # Detrás de un proxy local todas las peticiones llegan desde 127.0.0.1
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='127.0.0.1').status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(PERFORMANCE_METRICS={'TOKEN': 's3cret'})
+    def test_metrics_token(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(PERFORMANCE_METRICS={'ENABLED': False})
+    def test_disabled(self):
+        response = self.client.get('/api/menu/')
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertIsNone(registry.get('menu-list', 'GET'))
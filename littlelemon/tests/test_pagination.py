@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from restaurant.models import Booking
+
+
+class BookingPaginationTest(TestCase):
+    """
+    Clase de prueba para los modos de paginación de reservas
+    """
+
+    def setUp(self):
+        start = datetime(2025, 6, 25, 19, 0, tzinfo=timezone.utc)
+        # Dos reservas por franja para comprobar el desempate por id
+        Booking.objects.bulk_create([
+            Booking(Name=f"Cliente {i}", No_of_guests=2, BookingDate=start + timedelta(hours=i // 2))
+            for i in range(45)
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('host', password='pass'))
+        self.url = reverse('booking-list')
+
+    def test_default_is_page_number(self):
+        """
+        Sin parámetros se mantiene la respuesta paginada por número de página
+        """
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['count'], 45)
+        self.assertEqual(len(data['results']), 20)
+
+    def test_skip_count(self):
+        """
+        Con count=false no se devuelve el total pero sí los enlaces
+        """
+        data = self.client.get(self.url, {'count': 'false', 'page': 3}).json()
+        self.assertNotIn('count', data)
+        self.assertEqual(len(data['results']), 5)
+        self.assertIsNone(data['next'])
+        self.assertIn('page=2', data['previous'])
+
+    def test_cursor_walks_all_rows_in_order(self):
+        """
+        El modo cursor recorre todas las reservas en orden (BookingDate, id) sin repetir
+        """
+        ids = []
+        url = self.url + '?pagination=cursor'
+        with self.assertNumQueries(3):
+            # 3 páginas: una consulta por página y ningún COUNT
+            while url:
+                data = self.client.get(url).json()
+                self.assertNotIn('count', data)
+                ids.extend(item['id'] for item in data['results'])
+                url = data['next']
+                if url:
+                    self.assertIn('pagination=cursor', url)
+        expected = list(Booking.objects.order_by('BookingDate', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+
+class UserPaginationTest(TestCase):
+    """
+    Clase de prueba para la paginación por cursor de usuarios
+    """
+
+    def test_cursor_mode(self):
+        users = [User.objects.create_user(f'user{i}', password='pass') for i in range(3)]
+        client = APIClient()
+        client.force_authenticate(users[0])
+        # 'user-list' resuelve a la ruta de djoser, así que se usa la URL directa
+        data = client.get('/api/users/', {'pagination': 'cursor'}).json()
+        self.assertEqual(len(data['results']), 3)
+        self.assertIsNone(data['next'])
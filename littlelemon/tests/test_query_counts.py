@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+from django.contrib.auth.models import Group, User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from restaurant.models import Booking, Menu
+from decimal import Decimal
+
+
+LIST_ENDPOINTS = [
+    '/api/menu/',
+    '/api/menu-readonly/',
+    '/api/mixin/menu/',
+    '/api/bookings/',
+    '/api/bookings/?pagination=cursor',
+    '/api/class/bookings/',
+    '/api/generic/bookings/',
+    '/api/users/',
+    '/api/users/?pagination=cursor',
+    '/api/function/users/',
+    '/api/generic/users/',
+]
+
+
+@override_settings(MENU_CACHE={'ENABLED': False})
+class ListQueryCountTest(TestCase):
+    """
+    El número de consultas de cada listado no debe crecer con el número de filas
+    """
+
+    def setUp(self):
+        self.groups = [Group.objects.create(name=f'grupo {i}') for i in range(3)]
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.rows = 1
+
+    def add_rows(self, count):
+        start = datetime(2025, 6, 25, 12, 0, tzinfo=timezone.utc)
+        for _ in range(count):
+            i = self.rows
+            Menu.objects.create(Title=f'Plato {i}', Price=Decimal('9.90'), Inventory=i)
+            Booking.objects.create(Name=f'Cliente {i}', No_of_guests=2, BookingDate=start + timedelta(hours=i))
+            user = User.objects.create(username=f'user{i}')
+            user.groups.set(self.groups[: i % 3 + 1])
+            self.rows += 1
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200, url)
+        return len(context.captured_queries)
+
+    def test_query_count_is_constant(self):
+        self.add_rows(2)
+        small = {url: self.count_queries(url) for url in LIST_ENDPOINTS}
+        self.add_rows(12)
+        for url in LIST_ENDPOINTS:
+            with self.subTest(url=url):
+                self.assertEqual(self.count_queries(url), small[url])
+
+    def test_user_list_prefetches_groups(self):
+        """
+        Usuarios y grupos se leen con dos consultas (más el COUNT de la paginación)
+        """
+        self.add_rows(10)
+        self.assertEqual(self.count_queries('/api/users/'), 3)
+        self.assertEqual(self.count_queries('/api/function/users/'), 3)
+
+    def test_cached_user_urls(self):
+        self.add_rows(3)
+        results = self.client.get('/api/users/').json()['results']
+        for user in results:
+            pk = User.objects.get(username=user['username']).pk
+            self.assertEqual(user['url'], f'http://testserver/api/users/{pk}/')
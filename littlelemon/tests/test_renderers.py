@@ -0,0 +1,92 @@
+import io
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from restaurant import renderers
+from restaurant.models import Menu
+from restaurant.renderers import FastJSONParser, FastJSONRenderer, dumps
+
+
+PAYLOAD = {
+    'Price': Decimal('18.50'),
+    'Total': Decimal('1234567.10'),
+    'BookingDate': datetime(2030, 1, 1, 20, 0, tzinfo=timezone.utc),
+    'Local': datetime(2030, 1, 1, 20, 0, 0, 123456),
+    'Day': date(2030, 1, 1),
+    'Hour': time(20, 30),
+    'Name': 'Año nuevo ☕ \u2028 línea \u2029 "comillas" \\ </script>',
+    'Errors': {'Name': [ErrorDetail('Este campo es obligatorio.', code='required')]},
+    'Lazy': gettext_lazy('Not found.'),
+    'Id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    1: 'clave numérica',
+    'Nested': [None, True, False, 0, -1, 2 ** 63 - 1, (1, 2), []],
+    'Big': 2 ** 80,
+}
+
+
+class FastJSONRendererTest(TestCase):
+    """
+    Clase de prueba para el renderer y el parser JSON rápidos
+    """
+
+    def test_output_matches_drf(self):
+        self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+    def test_output_matches_drf_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+    def test_indent_uses_drf(self):
+        rendered = FastJSONRenderer().render(PAYLOAD, 'application/json; indent=2')
+        self.assertEqual(rendered, JSONRenderer().render(PAYLOAD, 'application/json; indent=2'))
+
+    def test_empty_data(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_api_response_matches_drf(self):
+        Menu.objects.create(Title='Paella ☕', Price=Decimal('18.50'), Inventory=10)
+        response = APIClient().get('/api/menu/')
+        self.assertEqual(response.content, JSONRenderer().render(response.json()))
+        self.assertEqual(response.json()['results'][0]['Price'], '18.50')
+
+    def test_dumps_is_compact_utf8(self):
+        self.assertEqual(dumps({'Title': 'Café', 'Price': Decimal('2.5')}), '{"Title":"Café","Price":2.5}'.encode())
+
+    def test_parser_matches_drf(self):
+        body = '{"Title": "Café ☕", "Price": "18.50", "Inventory": 10, "Tags": [1.5, null, true], "Big": 100000000000000000000}'
+        parsed = FastJSONParser().parse(io.BytesIO(body.encode()))
+        self.assertEqual(parsed, JSONParser().parse(io.BytesIO(body.encode())))
+
+    def test_parser_other_encoding(self):
+        body = '{"Title": "Café"}'.encode('latin-1')
+        parsed = FastJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'latin-1'})
+        self.assertEqual(parsed, {'Title': 'Café'})
+
+    def test_parser_errors(self):
+        for body in (b'', b'{"Title": ', b'{"Price": NaN}'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
+
+    def test_api_accepts_json(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        response = client.post('/api/menu/', {'Title': 'Tarta', 'Price': '6.25', 'Inventory': 3}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Menu.objects.get().Price, Decimal('6.25'))
+
+    def test_bench_json_command(self):
+        out = io.StringIO()
+        call_command('bench_json', rows=50, repeat=1, stdout=out)
+        self.assertIn('menu      render', out.getvalue())
+        self.assertIn('bookings  parse', out.getvalue())
@@ -0,0 +1,112 @@
+import datetime
+from importlib import import_module
+from io import StringIO
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from restaurant.models import Booking, BookingRollup
+
+
+class BookingRollupTest(TestCase):
+    """
+    Clase de prueba para los resúmenes de reservas y /api/bookings/stats/
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('host', password='pass'))
+        self.url = '/api/bookings/stats/'
+        # Lunes 10 y martes 11 de junio de 2030
+        Booking.objects.create(Name='Ana', No_of_guests=2, BookingDate='2030-06-10T19:00:00Z')
+        Booking.objects.create(Name='Luis', No_of_guests=4, BookingDate='2030-06-10T19:30:00Z')
+        Booking.objects.create(Name='Eva', No_of_guests=3, BookingDate='2030-06-11T13:00:00Z')
+
+    def rollups(self):
+        return {
+            (row.Date.isoformat(), row.Hour): (row.Bookings, row.Guests)
+            for row in BookingRollup.objects.filter(Bookings__gt=0)
+        }
+
+    def test_changes_update_rollups(self):
+        self.assertEqual(self.rollups(), {('2030-06-10', 19): (2, 6), ('2030-06-11', 13): (1, 3)})
+        booking = Booking.objects.get(Name='Luis')
+        booking.BookingDate = '2030-06-11T13:15:00Z'
+        booking.No_of_guests = 5
+        booking.save()
+        self.assertEqual(self.rollups(), {('2030-06-10', 19): (1, 2), ('2030-06-11', 13): (2, 8)})
+        Booking.objects.filter(Name='Eva').delete()
+        self.assertEqual(self.rollups(), {('2030-06-10', 19): (1, 2), ('2030-06-11', 13): (1, 5)})
+
+    def test_bulk_endpoints_update_rollups(self):
+        response = self.client.post('/api/bookings/bulk/', [
+            {'Name': 'Pablo', 'No_of_guests': 2, 'BookingDate': '2030-06-10T19:45:00Z'},
+            {'Name': 'Sara', 'No_of_guests': 6, 'BookingDate': '2030-06-12T20:00:00Z'},
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        ana = Booking.objects.get(Name='Ana')
+        response = self.client.patch('/api/bookings/bulk/', [{'id': ana.pk, 'No_of_guests': 1}], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.rollups(), {
+            ('2030-06-10', 19): (3, 7), ('2030-06-11', 13): (1, 3), ('2030-06-12', 20): (1, 6),
+        })
+        sara = Booking.objects.get(Name='Sara')
+        response = self.client.delete('/api/bookings/bulk/', [sara.pk], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(('2030-06-12', 20), self.rollups())
+
+    def test_decrements_never_go_below_zero(self):
+        # Resúmenes que faltan o se quedaron atrás (p. ej. reservas cargadas sin el ORM)
+        BookingRollup.objects.filter(Date='2030-06-11').delete()
+        BookingRollup.objects.filter(Date='2030-06-10').update(Bookings=1, Guests=1)
+        Booking.objects.filter(Name='Eva').delete()
+        booking = Booking.objects.get(Name='Luis')
+        booking.BookingDate = '2030-06-12T20:00:00Z'
+        booking.save()
+        Booking.objects.get(Name='Ana').delete()
+        self.assertEqual(self.rollups(), {('2030-06-12', 20): (1, 4)})
+        self.assertFalse(BookingRollup.objects.filter(Bookings=0).exclude(Guests=0).exists())
+
+    def test_migration_summarizes_existing_bookings(self):
+        migration = import_module('restaurant.migrations.0008_bookingrollup')
+        BookingRollup.objects.all().delete()
+        migration.summarize_existing_bookings(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(self.rollups(), {('2030-06-10', 19): (2, 6), ('2030-06-11', 13): (1, 3)})
+
+    def test_stats_endpoint(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['totals'], {'bookings': 3, 'guests': 9, 'average_party_size': 3.0})
+        self.assertEqual([row['date'] for row in data['by_day']], ['2030-06-10', '2030-06-11'])
+        self.assertEqual(
+            [(row['hour'], row['bookings'], row['guests']) for row in data['by_hour']], [(13, 1, 3), (19, 2, 6)],
+        )
+        self.assertEqual(
+            [(row['name'], row['days'], row['bookings']) for row in data['by_weekday']], [('lunes', 1, 2), ('martes', 1, 1)],
+        )
+
+        data = self.client.get(self.url, {'date_from': '2030-06-11', 'date_to': '2030-06-11'}).json()
+        self.assertEqual(data['totals']['bookings'], 1)
+        self.assertEqual(data['date_from'], '2030-06-11')
+        self.assertEqual(self.client.get(self.url, {'date_to': '2030-02-30'}).status_code, 400)
+        self.assertEqual(APIClient().get(self.url).status_code, 401)
+
+    def test_stats_do_not_read_bookings(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {'date_from': datetime.date(2030, 6, 1).isoformat()})
+        self.assertTrue(queries.captured_queries)
+        self.assertFalse([query for query in queries if 'restaurant_booking"' in query['sql']])
+
+    def test_rebuild_command(self):
+        BookingRollup.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_rollups', stdout=out)
+        self.assertIn('2 horas', out.getvalue())
+        self.assertEqual(self.rollups(), {('2030-06-10', 19): (2, 6), ('2030-06-11', 13): (1, 3)})
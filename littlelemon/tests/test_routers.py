@@ -0,0 +1,127 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from djoser.views import UserViewSet as DjoserUserViewSet
+
+from restaurant.models import Booking, Menu
+from restaurant.cache import menu_cache
+from restaurant.routers import ReplicaRouter, ReplicaRoutingMiddleware, read_from_primary, replica_health
+from restaurant.views import MenuViewSet
+
+
+@override_settings(READ_REPLICAS={'ALIASES': ['replica_1'], 'PIN_SECONDS': 5})
+class ReplicaRouterTest(SimpleTestCase):
+    """
+    Clase de prueba para el enrutado de lecturas a réplicas
+    """
+
+    def setUp(self):
+        cache.clear()
+        replica_health.record('replica_1', True)
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.menu_view = MenuViewSet.as_view({'get': 'list', 'post': 'create'})
+
+    def run_request(self, request, view, action):
+        """
+        Pasa la petición por el middleware y ejecuta ``action`` como si fuera la vista
+        """
+        decisions = []
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            decisions.append(action())
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request), decisions[0]
+
+    def test_outside_request_reads_default(self):
+        self.assertIsNone(self.router.db_for_read(Menu))
+
+    def test_safe_restaurant_request_reads_replica(self):
+        request = self.factory.get('/api/menu-items/')
+        _, db = self.run_request(request, self.menu_view, lambda: self.router.db_for_read(Menu))
+        self.assertEqual(db, 'replica_1')
+
+    def test_read_from_primary(self):
+        def read():
+            with read_from_primary():
+                inside = self.router.db_for_read(Menu)
+            return inside, self.router.db_for_read(Menu)
+
+        request = self.factory.get('/api/menu-items/')
+        _, (inside, after) = self.run_request(request, self.menu_view, read)
+        self.assertIsNone(inside)
+        self.assertEqual(after, 'replica_1')
+
+    def test_other_apps_and_views_read_default(self):
+        request = self.factory.get('/api/menu-items/')
+        _, db = self.run_request(request, self.menu_view, lambda: self.router.db_for_read(User))
+        self.assertIsNone(db)
+
+        djoser_view = DjoserUserViewSet.as_view({'get': 'list'})
+        request = self.factory.get('/auth/users/')
+        _, db = self.run_request(request, djoser_view, lambda: self.router.db_for_read(Menu))
+        self.assertIsNone(db)
+
+    def test_unhealthy_replica_falls_back_to_default(self):
+        replica_health.record('replica_1', False)
+        request = self.factory.get('/api/menu-items/')
+        _, db = self.run_request(request, self.menu_view, lambda: self.router.db_for_read(Menu))
+        self.assertEqual(db, 'default')
+
+    def test_health_check_of_unknown_alias_fails(self):
+        self.assertFalse(replica_health.check('replica_1'))
+
+    def test_write_pins_client_to_default(self):
+        """
+        Tras escribir una reserva, el mismo cliente lee de default durante PIN_SECONDS
+        """
+        def write_then_read():
+            self.router.db_for_write(Booking)
+            return self.router.db_for_read(Booking)
+
+        request = self.factory.post('/api/menu-items/', HTTP_AUTHORIZATION='Token abc')
+        response, db = self.run_request(request, self.menu_view, write_then_read)
+        self.assertIsNone(db)
+        self.assertEqual(response.cookies['primary_pin']['max-age'], 5)
+
+        # Cliente por token (sin cookies): fijado por sus credenciales
+        request = self.factory.get('/api/menu-items/', HTTP_AUTHORIZATION='Token abc')
+        _, db = self.run_request(request, self.menu_view, lambda: self.router.db_for_read(Booking))
+        self.assertIsNone(db)
+
+        # Cliente de navegador: fijado por la cookie
+        request = self.factory.get('/api/menu-items/')
+        request.COOKIES['primary_pin'] = '1'
+        _, db = self.run_request(request, self.menu_view, lambda: self.router.db_for_read(Booking))
+        self.assertIsNone(db)
+
+        # Otro cliente sigue leyendo de la réplica
+        request = self.factory.get('/api/menu-items/', HTTP_AUTHORIZATION='Token other')
+        _, db = self.run_request(request, self.menu_view, lambda: self.router.db_for_read(Booking))
+        self.assertEqual(db, 'replica_1')
+
+
+@override_settings(READ_REPLICAS={'ALIASES': ['replica_1']})
+class MenuCacheReplicaTest(TransactionTestCase):
+    """
+    Clase de prueba para el relleno de la caché del menú con réplicas
+    """
+
+    def setUp(self):
+        menu_cache.reset()
+        replica_health.record('replica_1', True)
+        self.addCleanup(replica_health.clear)
+        Menu.objects.create(Title='Paella', Price=12, Inventory=5)
+
+    def test_cache_is_filled_from_primary(self):
+        # Sin transacción abierta (TransactionTestCase) las lecturas irían a
+        # replica_1, que no existe: la consulta fallaría
+        response = self.client.get('/api/menu/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['Title'], 'Paella')
+        self.assertEqual(self.client.get('/api/menu/', HTTP_ACCEPT='application/json')['X-Cache'], 'HIT')
@@ -0,0 +1,181 @@
+from importlib import import_module
+from io import StringIO
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from restaurant.cache import menu_cache
+from restaurant.models import Booking, BookingSearchTrigram, Menu
+from restaurant.search import (
+    DEFAULT_SETTINGS, SearchQuery, booking_search_index, menu_search_index, normalize, text_trigrams,
+)
+
+
+class SearchTextTest(SimpleTestCase):
+    """
+    Clase de prueba para la normalización y la puntuación de la búsqueda
+    """
+
+    def test_normalize(self):
+        self.assertEqual(normalize('José Pérez-Ñúñez'), 'jose perez nunez')
+        self.assertEqual(text_trigrams('Ana'), {'  a', ' an', 'ana', 'na '})
+
+    def test_rank(self):
+        candidates = [(1, ['paella', 'valenciana']), (2, ['pasta', 'carbonara']), (3, ['chicken', 'salad'])]
+        self.assertEqual(SearchQuery('paela', DEFAULT_SETTINGS).rank(candidates, 10), [1])
+        self.assertEqual(SearchQuery('chic', DEFAULT_SETTINGS).rank(candidates, 10), [3])
+        self.assertEqual(SearchQuery('PASTA carbonra', DEFAULT_SETTINGS).rank(candidates, 10), [2])
+        self.assertEqual(SearchQuery('sushi', DEFAULT_SETTINGS).rank(candidates, 10), [])
+        self.assertFalse(SearchQuery(' - ', DEFAULT_SETTINGS))
+
+
+class MenuSearchTest(TestCase):
+    """
+    Clase de prueba para la búsqueda en el menú
+    """
+
+    def setUp(self):
+        menu_search_index.clear()
+        menu_cache.reset()
+        self.client = APIClient()
+        for title in ('Paella Valenciana', 'Pasta Carbonara', 'Crème Brûlée', 'Chicken Salad', 'Paella Negra'):
+            Menu.objects.create(Title=title, Price=10, Inventory=5)
+
+    def tearDown(self):
+        menu_search_index.clear()
+
+    def titles(self, search):
+        response = self.client.get(reverse('menu-list'), {'search': search})
+        self.assertEqual(response.status_code, 200)
+        return [item['Title'] for item in response.json()['results']]
+
+    def test_api_search(self):
+        self.assertEqual(self.titles('paela valencia'), ['Paella Valenciana', 'Paella Negra'])
+        self.assertEqual(self.titles('creme brulee'), ['Crème Brûlée'])
+        self.assertEqual(self.titles('xyz'), [])
+        self.assertEqual(len(self.titles('')), 5)
+
+    def test_index_is_updated_on_commit(self):
+        self.assertEqual(menu_search_index.search('tiramisu'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            item = Menu.objects.create(Title='Tiramisú', Price=6, Inventory=3)
+        with self.assertNumQueries(0):
+            self.assertEqual(menu_search_index.search('tiramisu'), [item.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            item.Title = 'Tarta de queso'
+            item.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(menu_search_index.search('tiramisu'), [])
+            self.assertEqual(menu_search_index.search('queso'), [item.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            item.delete()
+        self.assertEqual(menu_search_index.search('queso'), [])
+
+    def test_fixture_loading_skips_index(self):
+        self.assertEqual(menu_search_index.search('tiramisu'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            # loaddata guarda con raw=True
+            Menu(Title='Tiramisú', Price=6, Inventory=3, LastModified=timezone.now()).save_base(raw=True)
+        self.assertEqual(menu_search_index.search('tiramisu'), [])
+
+    def test_bulk_update_reindexes_titles(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_authenticate(admin)
+        menu_search_index.search('paella')
+        item = Menu.objects.get(Title='Pasta Carbonara')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse('menu-list') + 'bulk/', [{'id': item.pk, 'Title': 'Risotto'}],
+                                         format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(menu_search_index.search('risoto'), [item.pk])
+
+    def test_admin_uses_index(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        response = self.client.get('/admin/restaurant/menu/', {'q': 'paela'})
+        self.assertContains(response, 'Paella Negra')
+        self.assertNotContains(response, 'Pasta Carbonara')
+
+
+class BookingSearchTest(TestCase):
+    """
+    Clase de prueba para la búsqueda de reservas con el índice en base de datos
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('host', password='pass'))
+        self.url = reverse('booking-list')
+        for index, name in enumerate(['José García', 'Ana López', 'Josefina Ruiz', 'Pedro Garcés']):
+            Booking.objects.create(Name=name, No_of_guests=2, BookingDate=f'2030-06-{10 + index}T19:00:00Z')
+
+    def names(self, search, **params):
+        response = self.client.get(self.url, {'search': search, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item['Name'] for item in response.json()['results']]
+
+    def test_api_search(self):
+        # Coincidir en una sola palabra puntúa menos: aparece detrás
+        self.assertEqual(self.names('jose garcia'), ['José García', 'Josefina Ruiz'])
+        self.assertEqual(self.names('garcai'), ['José García', 'Pedro Garcés'])
+        self.assertEqual(self.names('jose'), ['José García', 'Josefina Ruiz'])
+        self.assertEqual(self.names('jose', date_from='2030-06-12'), ['Josefina Ruiz'])
+        self.assertEqual(self.names('zzz'), [])
+
+    def test_search_reads_only_matching_trigrams(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(len(booking_search_index.search('lopez')), 1)
+
+    def test_index_follows_changes(self):
+        booking = Booking.objects.get(Name='Ana López')
+        booking.Name = 'Ana Martínez'
+        booking.save()
+        self.assertEqual(self.names('martinez'), ['Ana Martínez'])
+        self.assertEqual(self.names('lopez'), [])
+        # Sin cambio de nombre no se reescribe el índice
+        before = set(BookingSearchTrigram.objects.filter(Booking=booking).values_list('pk', flat=True))
+        booking.No_of_guests = 3
+        booking.save()
+        self.assertEqual(set(BookingSearchTrigram.objects.filter(Booking=booking).values_list('pk', flat=True)), before)
+        booking.delete()
+        self.assertFalse(BookingSearchTrigram.objects.filter(Booking_id=booking.pk).exists())
+
+    def test_bulk_create_and_update(self):
+        response = self.client.post(self.url + 'bulk/', [
+            {'Name': 'Lucía Fernández', 'No_of_guests': 2, 'BookingDate': '2030-07-01T19:00:00Z'},
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.names('lucia'), ['Lucía Fernández'])
+        pedro = Booking.objects.get(Name='Pedro Garcés')
+        response = self.client.patch(self.url + 'bulk/', [{'id': pedro.pk, 'Name': 'Pedro Sánchez'}], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names('sanchez'), ['Pedro Sánchez'])
+
+    def test_rebuild_command(self):
+        BookingSearchTrigram.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('4 reservas', out.getvalue())
+        self.assertEqual(self.names('josefina')[0], 'Josefina Ruiz')
+
+    def test_migration_indexes_existing_bookings(self):
+        migration = import_module('restaurant.migrations.0007_bookingsearchtrigram')
+        BookingSearchTrigram.objects.all().delete()
+        migration.index_existing_bookings(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(self.names('jose garcia'), ['José García', 'Josefina Ruiz'])
+
+    @override_settings(SEARCH_INDEX={'ENABLED': False})
+    def test_disabled_falls_back_to_icontains(self):
+        self.assertEqual(self.names('Garc'), ['José García', 'Pedro Garcés'])
+
+    def test_admin_uses_index(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        response = self.client.get('/admin/restaurant/booking/', {'q': 'garcia'})
+        self.assertContains(response, 'José García')
+        self.assertNotContains(response, 'Ana López')
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.contrib.auth.models import Group, User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurant.models import Booking, Menu
+
+
+@override_settings(MENU_CACHE={'ENABLED': False})
+class SparseFieldsTest(TestCase):
+    """
+    Clase de prueba para el parámetro ?fields=
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.admin.groups.add(Group.objects.create(name='cocina'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.item = Menu.objects.create(Title='Paella', Price=Decimal('18.00'), Inventory=10)
+        start = datetime(2030, 1, 1, 12, tzinfo=timezone.utc)
+        for i in range(3):
+            Booking.objects.create(Name=f'Cliente {i}', No_of_guests=2, BookingDate=start + timedelta(hours=i))
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def test_menu_list_selects_only_requested_columns(self):
+        response, queries = self.get('/api/menu/?fields=id,Title,Price')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'], [{'id': self.item.pk, 'Title': 'Paella', 'Price': '18.00'}])
+        self.assertNotIn('Inventory', queries[-1])
+
+    def test_order_follows_serializer(self):
+        response, _ = self.get('/api/menu/?fields=Price,id')
+        self.assertEqual(list(response.json()['results'][0]), ['id', 'Price'])
+
+    def test_booking_list_with_and_without_fast_path(self):
+        expected = [{'Name': f'Cliente {i}'} for i in range(3)]
+        response, queries = self.get('/api/bookings/?fields=Name')
+        self.assertEqual(response.json()['results'], expected)
+        self.assertNotIn('No_of_guests', queries[-1])
+        with self.settings(FAST_LIST_SERIALIZATION=False):
+            response, queries = self.get('/api/bookings/?fields=Name')
+        self.assertEqual(response.json()['results'], expected)
+        self.assertNotIn('No_of_guests', queries[-1])
+
+    def test_fields_with_both_pagination_modes(self):
+        """
+        ?fields= con paginación por páginas y por cursor, con y sin la vía rápida
+        """
+        start = datetime(2030, 2, 1, 12, tzinfo=timezone.utc)
+        Booking.objects.bulk_create(
+            Booking(Name=f'Extra {i}', No_of_guests=2, BookingDate=start + timedelta(hours=i)) for i in range(20)
+        )
+        expected = list(Booking.objects.order_by('BookingDate', 'id').values_list('Name', flat=True))
+        for fast in (True, False):
+            for mode in ('page', 'cursor'):
+                with self.subTest(fast=fast, mode=mode), self.settings(FAST_LIST_SERIALIZATION=fast):
+                    names, url = [], f'/api/bookings/?pagination={mode}&fields=Name'
+                    while url:
+                        response, _ = self.get(url)
+                        self.assertEqual(response.status_code, status.HTTP_200_OK)
+                        data = response.json()
+                        self.assertEqual({tuple(row) for row in data['results']}, {('Name',)})
+                        names.extend(row['Name'] for row in data['results'])
+                        url = data['next']
+                    self.assertEqual(names, expected)
+
+    def test_user_list_skips_unrequested_prefetch(self):
+        _, full = self.get('/api/users/')
+        response, sparse = self.get('/api/users/?fields=username')
+        self.assertEqual(response.json()['results'], [{'username': 'admin'}])
+        self.assertEqual(len(sparse), len(full) - 1)
+        self.assertNotIn('email', sparse[-1])
+
+        response, _ = self.get('/api/users/?fields=username,groups')
+        self.assertEqual(len(response.json()['results'][0]['groups']), 1)
+
+    def test_detail(self):
+        response, queries = self.get(f'/api/menu/{self.item.pk}/?fields=Title')
+        self.assertEqual(response.json(), {'Title': 'Paella'})
+        self.assertEqual(response['ETag'], f'"{self.item.pk}-1"')
+        self.assertEqual(len(queries), 1)
+
+    def test_unknown_field(self):
+        response, _ = self.get('/api/menu/?fields=id,Secret')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Secret', response.json()['fields'][0])
+
+    def test_writes_ignore_fields(self):
+        response = self.client.post(
+            '/api/menu/?fields=id', {'Title': 'Tarta', 'Price': '5.00', 'Inventory': 3}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(response.json()), {'id', 'Title', 'Price', 'Inventory'})
@@ -0,0 +1,115 @@
+import gzip
+import os
+import re
+import shutil
+import tempfile
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import AsyncClient, SimpleTestCase, override_settings
+
+from restaurant.staticfiles import StaticFilesMiddleware, is_compressible
+
+
+MIDDLEWARE = list(settings.MIDDLEWARE)
+if 'restaurant.staticfiles.StaticFilesMiddleware' not in MIDDLEWARE:
+    MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+                      'restaurant.staticfiles.StaticFilesMiddleware')
+
+
+class StaticPipelineTest(SimpleTestCase):
+    """
+    Clase de prueba para los estáticos con hash, precomprimidos y servidos por el proceso
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(
+            DEBUG=False,
+            STATIC_ROOT=cls.static_root,
+            STATIC_PIPELINE={'ENABLED': True},
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'restaurant.staticfiles.CompressedManifestStaticFilesStorage'},
+            },
+            MIDDLEWARE=MIDDLEWARE,
+        )
+        cls.settings_override.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.static_root)
+        super().tearDownClass()
+
+    def test_collectstatic_hashes_and_compresses(self):
+        css = staticfiles_storage.stored_name('admin/css/base.css')
+        logo = staticfiles_storage.stored_name('img/logo.png')
+        self.assertRegex(css, r'^admin/css/base\.[0-9a-f]{12}\.css$')
+        with open(os.path.join(self.static_root, css), 'rb') as source, \
+                open(os.path.join(self.static_root, css + '.gz'), 'rb') as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()), source.read())
+        self.assertFalse(os.path.exists(os.path.join(self.static_root, logo + '.gz')))
+        self.assertTrue(is_compressible('app.js'))
+        self.assertFalse(is_compressible('logo.png'))
+
+    def test_landing_page_assets_without_stat(self):
+        self.client.get('/restaurant/')
+        # Plantilla, manifiesto e índice de estáticos ya en memoria
+        with mock.patch('os.stat', side_effect=AssertionError('stat()')):
+            page = self.client.get('/restaurant/')
+            logo_url = re.search(r'src="([^"]+)"', page.content.decode()).group(1)
+            response = self.client.get(logo_url)
+            content = b''.join(response.streaming_content)
+        self.assertRegex(logo_url, r'^/static/img/logo\.[0-9a-f]{12}\.png$')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(int(response['Content-Length']), len(content))
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_precompressed_variant(self):
+        url = staticfiles_storage.url('admin/css/base.css')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Content-Type'], 'text/css; charset=utf-8')
+        self.assertIn(b'body', gzip.decompress(b''.join(response.streaming_content)))
+
+        plain = self.client.get(url)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertNotEqual(plain['ETag'], response['ETag'])
+
+        cached = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_unhashed_names_and_unknown_files(self):
+        response = self.client.get('/static/admin/css/base.css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+        head = self.client.head('/static/admin/css/base.css')
+        self.assertEqual((head.status_code, head.content), (200, b''))
+        self.assertEqual(head['Content-Length'], response['Content-Length'])
+        self.assertEqual(self.client.get('/static/img/missing.png').status_code, 404)
+
+    def test_middleware_is_async_capable(self):
+        async def get_response(request):
+            return None
+
+        self.assertTrue(StaticFilesMiddleware.sync_capable and StaticFilesMiddleware.async_capable)
+        self.assertTrue(iscoroutinefunction(StaticFilesMiddleware(get_response)))
+        self.assertFalse(iscoroutinefunction(StaticFilesMiddleware(lambda request: None)))
+
+    async def test_served_under_asgi(self):
+        client = AsyncClient()
+        response = await client.get(staticfiles_storage.url('img/logo.png'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        response.close()
+        self.assertEqual((await client.get('/static/img/missing.png')).status_code, 404)
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from restaurant import tasks
+from restaurant.models import Booking, OutboxTask, SlotOccupancy
+
+
+def failing_task():
+    raise RuntimeError('sin conexión con cocina')
+
+
+tasks.task('test.failing')(failing_task)
+
+
+class OutboxTaskTest(TestCase):
+    """
+    Clase de prueba para la cola de tareas de las reservas
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('host', 'host@example.com', 'pass'))
+        self.url = reverse('booking-list')
+
+    def book(self, guests=2, when='2030-06-25T19:00:00Z'):
+        return self.client.post(self.url, {'Name': 'Ana', 'No_of_guests': guests, 'BookingDate': when}, format='json')
+
+    def topics(self):
+        return sorted(OutboxTask.objects.values_list('Topic', flat=True))
+
+    def test_create_enqueues_side_effects(self):
+        response = self.book()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.topics(), ['booking.confirmation', 'booking.kitchen', 'capacity.reconcile'])
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_rejected_booking_enqueues_nothing(self):
+        response = self.book(guests=41)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(OutboxTask.objects.count(), 0)
+
+    def test_drain_runs_tasks(self):
+        self.book()
+        with self.assertLogs('restaurant.tasks', 'INFO') as logs:
+            self.assertEqual(tasks.drain(), (3, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['host@example.com'])
+        self.assertIn('Reserva nueva: Ana, 2 personas', logs.output[0])
+        self.assertEqual(set(OutboxTask.objects.values_list('Status', flat=True)), {OutboxTask.DONE})
+        self.assertEqual(tasks.drain(), (0, 0))
+
+    @override_settings(TASK_QUEUE={'KITCHEN_EMAILS': ['cocina@example.com']})
+    def test_update_and_delete_notify_kitchen(self):
+        booking_id = self.book().json()['id']
+        tasks.drain()
+        self.client.patch(f'{self.url}{booking_id}/', {'No_of_guests': 4}, format='json')
+        self.client.delete(f'{self.url}{booking_id}/')
+        tasks.drain()
+        subjects = [message.subject for message in mail.outbox]
+        self.assertIn('Cocina - reserva modificada', subjects)
+        self.assertIn('Cocina - reserva cancelada', subjects)
+
+    def test_bulk_create_enqueues_tasks(self):
+        payload = [{'Name': f'Cliente {i}', 'No_of_guests': 2, 'BookingDate': '2030-06-25T19:00:00Z'} for i in range(3)]
+        response = self.client.post(f'{self.url}bulk/', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(OutboxTask.objects.filter(Topic='booking.kitchen').count(), 3)
+        self.assertEqual(OutboxTask.objects.filter(Topic='capacity.reconcile').count(), 1)
+
+    def test_reconcile_fixes_drift(self):
+        self.book(guests=3)
+        SlotOccupancy.objects.update(Guests=30)
+        with self.assertLogs('restaurant.tasks', 'WARNING'):
+            tasks.drain()
+        self.assertEqual(set(SlotOccupancy.objects.values_list('Guests', flat=True)), {3})
+
+    def test_failed_task_is_retried_with_backoff(self):
+        tasks.enqueue(('test.failing', {}))
+        with self.assertLogs('restaurant.tasks', 'WARNING'):
+            self.assertEqual(tasks.drain(), (1, 1))
+        task = OutboxTask.objects.get()
+        self.assertEqual((task.Status, task.Attempts), (OutboxTask.PENDING, 1))
+        self.assertIn('sin conexión con cocina', task.LastError)
+        self.assertGreater(task.AvailableAt, timezone.now() + timedelta(seconds=25))
+        self.assertEqual(tasks.drain(), (0, 0))
+
+    @override_settings(TASK_QUEUE={'MAX_ATTEMPTS': 1})
+    def test_task_fails_after_max_attempts(self):
+        tasks.enqueue(('test.failing', {}), ('test.unknown', {}))
+        with self.assertLogs('restaurant.tasks', 'ERROR'):
+            self.assertEqual(tasks.drain(), (2, 2))
+        self.assertEqual(set(OutboxTask.objects.values_list('Status', flat=True)), {OutboxTask.FAILED})
+
+    def test_claim_is_exclusive(self):
+        tasks.enqueue(('booking.kitchen', {}))
+        self.assertEqual(len(tasks.claim()), 1)
+        self.assertEqual(tasks.claim(), [])
+        # Worker caído: el bloqueo vence y otro worker puede reclamarla
+        OutboxTask.objects.update(LockedUntil=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(tasks.claim()[0].Attempts, 2)
+
+    def test_purge_done(self):
+        tasks.enqueue(('booking.kitchen', {}), ('booking.kitchen', {}))
+        OutboxTask.objects.filter(pk=OutboxTask.objects.first().pk).update(
+            Status=OutboxTask.DONE, ProcessedAt=datetime(2020, 1, 1, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(tasks.purge_done(), 1)
+        self.assertEqual(OutboxTask.objects.count(), 1)
+
+    @override_settings(TASK_QUEUE={'ENABLED': False})
+    def test_disabled(self):
+        self.book()
+        self.assertEqual(OutboxTask.objects.count(), 0)
+
+
+class RunTasksCommandTest(TransactionTestCase):
+    """
+    Clase de prueba para el worker run_tasks
+    """
+
+    def test_once_drains_queue(self):
+        booking = Booking.objects.create(Name='Ana', No_of_guests=2, BookingDate='2030-06-25T19:00:00Z')
+        tasks.enqueue_booking_tasks('created', [booking], email='ana@example.com')
+        out = StringIO()
+        call_command('run_tasks', once=True, workers=1, stdout=out)
+        self.assertIn('Tareas ejecutadas: 3 (0 con error).', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(OutboxTask.objects.exclude(Status=OutboxTask.DONE).exists())
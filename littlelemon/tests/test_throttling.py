@@ -0,0 +1,154 @@
+from functools import partial
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from restaurant.throttling import BucketStore, bucket_store, get_throttle_settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ThrottlingTest(TestCase):
+    """
+    Clase de prueba para la limitación de peticiones por ámbito
+    """
+
+    def setUp(self):
+        bucket_store.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user('host', 'host@example.com', 'pass')
+
+    def tearDown(self):
+        bucket_store.clear()
+
+    def assertThrottled(self, response):
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(int(response['Retry-After']), (29, 30))
+
+    @override_settings(THROTTLING={'RATES': {'menu_anon': '2/min'}})
+    def test_anonymous_menu_reads(self):
+        url = reverse('menu-list')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(reverse('menu-readonly-list')).status_code, 200)
+        self.assertThrottled(self.client.get(url))
+        # Otra IP tiene su propia cubeta y los usuarios autenticados no se limitan
+        self.assertEqual(self.client.get(url, REMOTE_ADDR='10.0.0.2').status_code, 200)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(THROTTLING={'RATES': {'booking_write': '2/min'}})
+    def test_booking_writes_per_user(self):
+        self.client.force_authenticate(self.user)
+        url = reverse('booking-list')
+        payload = {'Name': 'Ana', 'No_of_guests': 2, 'BookingDate': '2030-06-25T19:00:00Z'}
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, 201)
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, 201)
+        self.assertThrottled(self.client.post(url, payload, format='json'))
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.force_authenticate(User.objects.create_user('other', password='pass'))
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, 201)
+
+    @override_settings(THROTTLING={'RATES': {'login': '2/min'}})
+    def test_login_endpoints_share_bucket(self):
+        credentials = {'username': 'host', 'password': 'pass'}
+        self.assertEqual(self.client.post('/api-token-auth/', credentials, format='json').status_code, 200)
+        self.assertEqual(self.client.post('/auth/token/login/', credentials, format='json').status_code, 200)
+        self.assertThrottled(self.client.post('/api-token-auth/', credentials, format='json'))
+        self.assertThrottled(self.client.post('/auth/token/login/', credentials, format='json'))
+
+    @override_settings(THROTTLING={'RATES': {'login': '2/min'}})
+    def test_spoofed_forwarded_for_does_not_bypass_login_limit(self):
+        credentials = {'username': 'host', 'password': 'pass'}
+        login = partial(self.client.post, '/api-token-auth/', credentials, format='json')
+        for num_proxies in (0, None):
+            bucket_store.clear()
+            with self.subTest(num_proxies=num_proxies), self.settings(
+                REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': num_proxies},
+            ):
+                self.assertEqual(login(HTTP_X_FORWARDED_FOR='1.1.1.1').status_code, 200)
+                self.assertEqual(login(HTTP_X_FORWARDED_FOR='2.2.2.2').status_code, 200)
+                self.assertThrottled(login(HTTP_X_FORWARDED_FOR='3.3.3.3'))
+
+        # Detrás de un proxy de confianza cuenta la dirección que este añade
+        bucket_store.clear()
+        with self.settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            self.assertEqual(login(HTTP_X_FORWARDED_FOR='9.9.9.9, 1.1.1.1').status_code, 200)
+            self.assertEqual(login(HTTP_X_FORWARDED_FOR='9.9.9.9, 1.1.1.1').status_code, 200)
+            self.assertThrottled(login(HTTP_X_FORWARDED_FOR='9.9.9.9, 1.1.1.1'))
+            self.assertEqual(login(HTTP_X_FORWARDED_FOR='9.9.9.9, 2.2.2.2').status_code, 200)
+
+    @override_settings(THROTTLING={'ENABLED': False, 'RATES': {'menu_anon': '1/min'}})
+    def test_disabled(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse('menu-list')).status_code, 200)
+
+    def test_throttle_does_not_query_database(self):
+        url = reverse('menu-list')
+        self.client.get(url)
+        with override_settings(THROTTLING={'ENABLED': False}):
+            with self.assertNumQueries(0):
+                self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+
+class BucketStoreTest(TestCase):
+    """
+    Clase de prueba para las cubetas de tokens
+    """
+
+    def setUp(self):
+        self.options = get_throttle_settings()
+        self.store = BucketStore()
+        self.store.timer = self.clock = FakeClock()
+
+    def test_refill(self):
+        rate = (2, 60)
+        self.assertEqual(self.store.consume('k', rate, 2, self.options), 0)
+        self.assertEqual(self.store.consume('k', rate, 2, self.options), 0)
+        self.assertAlmostEqual(self.store.consume('k', rate, 2, self.options), 30)
+        self.clock.now += 20
+        self.assertAlmostEqual(self.store.consume('k', rate, 2, self.options), 10)
+        self.clock.now += 10
+        self.assertEqual(self.store.consume('k', rate, 2, self.options), 0)
+
+    def test_max_keys_evicts_least_recent(self):
+        options = {**self.options, 'MAX_KEYS': 2}
+        for key in ('a', 'b', 'a', 'c'):
+            self.store.consume(key, (1, 60), 1, options)
+        self.assertEqual(list(self.store._buckets), ['a', 'c'])
+
+    def test_sync_shares_consumption(self):
+        options = {**self.options, 'SYNC_CACHE_ALIAS': 'default', 'SYNC_INTERVAL': 1.0}
+        cache.delete('throttle:shared-test')
+        other = BucketStore()
+        other.timer = self.clock
+        rate = (4, 3600)
+        # Otro proceso consume toda la cubeta y publica su consumo
+        for _ in range(3):
+            other.consume('shared-test', rate, 4, options)
+        self.clock.now += 1
+        other.consume('shared-test', rate, 4, options)
+        # Este proceso aún tiene tokens hasta que sincroniza
+        self.assertEqual(self.store.consume('shared-test', rate, 4, options), 0)
+        self.clock.now += 1
+        self.assertEqual(self.store.consume('shared-test', rate, 4, options), 0)
+        self.assertGreater(self.store.consume('shared-test', rate, 4, options), 0)
+
+    def test_bench_command(self):
+        out = StringIO()
+        call_command('bench_throttle', requests=50, clients=5, stdout=out)
+        self.assertIn('cubeta local', out.getvalue())
+        self.assertIn('AnonRateThrottle (DRF)', out.getvalue())